@@ -0,0 +1,73 @@
+import typing as _t
+import uuid as _uuid
+
+
+_T = _t.TypeVar("_T")
+
+
+class StatsCache:
+    """
+    In-process cache of stats results.
+    Entries are keyed by a data version, which is bumped on every successful commit, so a write invalidates every entry.
+    NOTE: The cache lives in the process memory, so each worker process keeps its own version and entries.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise cache.
+        """
+        # A per-process token stops entity tags from colliding across restarts, when the version starts again at zero
+        self.__token = _uuid.uuid4().hex[:8]
+        self.__version = 0
+        self.__key_2_entry: dict[str, tuple[int, _t.Any]] = {}
+
+    @property
+    def version(self) -> int:
+        """
+        Get the current data version.
+
+        :return: Data version.
+        """
+        return self.__version
+
+    @property
+    def etag(self) -> str:
+        """
+        Get the entity tag for the current data version.
+
+        :return: Quoted entity tag.
+        """
+        return f'"{self.__token}-{self.__version}"'
+
+    def bump(self) -> None:
+        """
+        Bump the data version and drop all cached entries.
+        """
+        self.__version += 1
+        self.__key_2_entry.clear()
+
+    async def get_or_compute(
+        self, key: str, compute: _t.Callable[[], _t.Awaitable[_T]]
+    ) -> _T:
+        """
+        Get a cached result for the current data version, computing and storing it if it does not exist.
+
+        :param key: Cache key.
+        :param compute: Coroutine function computing the result.
+        :return: Result.
+        """
+        version = self.__version
+        entry = self.__key_2_entry.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        result = await compute()
+
+        # Only store the result if no commit happened while it was being computed
+        if version == self.__version:
+            self.__key_2_entry[key] = (version, result)
+        return result
+
+
+# Shared by every request handled by this process
+STATS_CACHE = StatsCache()
@@ -1,12 +1,20 @@
 import contextlib as _cl
 import fastapi as _fa
+import migrations as _mig
+import settings as _st
+import sqlalchemy as _s
 import sqlalchemy.ext.asyncio as _sa
 import sqlalchemy.orm as _so
 import typing as _t
 
 
 Engine = _sa.create_async_engine(
-    "sqlite+aiosqlite:///./test.db", echo=False, future=True
+    _st.SETTINGS.database_url,
+    echo=False,
+    future=True,
+    pool_size=_st.SETTINGS.pool_size,
+    max_overflow=_st.SETTINGS.max_overflow,
+    pool_timeout=_st.SETTINGS.pool_timeout,
 )
 
 AsyncSessionLocal = _sa.async_sessionmaker(bind=Engine, expire_on_commit=False)
@@ -15,16 +23,45 @@ AsyncSessionLocal = _sa.async_sessionmaker(bind=Engine, expire_on_commit=False)
 Base = _so.declarative_base()
 
 
+@_s.event.listens_for(Engine.sync_engine, "connect")
+def _apply_sqlite_profile(dbapi_connection: _t.Any, _: _t.Any) -> None:
+    """
+    Apply the SQLite profile to every new database connection.
+
+    :param dbapi_connection: DBAPI connection.
+    """
+    cursor = dbapi_connection.cursor()
+    for statement in _st.SETTINGS.sqlite_profile.get_pragma_statements():
+        cursor.execute(statement)
+    cursor.close()
+
+
 @_cl.asynccontextmanager
 async def lifespan(app: _fa.FastAPI) -> _t.AsyncGenerator[None]:
     """
-    Create database and tables.
+    Create database and tables, and migrate an existing database to the current models.
+    The in-memory repository's store is loaded from the database, so it starts with the records committed before.
+    The record ingestion queue in "app.state", if any, is started once the database is ready, and flushed on shutdown before the database is closed.
     """
     async with Engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_mig.migrate, Base.metadata)
+
+    if _st.SETTINGS.repository == "memory":
+        # NOTE: Imported here, as the repositories import the models, which import this module
+        import repositories.memory as _rm
+
+        async with Engine.connect() as conn:
+            await _rm.load_store(_rm.STORE, conn)
+
+    record_ingestion_queue = getattr(app.state, "record_ingestion_queue", None)
+    if record_ingestion_queue is not None:
+        record_ingestion_queue.start()
 
     yield
 
+    if record_ingestion_queue is not None:
+        await record_ingestion_queue.stop()
+
     await Engine.dispose()
 
 
@@ -1,17 +1,55 @@
+import cache as _c
+import contextlib as _cl
 import database as _db
-import fastapi as _fa
+import repositories.base as _rb
+import repositories.memory as _rm
 import repositories.sql as _rs
-import sqlalchemy.ext.asyncio as _sea
+import settings as _st
+import typing as _t
 
 
-def get_sql_repository(
-    session: _sea.AsyncSession = _fa.Depends(_db.get_session),
-) -> _rs.SQLRepository:
+RepositoryFactory = _t.Callable[[], _t.AsyncContextManager[_rb.Repository]]
+
+
+@_cl.asynccontextmanager
+async def open_repository() -> _t.AsyncGenerator[_rb.Repository, None]:
+    """
+    Open the repository configured in the settings.
+    A database session is only opened for the SQL repository, and each repository opened has its own session.
+
+    :return: A repository instance.
     """
-    Get a repository instance.
+    if _st.SETTINGS.repository == "memory":
+        yield _rm.InMemoryRepository(store=_rm.STORE)
+        return
+
+    async with _db.AsyncSessionLocal() as session:
+        yield _rs.SQLRepository(session=session)
+
+
+async def get_repository() -> _t.AsyncGenerator[_rb.Repository, None]:
+    """
+    Yield the repository configured in the settings.
 
-    :param session: An async session for database operations.
     :return: A repository instance.
     """
-    # IMPORTANT NOTE: The repository should be an abstract class, as *any* repository type can be used here
-    return _rs.SQLRepository(session=session)
+    async with open_repository() as repository:
+        yield repository
+
+
+def get_repository_factory() -> RepositoryFactory:
+    """
+    Get a factory opening repositories with their own sessions, e.g. to run independent queries concurrently.
+
+    :return: A repository factory.
+    """
+    return open_repository
+
+
+def get_stats_cache() -> _c.StatsCache:
+    """
+    Get the stats cache shared by this process.
+
+    :return: A stats cache instance.
+    """
+    return _c.STATS_CACHE
@@ -0,0 +1,225 @@
+import asyncio as _asy
+import cache as _c
+import collections as _coll
+import dependencies as _dp
+import logging as _lg
+import schemas as _sch
+import services.record as _sr
+import typing as _t
+import uuid as _uuid
+
+#
+# NOTE: In write-behind mode, created records are acknowledged as soon as they are validated, and a single background task writes them in
+#       batched transactions, so bursts of submissions never queue up behind each other's SQLite write transactions.
+#       The queue lives in the process memory, so records which are accepted but not yet written are lost if the process is killed.
+#
+
+
+class RecordIngestionQueue:
+    """
+    Write-behind queue of records to create, drained by a background task in batched transactions.
+    Each record is submitted under an idempotency key, so a client retrying a submission does not create the record twice, and can look up
+    whether the record has been written.
+    """
+
+    def __init__(
+        self,
+        repository_factory: _dp.RepositoryFactory,
+        stats_cache: _c.StatsCache,
+        batch_size: int = 500,
+        max_size: int = 10_000,
+    ) -> None:
+        """
+        Initialise queue.
+
+        :param repository_factory: Repository factory, each batch is written using its own repository.
+        :param stats_cache: Stats cache, invalidated when a batch is committed.
+        :param batch_size: Maximum number of records written per transaction, defaults to 500
+        :param max_size: Maximum number of records waiting to be written, beyond which submissions are rejected, defaults to 10,000
+        """
+        self.__repository_factory = repository_factory
+        self.__stats_cache = stats_cache
+        self.__batch_size = batch_size
+        self.__max_size = max_size
+        # NOTE: The queue is created when started, as it is bound to the event loop serving the application
+        self.__queue: _t.Optional[
+            _asy.Queue[_t.Optional[tuple[str, _sch.RecordCreate]]]
+        ] = None
+        # Statuses of recently submitted records, oldest first, see `__set_status`
+        self.__key_2_status: _coll.OrderedDict[str, _sch.RecordIngestionStatus] = (
+            _coll.OrderedDict()
+        )
+        self.__max_statuses = max(_MAX_STATUSES, 2 * (max_size + batch_size))
+        self.__task: _t.Optional[_asy.Task] = None
+        self.__is_closed = True
+
+    def start(self) -> None:
+        """
+        Start the background task writing the queued records.
+        """
+        if self.__task is not None:
+            return
+
+        self.__queue = _asy.Queue(maxsize=self.__max_size)
+        self.__is_closed = False
+        self.__task = _asy.create_task(self.__drain(self.__queue))
+
+    async def stop(self) -> None:
+        """
+        Stop accepting records, and wait for every record already accepted to be written.
+        If the background task has failed, its error is logged and the records it has not written are marked as failed.
+        """
+        if self.__task is None:
+            return
+
+        self.__is_closed = True
+        # NOTE: Nothing is submitted once closed, so the stop marker is queued after every accepted record.
+        #       Only the task makes room in a full queue, so waiting for room is given up if the task has stopped.
+        put_task = _asy.ensure_future(self.__queue.put(None))
+        await _asy.wait([put_task, self.__task], return_when=_asy.FIRST_COMPLETED)
+        put_task.cancel()
+        try:
+            await self.__task
+        except Exception:
+            # Once the task has stopped, every pending record, whether queued or taken from the queue, is one it has not written
+            idempotency_keys = [
+                k for k, v in self.__key_2_status.items() if v.status == "pending"
+            ]
+            _LOGGER.exception(
+                "Record ingestion failed, %d accepted records were not written",
+                len(idempotency_keys),
+            )
+            for idempotency_key in idempotency_keys:
+                self.__set_status(idempotency_key, "failed")
+
+        self.__task = None
+        self.__queue = None
+
+    def submit(
+        self, record_create: _sch.RecordCreate, idempotency_key: _t.Optional[str] = None
+    ) -> _sch.RecordIngestionStatus:
+        """
+        Submit a record to be written.
+        A record submitted again under the key of a record which is pending or committed is not queued again, and failed records can be resubmitted.
+
+        :param record_create: Record input data.
+        :param idempotency_key: Key identifying the submission, defaults to None which generates a new key
+        :return: Status of the record.
+        :raise QueueFullError: If the queue is closed or full.
+        """
+        if idempotency_key is None:
+            idempotency_key = _uuid.uuid4().hex
+
+        status = self.__key_2_status.get(idempotency_key)
+        if status is not None and status.status != "failed":
+            return status
+
+        if self.__is_closed:
+            raise QueueFullError("The ingestion queue is not accepting records")
+        try:
+            self.__queue.put_nowait((idempotency_key, record_create))
+        except _asy.QueueFull:
+            raise QueueFullError("The ingestion queue is full") from None
+
+        return self.__set_status(idempotency_key, "pending")
+
+    def get_status(
+        self, idempotency_key: str
+    ) -> _t.Optional[_sch.RecordIngestionStatus]:
+        """
+        Get the status of a submitted record.
+
+        :param idempotency_key: Key identifying the submission.
+        :return: Status of the record, or None if no record was submitted recently under the key.
+        """
+        return self.__key_2_status.get(idempotency_key)
+
+    async def __drain(
+        self, queue: _asy.Queue[_t.Optional[tuple[str, _sch.RecordCreate]]]
+    ) -> None:
+        """
+        Write queued records in batches until the stop marker is reached.
+        Every record waiting when a batch starts is written with it, up to the batch size, so batches grow with the rate of submissions.
+
+        :param queue: Queue of idempotency keys and input data of records.
+        """
+        while True:
+            items = [await queue.get()]
+            while len(items) < self.__batch_size and not queue.empty():
+                items.append(queue.get_nowait())
+
+            is_stopped = items[-1] is None
+            items = [x for x in items if x is not None]
+            if items:
+                await self.__write(items)
+
+            if is_stopped:
+                return
+
+    async def __write(self, items: list[tuple[str, _sch.RecordCreate]]) -> None:
+        """
+        Write a batch of records in one transaction.
+        If the transaction fails, each record is written on its own, so only the records which cannot be written fail.
+
+        :param items: Idempotency key and input data of each record.
+        """
+        try:
+            await self.__create_bulk([x for _, x in items])
+        except Exception:
+            if len(items) == 1:
+                _LOGGER.exception("Failed to write record %s", items[0][0])
+                self.__set_status(items[0][0], "failed")
+                return
+        else:
+            for idempotency_key, _ in items:
+                self.__set_status(idempotency_key, "committed")
+            return
+
+        for item in items:
+            await self.__write([item])
+
+    async def __create_bulk(self, record_creates: list[_sch.RecordCreate]) -> None:
+        """
+        Create records in one transaction, using a repository of their own.
+
+        :param record_creates: Record input data.
+        """
+        async with self.__repository_factory() as repository:
+            record_service = _sr.RecordService(
+                repository=repository, stats_cache=self.__stats_cache
+            )
+            await record_service.create_bulk(record_creates)
+
+    def __set_status(
+        self, idempotency_key: str, status: str
+    ) -> _sch.RecordIngestionStatus:
+        """
+        Set the status of a submitted record, forgetting the oldest statuses beyond the maximum number kept.
+
+        :param idempotency_key: Key identifying the submission.
+        :param status: Status, see `schemas.RecordIngestionStatus`.
+        :return: Status of the record.
+        """
+        key_2_status = self.__key_2_status
+
+        ingestion_status = _sch.RecordIngestionStatus(
+            idempotency_key=idempotency_key, status=status
+        )
+        key_2_status[idempotency_key] = ingestion_status
+        key_2_status.move_to_end(idempotency_key)
+
+        # NOTE: Pending statuses are far fewer than the maximum, so only finished statuses are forgotten in practice
+        while len(key_2_status) > self.__max_statuses:
+            key_2_status.popitem(last=False)
+
+        return ingestion_status
+
+
+class QueueFullError(Exception):
+    """
+    Error raised when a record is submitted to an ingestion queue which is full or not accepting records.
+    """
+
+
+_LOGGER = _lg.getLogger(__name__)
+_MAX_STATUSES = 100_000
@@ -1,14 +1,29 @@
+import cache as _c
 import database as _db
+import dependencies as _dp
 import fastapi as _fa
 import fastapi.middleware.cors as _fmc
+import ingestion as _ing
+import routes.location as _rl
 import routes.record as _rr
 import routes.stats as _sr
+import settings as _st
 
 
 # Create app instance
 app = _fa.FastAPI(lifespan=_db.lifespan)
 
+# Created records are written in the background in write-behind mode, by a queue started and flushed in the lifespan
+if _st.SETTINGS.write_behind:
+    app.state.record_ingestion_queue = _ing.RecordIngestionQueue(
+        repository_factory=_dp.open_repository,
+        stats_cache=_c.STATS_CACHE,
+        batch_size=_st.SETTINGS.write_behind_batch_size,
+        max_size=_st.SETTINGS.write_behind_max_queue_size,
+    )
+
 # Include all routers
+app.include_router(_rl.router)
 app.include_router(_rr.router)
 app.include_router(_sr.router)
 
@@ -22,4 +37,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Location"],
 )
@@ -0,0 +1,141 @@
+import sqlalchemy as _s
+import typing as _t
+
+#
+# NOTE: Migrations are tracked with SQLite's "user_version" pragma, which holds the number of migrations applied.
+#       Each migration is frozen as raw SQL, as it must keep working however the models change afterwards.
+#
+
+
+def migrate(conn: _s.Connection, metadata: _s.MetaData) -> None:
+    """
+    Create any missing tables, then apply pending migrations to an existing database.
+    A new database is created from the models directly, so it is marked as fully migrated.
+
+    :param conn: Database connection, in a transaction.
+    :param metadata: Metadata of all models.
+    """
+    is_new_database = not _s.inspect(conn).has_table("pint_record")
+    metadata.create_all(conn)
+
+    version = conn.exec_driver_sql("PRAGMA user_version").scalar_one()
+    if is_new_database:
+        version = len(_MIGRATIONS)
+
+    for migration in _MIGRATIONS[version:]:
+        migration(conn)
+        version += 1
+
+    # NOTE: Pragmas do not accept bound parameters
+    conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+# ================================================================================
+# Migrations
+# ================================================================================
+
+
+def _add_date_type_and_indexes(conn: _s.Connection) -> None:
+    """
+    Change "pint_record.date" from free-form text to a date column, and add indexes used by filters, joins and stats.
+    SQLite cannot alter a column type, so the table is rebuilt and any "DD/MM/YYYY" dates are normalised to ISO 8601.
+
+    :param conn: Database connection, in a transaction.
+    """
+    for statement in (
+        """
+        CREATE TABLE pint_record_new (
+            id_ INTEGER NOT NULL,
+            total_cost FLOAT,
+            comment VARCHAR,
+            date DATE NOT NULL,
+            location VARCHAR NOT NULL,
+            number FLOAT NOT NULL,
+            pint_brand VARCHAR,
+            pint_cost FLOAT,
+            PRIMARY KEY (id_)
+        )
+        """,
+        """
+        INSERT INTO pint_record_new
+        SELECT
+            id_,
+            total_cost,
+            comment,
+            CASE
+                WHEN date LIKE '__/__/____'
+                THEN substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2)
+                ELSE date
+            END,
+            location,
+            number,
+            pint_brand,
+            pint_cost
+        FROM pint_record
+        """,
+        "DROP TABLE pint_record",
+        "ALTER TABLE pint_record_new RENAME TO pint_record",
+        "CREATE INDEX ix_pint_record_date ON pint_record (date)",
+        "CREATE INDEX ix_pint_record_location ON pint_record (location)",
+        "CREATE INDEX ix_pint_record_pint_brand ON pint_record (pint_brand)",
+        "CREATE INDEX IF NOT EXISTS ix_friend_pint_record_friend_name ON friend_pint_record (friend_name, pint_record_id)",
+        "CREATE INDEX IF NOT EXISTS ix_friend_total_pint_count ON friend (total_pint_count)",
+        "CREATE INDEX IF NOT EXISTS ix_location_summary_number_of_pints ON location_summary (number_of_pints)",
+        "CREATE INDEX IF NOT EXISTS ix_brand_summary_number_of_pints ON brand_summary (number_of_pints)",
+    ):
+        conn.exec_driver_sql(statement)
+
+
+def _fill_summary_tables(conn: _s.Connection) -> None:
+    """
+    Fill the location, friend-location and brand summary tables from the raw pint records, and recompute friend pint counts.
+    The summary tables are created empty on existing databases, and are only ever incremented afterwards, so they must start from the
+    records already in the database.
+
+    :param conn: Database connection, in a transaction.
+    """
+    for statement in (
+        """
+        UPDATE friend
+        SET total_pint_count = COALESCE(
+            (
+                SELECT sum(pint_record.number)
+                FROM friend_pint_record
+                JOIN pint_record ON friend_pint_record.pint_record_id = pint_record.id_
+                WHERE friend_pint_record.friend_name = friend.name
+            ),
+            0
+        )
+        """,
+        "DELETE FROM location_summary",
+        """
+        INSERT INTO location_summary (location, number_of_visits, number_of_pints)
+        SELECT location, count(*), sum(number)
+        FROM pint_record
+        GROUP BY location
+        """,
+        "DELETE FROM friend_location_summary",
+        """
+        INSERT INTO friend_location_summary (friend_name, location, number_of_pints)
+        SELECT friend_pint_record.friend_name, pint_record.location, sum(pint_record.number)
+        FROM friend_pint_record
+        JOIN pint_record ON friend_pint_record.pint_record_id = pint_record.id_
+        GROUP BY friend_pint_record.friend_name, pint_record.location
+        """,
+        "DELETE FROM brand_summary",
+        """
+        INSERT INTO brand_summary (pint_brand, number_of_pints)
+        SELECT pint_brand, sum(number)
+        FROM pint_record
+        WHERE pint_brand IS NOT NULL
+        GROUP BY pint_brand
+        """,
+    ):
+        conn.exec_driver_sql(statement)
+
+
+# Migrations in the order they are applied. NOTE: Only ever append to this
+_MIGRATIONS: tuple[_t.Callable[[_s.Connection], None], ...] = (
+    _add_date_type_and_indexes,
+    _fill_summary_tables,
+)
@@ -1,4 +1,5 @@
 import database as _db
+import datetime as _dt
 import sqlalchemy as _s
 import sqlalchemy.orm as _so
 import sqlmodel as _sm
@@ -11,6 +12,10 @@ import sqlmodel as _sm
 
 class FriendPintRecord(_db.Base):
     __tablename__ = "friend_pint_record"
+    # The primary key leads with the pint record, so friend-first lookups need their own (covering) index
+    __table_args__ = (
+        _s.Index("ix_friend_pint_record_friend_name", "friend_name", "pint_record_id"),
+    )
 
     pint_record_id: _so.Mapped[int] = _so.mapped_column(
         _s.ForeignKey("pint_record.id_"), primary_key=True
@@ -30,7 +35,9 @@ class Friend(_db.Base):
     name: _so.Mapped[str] = _so.mapped_column(
         nullable=False, primary_key=True, index=True
     )
-    total_pint_count: _so.Mapped[float | None] = _so.mapped_column(default=None)
+    total_pint_count: _so.Mapped[float | None] = _so.mapped_column(
+        default=None, index=True
+    )
     friend_pint_record: _so.Mapped[list["FriendPintRecord"]] = _so.relationship(
         back_populates="friend"
     )
@@ -39,14 +46,62 @@ class Friend(_db.Base):
 class PintRecord(_db.Base):
     __tablename__ = "pint_record"
 
-    id_: _so.Mapped[int | None] = _so.mapped_column(primary_key=True)
+    id_: _so.Mapped[int | None] = _so.mapped_column(primary_key=True, nullable=False)
     total_cost: _so.Mapped[float | None] = _so.mapped_column(default=None)
     comment: _so.Mapped[str | None] = _so.mapped_column(default=None)
-    date: _so.Mapped[str] = _so.mapped_column(nullable=False)
-    location: _so.Mapped[str] = _so.mapped_column(nullable=False)
+    date: _so.Mapped[_dt.date] = _so.mapped_column(nullable=False, index=True)
+    location: _so.Mapped[str] = _so.mapped_column(nullable=False, index=True)
     number: _so.Mapped[float] = _so.mapped_column(nullable=False)
-    pint_brand: _so.Mapped[str | None] = _so.mapped_column(default=None)
+    pint_brand: _so.Mapped[str | None] = _so.mapped_column(default=None, index=True)
     pint_cost: _so.Mapped[float | None] = _so.mapped_column(default=None)
     friend_pint_record: _so.Mapped[list["FriendPintRecord"]] = _so.relationship(
         back_populates="pint_record"
     )
+
+
+class LocationGeo(_db.Base):
+    __tablename__ = "location_geo"
+    # Keyed by "pint_record.location", so locations are geocoded and assigned to a borough once rather than per record
+
+    location: _so.Mapped[str] = _so.mapped_column(primary_key=True)
+    longitude: _so.Mapped[float | None] = _so.mapped_column(default=None)
+    latitude: _so.Mapped[float | None] = _so.mapped_column(default=None)
+    borough: _so.Mapped[str | None] = _so.mapped_column(default=None, index=True)
+
+
+# ================================================================================
+# Summary tables
+# ================================================================================
+#
+# NOTE: These tables are maintained incrementally in the same transaction as the pint records they summarise,
+#       so stats can be read without scanning "pint_record". Use `summaries.py` to rebuild or check them.
+#
+
+
+class LocationSummary(_db.Base):
+    __tablename__ = "location_summary"
+
+    location: _so.Mapped[str] = _so.mapped_column(primary_key=True)
+    number_of_visits: _so.Mapped[int] = _so.mapped_column(nullable=False, default=0)
+    number_of_pints: _so.Mapped[float] = _so.mapped_column(
+        nullable=False, default=0, index=True
+    )
+
+
+class FriendLocationSummary(_db.Base):
+    __tablename__ = "friend_location_summary"
+
+    friend_name: _so.Mapped[str] = _so.mapped_column(
+        _s.ForeignKey("friend.name"), primary_key=True
+    )
+    location: _so.Mapped[str] = _so.mapped_column(primary_key=True)
+    number_of_pints: _so.Mapped[float] = _so.mapped_column(nullable=False, default=0)
+
+
+class BrandSummary(_db.Base):
+    __tablename__ = "brand_summary"
+
+    pint_brand: _so.Mapped[str] = _so.mapped_column(primary_key=True)
+    number_of_pints: _so.Mapped[float] = _so.mapped_column(
+        nullable=False, default=0, index=True
+    )
@@ -0,0 +1,236 @@
+import datetime as _dt
+import models as _m
+import schemas as _sch
+import typing as _t
+
+# ================================================================================
+# Rows returned by stats queries
+# ================================================================================
+
+
+class FriendStatsRow(_t.NamedTuple):
+    name: str
+    pint_count: float
+    pint_count_rank: int
+    pub_2_frequency: dict[str, float]
+
+
+class LocationStatsRow(_t.NamedTuple):
+    location: str
+    number_of_visits: int
+    number_of_pints: float
+    number_of_pints_rank: int
+
+
+class BrandStatsRow(_t.NamedTuple):
+    pint_brand: str
+    number_of_pints: float
+    number_of_pints_rank: int
+
+
+class BoroughStatsRow(_t.NamedTuple):
+    borough: str
+    pub_count: int
+    number_of_visits: int
+    number_of_pints: float
+    number_of_pints_rank: int
+
+
+class TimeSeriesRow(_t.NamedTuple):
+    date: _dt.date
+    number_of_visits: int
+    number_of_pints: float
+    cumulative_number_of_pints: float
+
+
+# ================================================================================
+# Repository
+# ================================================================================
+
+
+class Repository(_t.Protocol):
+    """
+    Repository used by the services. Any implementation can be used, e.g. SQL or in-memory.
+    Writes are staged until `commit` is called, and discarded by `rollback`.
+    """
+
+    async def commit(self) -> None:
+        """
+        Commit staged writes.
+        """
+        ...
+
+    async def rollback(self) -> None:
+        """
+        Discard staged writes.
+        """
+        ...
+
+    async def create_pint_record(self, pint_record: _m.PintRecord) -> _m.PintRecord:
+        """
+        Create a new pint record, assigning its ID.
+
+        :param pint_record: Pint record
+        :return: Pint record
+        """
+        ...
+
+    async def create_pint_records(
+        self, pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> list[int]:
+        """
+        Create pint records in bulk.
+
+        :param pint_record_dicts: Pint record column values, one dictionary per record.
+        :return: Pint record IDs, in the same order as the input.
+        """
+        ...
+
+    async def create_friend_pint_records(
+        self, friend_pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        """
+        Create friend pint records in bulk.
+
+        :param friend_pint_record_dicts: Friend pint record column values, one dictionary per record.
+        """
+        ...
+
+    async def upsert_friend_pint_counts(
+        self, friend_name_2_pint_count: dict[str, float]
+    ) -> None:
+        """
+        Create friend records or increment their pint count.
+
+        :param friend_name_2_pint_count: Mapping of friend name to the number of pints to add.
+        """
+        ...
+
+    async def upsert_location_summaries(
+        self, location_2_visits_and_pints: dict[str, tuple[int, float]]
+    ) -> None:
+        """
+        Create location summaries or increment their visit and pint counts.
+
+        :param location_2_visits_and_pints: Mapping of location to the number of visits and pints to add.
+        """
+        ...
+
+    async def upsert_friend_location_summaries(
+        self, friend_location_2_pint_count: dict[tuple[str, str], float]
+    ) -> None:
+        """
+        Create friend location summaries or increment their pint count.
+
+        :param friend_location_2_pint_count: Mapping of friend name and location to the number of pints to add.
+        """
+        ...
+
+    async def upsert_brand_summaries(
+        self, pint_brand_2_pint_count: dict[str, float]
+    ) -> None:
+        """
+        Create brand summaries or increment their pint count.
+
+        :param pint_brand_2_pint_count: Mapping of pint brand to the number of pints to add.
+        """
+        ...
+
+    async def upsert_location_geos(
+        self, location_geo_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        """
+        Create location geo records or replace their coordinates and borough.
+
+        :param location_geo_dicts: Location geo column values, one dictionary per location.
+        """
+        ...
+
+    async def get_record_dicts(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> list[dict[str, _t.Any]]:
+        """
+        Get pint records as plain column values, ordered by ID.
+
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param record_page: Page of pint records to get, defaults to None which gets all of them
+        :return: Pint record column values, including friend names.
+        """
+        ...
+
+    def stream_records(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> _t.AsyncIterator[dict[str, _t.Any]]:
+        """
+        Stream pint records, ordered by ID.
+
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param record_page: Page of pint records to get, defaults to None which gets all of them
+        :return: Pint record column values, including friend names.
+        """
+        ...
+
+    async def get_friend_stats(
+        self,
+        leaderboard_page: _sch.LeaderboardPage | None = None,
+        max_pubs_per_friend: int | None = None,
+    ) -> _t.Sequence[FriendStatsRow]:
+        """
+        Get each friend's pint count, rank and pints per location, in descending order of pint count, with ties ordered by name.
+        Tied friends share the lowest rank, e.g. 1, 2, 2, 4, as in the offline pints information.
+        Each friend's locations are ordered by location, or by descending pints if the number of locations is capped, with ties ordered by location.
+
+        :param leaderboard_page: Page of friends to get, defaults to None which gets all of them
+        :param max_pubs_per_friend: Maximum number of locations per friend, where 0 gets none, defaults to None which gets every location
+        :return: Friend stats.
+        """
+        ...
+
+    async def get_location_stats(
+        self, leaderboard_page: _sch.LeaderboardPage | None = None
+    ) -> _t.Sequence[LocationStatsRow]:
+        """
+        Get visits, pints and pints rank per location, in descending order of pints, with ties ordered by location.
+        Tied locations share the lowest rank.
+
+        :param leaderboard_page: Page of locations to get, defaults to None which gets all of them
+        :return: Location stats.
+        """
+        ...
+
+    async def get_brand_stats(self) -> _t.Sequence[BrandStatsRow]:
+        """
+        Get pints and pints rank per brand, in descending order of pints, with ties ordered by brand.
+        Tied brands share the lowest rank.
+
+        :return: Brand stats.
+        """
+        ...
+
+    async def get_borough_stats(self) -> _t.Sequence[BoroughStatsRow]:
+        """
+        Get visited pubs, visits, pints and pints rank per borough, in descending order of pints, with ties ordered by borough.
+        Tied boroughs share the lowest rank. Only locations which have been visited and assigned to a borough are counted.
+
+        :return: Borough stats.
+        """
+        ...
+
+    async def get_time_series(
+        self,
+        bucket: _sch.TimeSeriesBucket,
+        record_filter: _sch.RecordFilter | None = None,
+    ) -> _t.Sequence[TimeSeriesRow]:
+        """
+        Get visits and pints per date bucket, with the running total of pints, in chronological order.
+        Days are bucketed by their date, weeks by the Monday starting them, and months by their first day. Empty buckets are omitted.
+
+        :param bucket: Date bucket.
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :return: Time series.
+        """
+        ...
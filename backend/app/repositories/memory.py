@@ -0,0 +1,977 @@
+import models as _m
+import numpy as _np
+import repositories.base as _rb
+import schemas as _sch
+import sqlalchemy as _s
+import sqlalchemy.ext.asyncio as _sea
+import typing as _t
+
+
+class ColumnStore:
+    """
+    Committed pint records held in process memory as NumPy column arrays, alongside incrementally maintained aggregates.
+    Text columns are dictionary-encoded, so filters and aggregates work on integer codes.
+    NOTE: Rows are only ever appended, so a view of the first rows stays valid while other transactions commit.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Initialise an empty store.
+
+        :param capacity: Initial number of rows allocated, which grows as required.
+        """
+        self.next_id = 1
+        # Flag which determines whether the store has been loaded from the database, see `load_store`
+        self.is_loaded = False
+
+        # Pint record columns
+        self.size = 0
+        self.id_ = _np.zeros(capacity, dtype=_np.int64)
+        self.date = _np.zeros(capacity, dtype="datetime64[D]")
+        self.location_code = _np.zeros(capacity, dtype=_np.int32)
+        # -1 encodes a missing brand
+        self.pint_brand_code = _np.zeros(capacity, dtype=_np.int32)
+        self.number = _np.zeros(capacity, dtype=_np.float64)
+        # NaN encodes a missing cost
+        self.pint_cost = _np.zeros(capacity, dtype=_np.float64)
+        self.total_cost = _np.zeros(capacity, dtype=_np.float64)
+        self.comment = _np.empty(capacity, dtype=object)
+
+        # Friend pint record columns
+        self.link_size = 0
+        self.link_pint_record_id = _np.zeros(capacity, dtype=_np.int64)
+        self.link_friend_code = _np.zeros(capacity, dtype=_np.int32)
+
+        self.locations = _Categories()
+        self.pint_brands = _Categories()
+        self.friends = _Categories()
+        self.boroughs = _Categories()
+
+        # Aggregates, indexed by category code
+        self.friend_pint_count = _np.zeros(0, dtype=_np.float64)
+        self.location_number_of_visits = _np.zeros(0, dtype=_np.int64)
+        self.location_number_of_pints = _np.zeros(0, dtype=_np.float64)
+        self.brand_number_of_pints = _np.zeros(0, dtype=_np.float64)
+
+        # Friend location aggregates, with one row per friend and location pair which has any pints, as most pairs have none
+        self.friend_location_size = 0
+        self.friend_location_friend_code = _np.zeros(0, dtype=_np.int32)
+        self.friend_location_location_code = _np.zeros(0, dtype=_np.int32)
+        self.friend_location_number_of_pints = _np.zeros(0, dtype=_np.float64)
+        self.__friend_location_codes_2_index: dict[tuple[int, int], int] = {}
+
+        # Location geo columns, indexed by location code. NaN encodes missing coordinates, and -1 a missing borough
+        self.location_longitude = _np.zeros(0, dtype=_np.float64)
+        self.location_latitude = _np.zeros(0, dtype=_np.float64)
+        self.location_borough_code = _np.zeros(0, dtype=_np.int32)
+
+    def reserve_ids(self, count: int) -> list[int]:
+        """
+        Reserve pint record IDs. IDs of transactions which are rolled back are not reused.
+
+        :param count: Number of IDs.
+        :return: Pint record IDs.
+        """
+        ids = list(range(self.next_id, self.next_id + count))
+        self.next_id += count
+        return ids
+
+    def append_pint_records(self, pint_record_dicts: list[dict[str, _t.Any]]) -> None:
+        """
+        Append pint records, which must already have IDs.
+
+        :param pint_record_dicts: Pint record column values, one dictionary per record.
+        """
+        count = len(pint_record_dicts)
+        if count == 0:
+            return
+
+        start, end = self.size, self.size + count
+        for name in (
+            "id_",
+            "date",
+            "location_code",
+            "pint_brand_code",
+            "number",
+            "pint_cost",
+            "total_cost",
+            "comment",
+        ):
+            setattr(self, name, _get_grown_array(getattr(self, name), end))
+
+        self.id_[start:end] = [x["id_"] for x in pint_record_dicts]
+        self.date[start:end] = [
+            _np.datetime64(x["date"], "D") for x in pint_record_dicts
+        ]
+        self.location_code[start:end] = [
+            self.locations.get_code(x["location"]) for x in pint_record_dicts
+        ]
+        self.pint_brand_code[start:end] = [
+            (
+                -1
+                if x["pint_brand"] is None
+                else self.pint_brands.get_code(x["pint_brand"])
+            )
+            for x in pint_record_dicts
+        ]
+        self.number[start:end] = [x["number"] for x in pint_record_dicts]
+        self.pint_cost[start:end] = [
+            _np.nan if x["pint_cost"] is None else x["pint_cost"]
+            for x in pint_record_dicts
+        ]
+        self.total_cost[start:end] = [
+            _np.nan if x["total_cost"] is None else x["total_cost"]
+            for x in pint_record_dicts
+        ]
+        self.comment[start:end] = [x["comment"] for x in pint_record_dicts]
+        self.size = end
+
+    def append_friend_pint_records(
+        self, friend_pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        """
+        Append friend pint records.
+
+        :param friend_pint_record_dicts: Friend pint record column values, one dictionary per record.
+        """
+        count = len(friend_pint_record_dicts)
+        if count == 0:
+            return
+
+        start, end = self.link_size, self.link_size + count
+        self.link_pint_record_id = _get_grown_array(self.link_pint_record_id, end)
+        self.link_friend_code = _get_grown_array(self.link_friend_code, end)
+        self.link_pint_record_id[start:end] = [
+            x["pint_record_id"] for x in friend_pint_record_dicts
+        ]
+        self.link_friend_code[start:end] = [
+            self.friends.get_code(x["friend_name"]) for x in friend_pint_record_dicts
+        ]
+        self.link_size = end
+
+    def add_aggregates(
+        self,
+        friend_name_2_pint_count: dict[str, float],
+        location_2_visits_and_pints: dict[str, list[float]],
+        friend_location_2_pint_count: dict[tuple[str, str], float],
+        pint_brand_2_pint_count: dict[str, float],
+    ) -> None:
+        """
+        Add increments to the aggregates.
+
+        :param friend_name_2_pint_count: Mapping of friend name to the number of pints to add.
+        :param location_2_visits_and_pints: Mapping of location to the number of visits and pints to add.
+        :param friend_location_2_pint_count: Mapping of friend name and location to the number of pints to add.
+        :param pint_brand_2_pint_count: Mapping of pint brand to the number of pints to add.
+        """
+        friend_codes = [self.friends.get_code(x) for x in friend_name_2_pint_count]
+        location_codes = [
+            self.locations.get_code(x) for x in location_2_visits_and_pints
+        ]
+        friend_location_codes = [
+            (self.friends.get_code(x), self.locations.get_code(y))
+            for x, y in friend_location_2_pint_count
+        ]
+        pint_brand_codes = [
+            self.pint_brands.get_code(x) for x in pint_brand_2_pint_count
+        ]
+        self.__grow_aggregates()
+
+        _np.add.at(
+            self.friend_pint_count,
+            friend_codes,
+            list(friend_name_2_pint_count.values()),
+        )
+        visits_and_pints = _np.array(
+            list(location_2_visits_and_pints.values()), dtype=_np.float64
+        ).reshape(-1, 2)
+        _np.add.at(
+            self.location_number_of_visits,
+            location_codes,
+            visits_and_pints[:, 0].astype(_np.int64),
+        )
+        _np.add.at(
+            self.location_number_of_pints, location_codes, visits_and_pints[:, 1]
+        )
+        # NOTE: The indices are got first, as getting them can grow the friend location arrays
+        friend_location_indices = self.__get_friend_location_indices(
+            friend_location_codes
+        )
+        _np.add.at(
+            self.friend_location_number_of_pints,
+            friend_location_indices,
+            list(friend_location_2_pint_count.values()),
+        )
+        _np.add.at(
+            self.brand_number_of_pints,
+            pint_brand_codes,
+            list(pint_brand_2_pint_count.values()),
+        )
+
+    def set_location_geos(self, location_geo_dicts: list[dict[str, _t.Any]]) -> None:
+        """
+        Set the coordinates and borough of locations.
+
+        :param location_geo_dicts: Location geo column values, one dictionary per location.
+        """
+        location_codes = [
+            self.locations.get_code(x["location"]) for x in location_geo_dicts
+        ]
+        self.__grow_aggregates()
+
+        self.location_longitude[location_codes] = [
+            _np.nan if x["longitude"] is None else x["longitude"]
+            for x in location_geo_dicts
+        ]
+        self.location_latitude[location_codes] = [
+            _np.nan if x["latitude"] is None else x["latitude"]
+            for x in location_geo_dicts
+        ]
+        self.location_borough_code[location_codes] = [
+            -1 if x["borough"] is None else self.boroughs.get_code(x["borough"])
+            for x in location_geo_dicts
+        ]
+
+    def __grow_aggregates(self) -> None:
+        """
+        Grow the aggregate arrays to cover every category code.
+        """
+        friend_count = len(self.friends.values)
+        location_count = len(self.locations.values)
+        pint_brand_count = len(self.pint_brands.values)
+
+        self.friend_pint_count = _get_padded_array(
+            self.friend_pint_count, (friend_count,)
+        )
+        self.location_number_of_visits = _get_padded_array(
+            self.location_number_of_visits, (location_count,)
+        )
+        self.location_number_of_pints = _get_padded_array(
+            self.location_number_of_pints, (location_count,)
+        )
+        self.brand_number_of_pints = _get_padded_array(
+            self.brand_number_of_pints, (pint_brand_count,)
+        )
+        self.location_longitude = _get_padded_array(
+            self.location_longitude, (location_count,), _np.nan
+        )
+        self.location_latitude = _get_padded_array(
+            self.location_latitude, (location_count,), _np.nan
+        )
+        self.location_borough_code = _get_padded_array(
+            self.location_borough_code, (location_count,), -1
+        )
+
+    def __get_friend_location_indices(
+        self, friend_location_codes: list[tuple[int, int]]
+    ) -> list[int]:
+        """
+        Get the row of each friend and location pair in the friend location aggregates, appending rows for new pairs.
+
+        :param friend_location_codes: Friend and location code of each pair.
+        :return: Row index of each pair.
+        """
+        codes_2_index = self.__friend_location_codes_2_index
+
+        new_friend_location_codes = [
+            x for x in dict.fromkeys(friend_location_codes) if x not in codes_2_index
+        ]
+        if new_friend_location_codes:
+            start = self.friend_location_size
+            end = start + len(new_friend_location_codes)
+            for name in (
+                "friend_location_friend_code",
+                "friend_location_location_code",
+                "friend_location_number_of_pints",
+            ):
+                setattr(self, name, _get_grown_array(getattr(self, name), end))
+
+            friend_codes, location_codes = zip(*new_friend_location_codes)
+            self.friend_location_friend_code[start:end] = friend_codes
+            self.friend_location_location_code[start:end] = location_codes
+            self.friend_location_number_of_pints[start:end] = 0.0
+            codes_2_index.update(zip(new_friend_location_codes, range(start, end)))
+            self.friend_location_size = end
+
+        return [codes_2_index[x] for x in friend_location_codes]
+
+
+class InMemoryRepository(_rb.Repository):
+    """
+    In-memory repository, backed by a column store shared by every repository instance.
+    Writes are staged per instance and applied to the store in one step on commit, so readers never see part of a transaction.
+    NOTE: Nothing is persisted, so the data is lost when the process exits.
+    """
+
+    def __init__(self, store: ColumnStore) -> None:
+        """
+        Initialise repository.
+
+        :param store: Column store.
+        """
+        self.__store = store
+        self.__reset()
+
+    def __reset(self) -> None:
+        """
+        Discard staged writes.
+        """
+        self.__pint_record_dicts: list[dict[str, _t.Any]] = []
+        self.__friend_pint_record_dicts: list[dict[str, _t.Any]] = []
+        self.__friend_name_2_pint_count: dict[str, float] = {}
+        self.__location_2_visits_and_pints: dict[str, list[float]] = {}
+        self.__friend_location_2_pint_count: dict[tuple[str, str], float] = {}
+        self.__pint_brand_2_pint_count: dict[str, float] = {}
+        self.__location_geo_dicts: list[dict[str, _t.Any]] = []
+
+    async def commit(self) -> None:
+        """
+        Apply staged writes to the store.
+        """
+        store = self.__store
+
+        # NOTE: Nothing is awaited here, so no other request can observe a partially applied transaction
+        store.append_pint_records(self.__pint_record_dicts)
+        store.append_friend_pint_records(self.__friend_pint_record_dicts)
+        store.add_aggregates(
+            self.__friend_name_2_pint_count,
+            self.__location_2_visits_and_pints,
+            self.__friend_location_2_pint_count,
+            self.__pint_brand_2_pint_count,
+        )
+        store.set_location_geos(self.__location_geo_dicts)
+        self.__reset()
+
+    async def rollback(self) -> None:
+        """
+        Discard staged writes.
+        """
+        self.__reset()
+
+    async def create_pint_record(self, pint_record: _m.PintRecord) -> _m.PintRecord:
+        """
+        Create a new pint record, assigning its ID.
+
+        :param pint_record: Pint record
+        :return: Pint record
+        """
+        (pint_record.id_,) = self.__store.reserve_ids(1)
+        self.__pint_record_dicts.append(
+            {x.name: getattr(pint_record, x.key) for x in _get_pint_record_columns()}
+        )
+        return pint_record
+
+    async def create_pint_records(
+        self, pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> list[int]:
+        """
+        Create pint records in bulk.
+
+        :param pint_record_dicts: Pint record column values, one dictionary per record.
+        :return: Pint record IDs, in the same order as the input.
+        """
+        ids = self.__store.reserve_ids(len(pint_record_dicts))
+        self.__pint_record_dicts.extend(
+            {**x, "id_": id_} for x, id_ in zip(pint_record_dicts, ids)
+        )
+        return ids
+
+    async def create_friend_pint_records(
+        self, friend_pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        """
+        Create friend pint records in bulk.
+
+        :param friend_pint_record_dicts: Friend pint record column values, one dictionary per record.
+        """
+        self.__friend_pint_record_dicts.extend(friend_pint_record_dicts)
+
+    async def upsert_friend_pint_counts(
+        self, friend_name_2_pint_count: dict[str, float]
+    ) -> None:
+        """
+        Create friend records or increment their pint count.
+
+        :param friend_name_2_pint_count: Mapping of friend name to the number of pints to add.
+        """
+        staged = self.__friend_name_2_pint_count
+        for friend_name, pint_count in friend_name_2_pint_count.items():
+            staged[friend_name] = staged.get(friend_name, 0.0) + pint_count
+
+    async def upsert_location_summaries(
+        self, location_2_visits_and_pints: dict[str, tuple[int, float]]
+    ) -> None:
+        """
+        Create location summaries or increment their visit and pint counts.
+
+        :param location_2_visits_and_pints: Mapping of location to the number of visits and pints to add.
+        """
+        staged = self.__location_2_visits_and_pints
+        for location, (
+            number_of_visits,
+            number_of_pints,
+        ) in location_2_visits_and_pints.items():
+            visits_and_pints = staged.setdefault(location, [0, 0.0])
+            visits_and_pints[0] += number_of_visits
+            visits_and_pints[1] += number_of_pints
+
+    async def upsert_friend_location_summaries(
+        self, friend_location_2_pint_count: dict[tuple[str, str], float]
+    ) -> None:
+        """
+        Create friend location summaries or increment their pint count.
+
+        :param friend_location_2_pint_count: Mapping of friend name and location to the number of pints to add.
+        """
+        staged = self.__friend_location_2_pint_count
+        for friend_location, pint_count in friend_location_2_pint_count.items():
+            staged[friend_location] = staged.get(friend_location, 0.0) + pint_count
+
+    async def upsert_brand_summaries(
+        self, pint_brand_2_pint_count: dict[str, float]
+    ) -> None:
+        """
+        Create brand summaries or increment their pint count.
+
+        :param pint_brand_2_pint_count: Mapping of pint brand to the number of pints to add.
+        """
+        staged = self.__pint_brand_2_pint_count
+        for pint_brand, pint_count in pint_brand_2_pint_count.items():
+            staged[pint_brand] = staged.get(pint_brand, 0.0) + pint_count
+
+    async def upsert_location_geos(
+        self, location_geo_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        """
+        Create location geo records or replace their coordinates and borough.
+
+        :param location_geo_dicts: Location geo column values, one dictionary per location.
+        """
+        self.__location_geo_dicts.extend(location_geo_dicts)
+
+    async def get_record_dicts(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> list[dict[str, _t.Any]]:
+        """
+        Get pint records as plain column values, ordered by ID.
+
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param record_page: Page of pint records to get, defaults to None which gets all of them
+        :return: Pint record column values, including friend names.
+        """
+        return list(self.__get_record_dicts(record_filter, record_page))
+
+    async def stream_records(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> _t.AsyncIterator[dict[str, _t.Any]]:
+        """
+        Stream pint records, ordered by ID.
+
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param record_page: Page of pint records to get, defaults to None which gets all of them
+        :return: Pint record column values, including friend names.
+        """
+        for record_dict in self.__get_record_dicts(record_filter, record_page):
+            yield record_dict
+
+    async def get_friend_stats(
+        self,
+        leaderboard_page: _sch.LeaderboardPage | None = None,
+        max_pubs_per_friend: int | None = None,
+    ) -> list[_rb.FriendStatsRow]:
+        """
+        Get each friend's pint count, rank and pints per location, in descending order of pint count, with ties ordered by name.
+
+        :param leaderboard_page: Page of friends to get, defaults to None which gets all of them
+        :param max_pubs_per_friend: Maximum number of locations per friend, where 0 gets none, defaults to None which gets every location
+        :return: Friend stats.
+        """
+        store = self.__store
+
+        pint_counts = store.friend_pint_count
+        friend_codes, ranks = _get_leaderboard_codes_and_ranks(
+            pint_counts,
+            store.friends.values,
+            _np.ones(len(pint_counts), dtype=bool),
+            leaderboard_page,
+        )
+
+        # Pints per location of the friends on the page, from one pass over the friend location aggregates
+        friend_code_2_location_pints: dict[int, list[tuple[str, float]]] = {}
+        if max_pubs_per_friend != 0:
+            size = store.friend_location_size
+            pair_friend_codes = store.friend_location_friend_code[:size]
+            indices = _np.flatnonzero(_np.isin(pair_friend_codes, friend_codes))
+            for friend_code, location_code, pints in zip(
+                pair_friend_codes[indices].tolist(),
+                store.friend_location_location_code[indices].tolist(),
+                store.friend_location_number_of_pints[indices].tolist(),
+            ):
+                friend_code_2_location_pints.setdefault(friend_code, []).append(
+                    (store.locations.values[location_code], pints)
+                )
+
+        friend_stats_rows = []
+        for friend_code, rank in zip(friend_codes.tolist(), ranks.tolist()):
+            pub_2_frequency = {}
+            if max_pubs_per_friend != 0:
+                location_pints = sorted(
+                    friend_code_2_location_pints.get(friend_code, [])
+                )
+                if max_pubs_per_friend is not None:
+                    location_pints.sort(key=lambda x: -x[1])
+                    location_pints = location_pints[:max_pubs_per_friend]
+                pub_2_frequency = dict(location_pints)
+
+            friend_stats_rows.append(
+                _rb.FriendStatsRow(
+                    store.friends.values[friend_code],
+                    float(pint_counts[friend_code]),
+                    rank,
+                    pub_2_frequency,
+                )
+            )
+
+        return friend_stats_rows
+
+    async def get_location_stats(
+        self, leaderboard_page: _sch.LeaderboardPage | None = None
+    ) -> list[_rb.LocationStatsRow]:
+        """
+        Get visits, pints and pints rank per location, in descending order of pints, with ties ordered by location.
+
+        :param leaderboard_page: Page of locations to get, defaults to None which gets all of them
+        :return: Location stats.
+        """
+        store = self.__store
+
+        number_of_visits = store.location_number_of_visits
+        number_of_pints = store.location_number_of_pints
+        codes, ranks = _get_leaderboard_codes_and_ranks(
+            number_of_pints,
+            store.locations.values,
+            number_of_visits > 0,
+            leaderboard_page,
+        )
+        return [
+            _rb.LocationStatsRow(
+                store.locations.values[x],
+                int(number_of_visits[x]),
+                float(number_of_pints[x]),
+                y,
+            )
+            for x, y in zip(codes.tolist(), ranks.tolist())
+        ]
+
+    async def get_brand_stats(self) -> list[_rb.BrandStatsRow]:
+        """
+        Get pints and pints rank per brand, in descending order of pints, with ties ordered by brand.
+
+        :return: Brand stats.
+        """
+        store = self.__store
+
+        number_of_pints = store.brand_number_of_pints
+        codes, ranks = _get_leaderboard_codes_and_ranks(
+            number_of_pints,
+            store.pint_brands.values,
+            _np.ones(len(number_of_pints), dtype=bool),
+            None,
+        )
+        return [
+            _rb.BrandStatsRow(store.pint_brands.values[x], float(number_of_pints[x]), y)
+            for x, y in zip(codes.tolist(), ranks.tolist())
+        ]
+
+    async def get_borough_stats(self) -> list[_rb.BoroughStatsRow]:
+        """
+        Get visited pubs, visits, pints and pints rank per borough, in descending order of pints, with ties ordered by borough.
+
+        :return: Borough stats.
+        """
+        store = self.__store
+
+        is_counted = (store.location_number_of_visits > 0) & (
+            store.location_borough_code >= 0
+        )
+        borough_codes = store.location_borough_code[is_counted]
+        borough_count = len(store.boroughs.values)
+        pub_count = _np.bincount(borough_codes, minlength=borough_count)
+        number_of_visits = _np.bincount(
+            borough_codes,
+            weights=store.location_number_of_visits[is_counted],
+            minlength=borough_count,
+        )
+        number_of_pints = _np.bincount(
+            borough_codes,
+            weights=store.location_number_of_pints[is_counted],
+            minlength=borough_count,
+        )
+        codes, ranks = _get_leaderboard_codes_and_ranks(
+            number_of_pints, store.boroughs.values, pub_count > 0, None
+        )
+        return [
+            _rb.BoroughStatsRow(
+                store.boroughs.values[x],
+                int(pub_count[x]),
+                int(number_of_visits[x]),
+                float(number_of_pints[x]),
+                y,
+            )
+            for x, y in zip(codes.tolist(), ranks.tolist())
+        ]
+
+    async def get_time_series(
+        self,
+        bucket: _sch.TimeSeriesBucket,
+        record_filter: _sch.RecordFilter | None = None,
+    ) -> list[_rb.TimeSeriesRow]:
+        """
+        Get visits and pints per date bucket, with the running total of pints, in chronological order.
+
+        :param bucket: Date bucket.
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :return: Time series.
+        """
+        store = self.__store
+
+        mask = self.__get_record_mask(record_filter)
+        dates = store.date[: store.size][mask]
+        if bucket == "week":
+            # Day zero, 1970-01-01, is a Thursday, so this is the number of days since the last Monday
+            dates = dates - (dates.astype(_np.int64) + 3) % 7
+        elif bucket == "month":
+            dates = dates.astype("datetime64[M]").astype("datetime64[D]")
+
+        bucket_dates, bucket_codes = _np.unique(dates, return_inverse=True)
+        number_of_visits = _np.bincount(bucket_codes, minlength=len(bucket_dates))
+        number_of_pints = _np.bincount(
+            bucket_codes,
+            weights=store.number[: store.size][mask],
+            minlength=len(bucket_dates),
+        )
+        return [
+            _rb.TimeSeriesRow(*x)
+            for x in zip(
+                bucket_dates.tolist(),
+                number_of_visits.tolist(),
+                number_of_pints.tolist(),
+                _np.cumsum(number_of_pints).tolist(),
+            )
+        ]
+
+    def __get_record_mask(self, record_filter: _sch.RecordFilter | None) -> _np.ndarray:
+        """
+        Get a mask of the pint records passing a filter, evaluated as vectorised masks over the columns.
+
+        :param record_filter: Filter applied to the pint records.
+        :return: Mask, in storage order.
+        """
+        store = self.__store
+
+        size, link_size = store.size, store.link_size
+        mask = _np.ones(size, dtype=bool)
+        if record_filter is None:
+            return mask
+
+        if record_filter.date_from is not None:
+            mask &= store.date[:size] >= _np.datetime64(record_filter.date_from, "D")
+        if record_filter.date_to is not None:
+            mask &= store.date[:size] <= _np.datetime64(record_filter.date_to, "D")
+        if record_filter.location is not None:
+            mask &= store.location_code[:size] == store.locations.find_code(
+                record_filter.location
+            )
+        if record_filter.pint_brand is not None:
+            mask &= store.pint_brand_code[:size] == store.pint_brands.find_code(
+                record_filter.pint_brand
+            )
+        if record_filter.friend_name is not None:
+            friend_code = store.friends.find_code(record_filter.friend_name)
+            link_pint_record_id = store.link_pint_record_id[:link_size]
+            link_friend_code = store.link_friend_code[:link_size]
+            mask &= _np.isin(
+                store.id_[:size], link_pint_record_id[link_friend_code == friend_code]
+            )
+
+        return mask
+
+    def __get_record_dicts(
+        self,
+        record_filter: _sch.RecordFilter | None,
+        record_page: _sch.RecordPage | None,
+    ) -> _t.Iterator[dict[str, _t.Any]]:
+        """
+        Get pint record column values, including friend names, ordered by ID.
+        Filters are evaluated as vectorised masks over the columns.
+
+        :param record_filter: Filter applied to the pint records.
+        :param record_page: Page of pint records to get.
+        :return: Pint record column values.
+        """
+        store = self.__store
+
+        size, link_size = store.size, store.link_size
+        id_ = store.id_[:size]
+        link_pint_record_id = store.link_pint_record_id[:link_size]
+        link_friend_code = store.link_friend_code[:link_size]
+
+        mask = self.__get_record_mask(record_filter)
+        if record_page is not None and record_page.after_id is not None:
+            mask &= id_ > record_page.after_id
+
+        # Transactions commit in any order, so rows are not necessarily stored in ID order
+        indices = _np.flatnonzero(mask)
+        indices = indices[_np.argsort(id_[indices], kind="stable")]
+        if record_page is not None and record_page.limit is not None:
+            indices = indices[: record_page.limit]
+
+        # Group friend pint records by pint record ID, so each record's friends are a contiguous slice
+        link_order = _np.argsort(link_pint_record_id, kind="stable")
+        sorted_link_pint_record_id = link_pint_record_id[link_order]
+        sorted_link_friend_code = link_friend_code[link_order]
+
+        for start in range(0, len(indices), _CHUNK_SIZE):
+            chunk = indices[start : start + _CHUNK_SIZE]
+            chunk_ids = id_[chunk]
+            link_starts = _np.searchsorted(
+                sorted_link_pint_record_id, chunk_ids, "left"
+            )
+            link_ends = _np.searchsorted(sorted_link_pint_record_id, chunk_ids, "right")
+            pint_brand_codes = store.pint_brand_code[chunk].tolist()
+            for (
+                record_id,
+                date,
+                location_code,
+                pint_brand_code,
+                number,
+                pint_cost,
+                total_cost,
+                comment,
+                link_start,
+                link_end,
+            ) in zip(
+                chunk_ids.tolist(),
+                store.date[chunk].tolist(),
+                store.location_code[chunk].tolist(),
+                pint_brand_codes,
+                store.number[chunk].tolist(),
+                store.pint_cost[chunk].tolist(),
+                store.total_cost[chunk].tolist(),
+                store.comment[chunk].tolist(),
+                link_starts.tolist(),
+                link_ends.tolist(),
+            ):
+                yield {
+                    "id_": record_id,
+                    "total_cost": None if _np.isnan(total_cost) else total_cost,
+                    "comment": comment,
+                    "date": date,
+                    "location": store.locations.values[location_code],
+                    "number": number,
+                    "pint_brand": (
+                        None
+                        if pint_brand_code == -1
+                        else store.pint_brands.values[pint_brand_code]
+                    ),
+                    "pint_cost": None if _np.isnan(pint_cost) else pint_cost,
+                    # Friend names are in alphabetical order, as in the SQL repository
+                    "friend_names": sorted(
+                        store.friends.values[x]
+                        for x in sorted_link_friend_code[link_start:link_end].tolist()
+                    ),
+                }
+
+
+async def load_store(store: ColumnStore, conn: _sea.AsyncConnection) -> None:
+    """
+    Load the committed pint records, summaries and location geos of the database into a store, once.
+    The aggregates are read from the summary tables rather than recomputed, and records are read in chunks as they come off the cursor.
+    NOTE: Writes to the store are not written back to the database, so they are lost when the process exits.
+
+    :param store: Empty column store.
+    :param conn: Database connection.
+    """
+    if store.is_loaded:
+        return
+
+    pint_record_table = _m.PintRecord.__table__
+    result = await conn.stream(
+        _s.select(pint_record_table).order_by(pint_record_table.c.id_)
+    )
+    async for rows in result.mappings().partitions(_CHUNK_SIZE):
+        store.append_pint_records([dict(x) for x in rows])
+    store.next_id = int(store.id_[: store.size].max(initial=0)) + 1
+
+    friend_pint_record_table = _m.FriendPintRecord.__table__
+    result = await conn.stream(_s.select(friend_pint_record_table))
+    async for rows in result.mappings().partitions(_CHUNK_SIZE):
+        store.append_friend_pint_records([dict(x) for x in rows])
+
+    friends = await conn.execute(_s.select(_m.Friend.name, _m.Friend.total_pint_count))
+    location_summaries = await conn.execute(_s.select(_m.LocationSummary.__table__))
+    friend_location_summaries = await conn.execute(
+        _s.select(_m.FriendLocationSummary.__table__)
+    )
+    brand_summaries = await conn.execute(_s.select(_m.BrandSummary.__table__))
+    store.add_aggregates(
+        {x.name: x.total_pint_count or 0.0 for x in friends},
+        {
+            x.location: [x.number_of_visits, x.number_of_pints]
+            for x in location_summaries
+        },
+        {
+            (x.friend_name, x.location): x.number_of_pints
+            for x in friend_location_summaries
+        },
+        {x.pint_brand: x.number_of_pints for x in brand_summaries},
+    )
+
+    location_geos = await conn.execute(_s.select(_m.LocationGeo.__table__))
+    store.set_location_geos([dict(x) for x in location_geos.mappings()])
+    store.is_loaded = True
+
+
+# ================================================================================
+# Private helpers
+# ================================================================================
+
+
+class _Categories:
+    """
+    Dictionary encoding of text values as dense integer codes.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise an empty encoding.
+        """
+        self.values: list[str] = []
+        self.__value_2_code: dict[str, int] = {}
+
+    def get_code(self, value: str) -> int:
+        """
+        Get the code of a value, adding the value if it has not been seen before.
+
+        :param value: Value.
+        :return: Code.
+        """
+        code = self.__value_2_code.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.__value_2_code[value] = code
+        return code
+
+    def find_code(self, value: str) -> int:
+        """
+        Find the code of a value, without adding it.
+
+        :param value: Value.
+        :return: Code, or -2 if the value has not been seen before, which matches no rows.
+        """
+        return self.__value_2_code.get(value, -2)
+
+
+def _get_grown_array(array: _np.ndarray, size: int) -> _np.ndarray:
+    """
+    Get an array with capacity for at least `size` rows, doubling the capacity when it needs to grow.
+
+    :param array: Array.
+    :param size: Number of rows required.
+    :return: The same array if it is large enough, otherwise a larger copy.
+    """
+    capacity = len(array)
+    if size <= capacity:
+        return array
+
+    grown_array = _np.empty(max(size, 2 * capacity), dtype=array.dtype)
+    grown_array[:capacity] = array
+    return grown_array
+
+
+def _get_leaderboard_codes_and_ranks(
+    values: _np.ndarray,
+    names: list[str],
+    mask: _np.ndarray,
+    leaderboard_page: _sch.LeaderboardPage | None,
+) -> tuple[_np.ndarray, _np.ndarray]:
+    """
+    Get a page of a leaderboard, ordered by descending value with ties ordered by name, where tied values share the lowest rank.
+
+    :param values: Value of each code.
+    :param names: Name of each code.
+    :param mask: Mask of the codes on the leaderboard.
+    :param leaderboard_page: Page of the leaderboard to get.
+    :return: Codes and ranks of the page.
+    """
+    codes = _np.flatnonzero(mask)
+    code_values = values[codes]
+
+    # Each rank is one more than the number of strictly greater values
+    sorted_values = _np.sort(code_values)
+    ranks = (
+        len(sorted_values) - _np.searchsorted(sorted_values, code_values, "right") + 1
+    )
+
+    order = _np.lexsort(
+        (_np.array([names[x] for x in codes.tolist()], dtype=str), -code_values)
+    )
+    codes, code_values, ranks = codes[order], code_values[order], ranks[order]
+
+    if leaderboard_page is not None:
+        if leaderboard_page.min_pints is not None:
+            is_shown = code_values >= leaderboard_page.min_pints
+            codes, ranks = codes[is_shown], ranks[is_shown]
+        stop = (
+            None
+            if leaderboard_page.limit is None
+            else leaderboard_page.offset + leaderboard_page.limit
+        )
+        codes, ranks = (
+            codes[leaderboard_page.offset : stop],
+            ranks[leaderboard_page.offset : stop],
+        )
+
+    return codes, ranks
+
+
+def _get_padded_array(
+    array: _np.ndarray, shape: tuple[int, ...], fill_value: _t.Any = 0
+) -> _np.ndarray:
+    """
+    Get an array padded at the end of each dimension to a shape.
+
+    :param array: Array.
+    :param shape: Shape, which is at least as large as the array's in every dimension.
+    :param fill_value: Value of the padding, defaults to 0
+    :return: Padded array.
+    """
+    if array.shape == shape:
+        return array
+
+    return _np.pad(
+        array,
+        [(0, x - y) for x, y in zip(shape, array.shape)],
+        constant_values=fill_value,
+    )
+
+
+def _get_pint_record_columns() -> list[_t.Any]:
+    """
+    Get the pint record table's columns.
+
+    :return: Columns.
+    """
+    return list(_m.PintRecord.__table__.columns)
+
+
+# Number of records converted to Python objects at a time when reading
+_CHUNK_SIZE = 1024
+
+# Shared by every request handled by this process
+STORE = ColumnStore()
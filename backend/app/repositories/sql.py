@@ -1,12 +1,16 @@
+import datetime as _dt
+import json as _json
 import models as _m
+import repositories.base as _rb
+import schemas as _sch
 import sqlmodel as _sm
-import sqlalchemy.orm as _sao
+import sqlalchemy as _s
+import sqlalchemy.dialects.sqlite as _sds
 import sqlalchemy.ext.asyncio as _sea
+import typing as _t
 
-# GLOBAL TODO: Fix return types
 
-
-class SQLRepository:
+class SQLRepository(_rb.Repository):
     """
     SQL repository.
     """
@@ -44,125 +48,715 @@ class SQLRepository:
         await session.flush()
         return pint_record
 
-    async def create_friend_pint_record(
-        self, pint_record_id: int | None, friend_name: str
-    ) -> _m.FriendPintRecord:
+    async def create_pint_records(
+        self, pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> list[int]:
         """
-        Create a friend pint record.
+        Create pint records in bulk using a single batched insert.
 
-        :param pint_record_id: Pint record ID.
-        :param friend_name: Friend name.
-        :return: Friend pint record.
+        :param pint_record_dicts: Pint record column values, one dictionary per record.
+        :return: Pint record IDs, in the same order as the input.
         """
         session = self.__session
 
-        assert pint_record_id is not None
+        if not pint_record_dicts:
+            return []
 
-        friend_pint_record = _m.FriendPintRecord(
-            pint_record_id=pint_record_id, friend_name=friend_name
+        statement = _s.insert(_m.PintRecord).returning(
+            _m.PintRecord.id_, sort_by_parameter_order=True
         )
-        session.add(friend_pint_record)
-        return friend_pint_record
+        result = await session.execute(statement, pint_record_dicts)
+        return list(result.scalars().all())
 
-    async def create_or_update_friend_record(
-        self, friend_name: str, number: float
-    ) -> _m.Friend:
+    async def create_friend_pint_records(
+        self, friend_pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> None:
         """
-        Create or update an existing friend record.
+        Create friend pint records in bulk using a single batched insert.
 
-        :param friend_name: Friend name.
-        :param number: Number of pints to update the friend record by.
-        :return: Friend record.
+        :param friend_pint_record_dicts: Friend pint record column values, one dictionary per record.
         """
         session = self.__session
 
-        statement = _sm.select(_m.Friend).where(_m.Friend.name == friend_name)
-        result = await session.execute(statement)
-        friend_record = result.scalar_one_or_none()
-        if friend_record is not None:
-            friend_record.total_pint_count = (
-                friend_record.total_pint_count or 0
-            ) + number
-        else:
-            friend_record = _m.Friend(name=friend_name, total_pint_count=number)
-            session.add(friend_record)
+        if not friend_pint_record_dicts:
+            return
 
-        return friend_record
+        await session.execute(_s.insert(_m.FriendPintRecord), friend_pint_record_dicts)
 
-    async def get_all_records(self) -> list[_m.PintRecord]:
+    async def upsert_friend_pint_counts(
+        self, friend_name_2_pint_count: dict[str, float]
+    ) -> None:
         """
-        Get all pint records.
+        Create friend records or increment their pint count, in a single statement.
+        The increment is applied by the database so concurrent writers cannot lose updates.
 
-        :return: List of all pint records.
+        :param friend_name_2_pint_count: Mapping of friend name to the number of pints to add.
         """
         session = self.__session
 
-        statement = _sm.select(_m.PintRecord).options(
-            _sao.selectinload(_m.PintRecord.friend_pint_record).selectinload(
-                _m.FriendPintRecord.friend
+        if not friend_name_2_pint_count:
+            return
+
+        statement = _get_increment_upsert_statement(
+            _m.Friend,
+            [
+                {"name": name, "total_pint_count": pint_count}
+                for name, pint_count in friend_name_2_pint_count.items()
+            ],
+        )
+        await session.execute(statement)
+
+    async def upsert_location_summaries(
+        self, location_2_visits_and_pints: dict[str, tuple[int, float]]
+    ) -> None:
+        """
+        Create location summaries or increment their visit and pint counts, in a single statement.
+
+        :param location_2_visits_and_pints: Mapping of location to the number of visits and pints to add.
+        """
+        session = self.__session
+
+        if not location_2_visits_and_pints:
+            return
+
+        statement = _get_increment_upsert_statement(
+            _m.LocationSummary,
+            [
+                {
+                    "location": location,
+                    "number_of_visits": number_of_visits,
+                    "number_of_pints": number_of_pints,
+                }
+                for location, (
+                    number_of_visits,
+                    number_of_pints,
+                ) in location_2_visits_and_pints.items()
+            ],
+        )
+        await session.execute(statement)
+
+    async def upsert_friend_location_summaries(
+        self, friend_location_2_pint_count: dict[tuple[str, str], float]
+    ) -> None:
+        """
+        Create friend location summaries or increment their pint count, in a single statement.
+
+        :param friend_location_2_pint_count: Mapping of friend name and location to the number of pints to add.
+        """
+        session = self.__session
+
+        if not friend_location_2_pint_count:
+            return
+
+        statement = _get_increment_upsert_statement(
+            _m.FriendLocationSummary,
+            [
+                {
+                    "friend_name": friend_name,
+                    "location": location,
+                    "number_of_pints": pint_count,
+                }
+                for (
+                    friend_name,
+                    location,
+                ), pint_count in friend_location_2_pint_count.items()
+            ],
+        )
+        await session.execute(statement)
+
+    async def upsert_brand_summaries(
+        self, pint_brand_2_pint_count: dict[str, float]
+    ) -> None:
+        """
+        Create brand summaries or increment their pint count, in a single statement.
+
+        :param pint_brand_2_pint_count: Mapping of pint brand to the number of pints to add.
+        """
+        session = self.__session
+
+        if not pint_brand_2_pint_count:
+            return
+
+        statement = _get_increment_upsert_statement(
+            _m.BrandSummary,
+            [
+                {"pint_brand": pint_brand, "number_of_pints": pint_count}
+                for pint_brand, pint_count in pint_brand_2_pint_count.items()
+            ],
+        )
+        await session.execute(statement)
+
+    async def upsert_location_geos(
+        self, location_geo_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        """
+        Create location geo records or replace their coordinates and borough, in a single statement.
+
+        :param location_geo_dicts: Location geo column values, one dictionary per location.
+        """
+        session = self.__session
+
+        if not location_geo_dicts:
+            return
+
+        statement = _sds.insert(_m.LocationGeo).values(location_geo_dicts)
+        statement = statement.on_conflict_do_update(
+            index_elements=[_m.LocationGeo.location],
+            set_={
+                x: statement.excluded[x] for x in ("longitude", "latitude", "borough")
+            },
+        )
+        await session.execute(statement)
+
+    async def rebuild_summaries(self) -> None:
+        """
+        Recompute friend pint counts and every summary table from the raw pint records.
+        """
+        session = self.__session
+
+        await session.execute(
+            _s.update(_m.Friend).values(
+                total_pint_count=_s.func.coalesce(
+                    _get_friend_summary_query()
+                    .where(_m.FriendPintRecord.friend_name == _m.Friend.name)
+                    .with_only_columns(_s.func.sum(_m.PintRecord.number))
+                    .scalar_subquery(),
+                    0,
+                )
+            )
+        )
+        for model, query in _get_summary_model_2_query().items():
+            await session.execute(_s.delete(model))
+            await session.execute(
+                _s.insert(model).from_select(
+                    [x.name for x in query.selected_columns], query
+                )
             )
+
+    async def get_summary_mismatch_counts(self) -> dict[str, int]:
+        """
+        Compare friend pint counts and every summary table with the values recomputed from the raw pint records.
+
+        :return: Mapping of table name to the number of rows that differ from the raw pint records.
+        """
+        session = self.__session
+
+        model_2_query = {_m.Friend: _get_friend_summary_query()}
+        model_2_query.update(_get_summary_model_2_query())
+
+        table_name_2_mismatch_count = {}
+        for model, raw_query in model_2_query.items():
+            columns = [model.__table__.c[x.name] for x in raw_query.selected_columns]
+            summary_query = _s.select(*_get_rounded_columns(columns))
+            raw_query = _s.select(*_get_rounded_columns(raw_query.subquery().columns))
+
+            mismatch_count = 0
+            for query in (
+                _s.except_(summary_query, raw_query),
+                _s.except_(raw_query, summary_query),
+            ):
+                result = await session.execute(
+                    _s.select(_s.func.count()).select_from(query.subquery())
+                )
+                mismatch_count += result.scalar_one()
+            table_name_2_mismatch_count[model.__tablename__] = mismatch_count
+
+        return table_name_2_mismatch_count
+
+    async def get_record_dicts(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> list[dict[str, _t.Any]]:
+        """
+        Get pint records as plain column values, ordered by ID.
+        Rows are read as tuples with each record's friend names aggregated by the database, so no ORM objects, identity map entries or
+        per-record friend queries are created.
+
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param record_page: Page of pint records to get, defaults to None which gets all of them
+        :return: Pint record column values, including friend names.
+        """
+        session = self.__session
+
+        result = await session.execute(
+            _get_record_dicts_query(record_filter, record_page)
         )
-        result = await session.execute(statement)
-        pint_records = result.scalars().all()
-        return list(pint_records)
+        return [_get_record_dict(x) for x in result.mappings()]
 
-    async def get_friend_pint_count(self) -> ...:
+    async def stream_records(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> _t.AsyncIterator[dict[str, _t.Any]]:
         """
-        Get friend stats.
+        Stream pint records, ordered by ID, as they come off the database cursor.
+        Each record's friend names are aggregated by the database, so no ORM objects are loaded.
 
-        :return: List of friend stats.
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param record_page: Page of pint records to get, defaults to None which gets all of them
+        :return: Pint record column values, including friend names.
         """
         session = self.__session
 
-        statement = _sm.select(
-            _m.Friend.name,
-            _m.Friend.total_pint_count.label("pint_count"),
-        ).order_by(_sm.desc("pint_count"))
-        result = await session.execute(statement)
-        return result.all()  # type: ignore
+        result = await session.stream(
+            _get_record_dicts_query(record_filter, record_page)
+        )
+        async for row in result.mappings():
+            yield _get_record_dict(row)
 
-    async def get_friend_pub_frequency(self) -> ...:
+    async def get_friend_stats(
+        self,
+        leaderboard_page: _sch.LeaderboardPage | None = None,
+        max_pubs_per_friend: int | None = None,
+    ) -> list[_rb.FriendStatsRow]:
         """
-        Get pub frequency per friend.
+        Get friend stats in a single query. The page of friends is ranked in a CTE, and each friend's pints per location are aggregated
+        into a JSON object by the database, so only the requested friends and locations are read.
 
-        :return: Pub frequency per friend.
+        :param leaderboard_page: Page of friends to get, defaults to None which gets all of them
+        :param max_pubs_per_friend: Maximum number of locations per friend, where 0 gets none, defaults to None which gets every location
+        :return: Friend stats.
         """
         session = self.__session
 
-        query = (
-            _sm.select(
-                _m.FriendPintRecord.friend_name,
-                _m.PintRecord.location,
-                _sm.func.sum(_m.PintRecord.number).label("pints_at_location"),
+        ranked_friends = (
+            _get_leaderboard_query(
+                _s.select(
+                    _m.Friend.name,
+                    _m.Friend.total_pint_count.label("pint_count"),
+                ),
+                _m.Friend.total_pint_count,
+                _m.Friend.name,
+                leaderboard_page,
             )
-            .join(
-                _m.PintRecord, _m.FriendPintRecord.pint_record_id == _m.PintRecord.id_
+            .add_columns(
+                _s.func.rank()
+                .over(order_by=_sm.desc(_m.Friend.total_pint_count))
+                .label("pint_count_rank")
             )
-            .group_by(_m.FriendPintRecord.friend_name, _m.PintRecord.location)
-            .order_by(_m.FriendPintRecord.friend_name, _m.PintRecord.location)
+            .cte("ranked_friend")
         )
+        query = _s.select(
+            ranked_friends.c.name,
+            ranked_friends.c.pint_count,
+            ranked_friends.c.pint_count_rank,
+        ).order_by(_sm.desc(ranked_friends.c.pint_count), ranked_friends.c.name)
+
+        if max_pubs_per_friend != 0:
+            summary = _m.FriendLocationSummary
+            friend_locations = _s.select(
+                summary.friend_name, summary.location, summary.number_of_pints
+            ).where(summary.friend_name.in_(_s.select(ranked_friends.c.name)))
+            if max_pubs_per_friend is not None:
+                friend_locations = friend_locations.add_columns(
+                    _s.func.row_number()
+                    .over(
+                        partition_by=summary.friend_name,
+                        order_by=(_sm.desc(summary.number_of_pints), summary.location),
+                    )
+                    .label("location_index")
+                )
+            friend_locations = friend_locations.subquery()
+
+            pub_2_frequency = _s.select(
+                friend_locations.c.friend_name,
+                _s.func.json_group_object(
+                    friend_locations.c.location,
+                    friend_locations.c.number_of_pints,
+                    type_=_s.JSON,
+                ).label("pub_2_frequency"),
+            ).group_by(friend_locations.c.friend_name)
+            if max_pubs_per_friend is not None:
+                pub_2_frequency = pub_2_frequency.where(
+                    friend_locations.c.location_index <= max_pubs_per_friend
+                )
+            pub_2_frequency = pub_2_frequency.subquery()
+
+            query = query.add_columns(pub_2_frequency.c.pub_2_frequency).outerjoin(
+                pub_2_frequency,
+                pub_2_frequency.c.friend_name == ranked_friends.c.name,
+            )
+
         result = await session.execute(query)
-        return result.all()  # type: ignore
+        return [
+            _rb.FriendStatsRow(
+                row.name,
+                row.pint_count,
+                row.pint_count_rank,
+                _get_sorted_pub_2_frequency(
+                    (max_pubs_per_friend != 0 and row.pub_2_frequency) or {},
+                    max_pubs_per_friend is not None,
+                ),
+            )
+            for row in result
+        ]
 
-    async def get_location_stats(self) -> list[_m.PintRecord]:
+    async def get_location_stats(
+        self, leaderboard_page: _sch.LeaderboardPage | None = None
+    ) -> list[_rb.LocationStatsRow]:
         """
-        Get location stats.
+        Get location stats, ranked by the database, so only the requested page is read.
 
-        :return: List of pint records location stats.
+        :param leaderboard_page: Page of locations to get, defaults to None which gets all of them
+        :return: Location stats.
         """
         session = self.__session
 
-        subquery = (
+        query = _get_leaderboard_query(
             _sm.select(
-                _m.PintRecord.location.label("location"),
-                _sm.func.count().label("number_of_visits"),
-                _sm.func.sum(_m.PintRecord.number).label("number_of_pints"),
-            )
-            .group_by(_m.PintRecord.location)
-            .order_by(_sm.desc("number_of_pints"))
-            .subquery()
+                _m.LocationSummary.location,
+                _m.LocationSummary.number_of_visits,
+                _m.LocationSummary.number_of_pints,
+            ),
+            _m.LocationSummary.number_of_pints,
+            _m.LocationSummary.location,
+            leaderboard_page,
+        ).add_columns(
+            _s.func.rank()
+            .over(order_by=_sm.desc(_m.LocationSummary.number_of_pints))
+            .label("number_of_pints_rank")
         )
-        query = _sm.select(subquery)  # type: ignore
         results = await session.execute(query)
         pint_records = results.all()
         return pint_records  # type: ignore
+
+    async def get_brand_stats(self) -> list[_rb.BrandStatsRow]:
+        """
+        Get brand stats.
+
+        :return: Pints and pints rank per brand.
+        """
+        session = self.__session
+
+        query = _sm.select(
+            _m.BrandSummary.pint_brand,
+            _m.BrandSummary.number_of_pints,
+            _s.func.rank()
+            .over(order_by=_sm.desc(_m.BrandSummary.number_of_pints))
+            .label("number_of_pints_rank"),
+        ).order_by(
+            _sm.desc(_m.BrandSummary.number_of_pints), _m.BrandSummary.pint_brand
+        )
+        results = await session.execute(query)
+        return results.all()  # type: ignore
+
+    async def get_borough_stats(self) -> list[_rb.BoroughStatsRow]:
+        """
+        Get borough stats, from the location summaries rather than the raw pint records.
+
+        :return: Visited pubs, visits, pints and pints rank per borough.
+        """
+        session = self.__session
+
+        number_of_pints = _s.func.sum(_m.LocationSummary.number_of_pints)
+        query = (
+            _s.select(
+                _m.LocationGeo.borough,
+                _s.func.count().label("pub_count"),
+                _s.func.sum(_m.LocationSummary.number_of_visits).label(
+                    "number_of_visits"
+                ),
+                number_of_pints.label("number_of_pints"),
+                _s.func.rank()
+                .over(order_by=_sm.desc(number_of_pints))
+                .label("number_of_pints_rank"),
+            )
+            .join(
+                _m.LocationSummary,
+                _m.LocationSummary.location == _m.LocationGeo.location,
+            )
+            .where(_m.LocationGeo.borough.is_not(None))
+            .group_by(_m.LocationGeo.borough)
+            .order_by(_sm.desc(number_of_pints), _m.LocationGeo.borough)
+        )
+        results = await session.execute(query)
+        return results.all()  # type: ignore
+
+    async def get_time_series(
+        self,
+        bucket: _sch.TimeSeriesBucket,
+        record_filter: _sch.RecordFilter | None = None,
+    ) -> list[_rb.TimeSeriesRow]:
+        """
+        Get the time series in a single grouped query, with the running total computed by a window function over the groups.
+
+        :param bucket: Date bucket.
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :return: Visits, pints and cumulative pints per date bucket.
+        """
+        session = self.__session
+
+        date = _get_date_bucket_column(bucket).label("date")
+        number_of_pints = _s.func.sum(_m.PintRecord.number)
+        query = _get_filtered_records_query(
+            _s.select(
+                date,
+                _s.func.count().label("number_of_visits"),
+                number_of_pints.label("number_of_pints"),
+                _s.func.sum(number_of_pints)
+                .over(order_by=date)
+                .label("cumulative_number_of_pints"),
+            ),
+            record_filter,
+        )
+        query = query.group_by(date).order_by(date)
+        results = await session.execute(query)
+        return results.all()  # type: ignore
+
+
+# ================================================================================
+# Private helpers
+# ================================================================================
+
+
+def _get_increment_upsert_statement(
+    model: type[_t.Any], rows: list[dict[str, _t.Any]]
+) -> _s.Insert:
+    """
+    Get an upsert statement which inserts rows, or adds their values to the existing rows.
+    Primary key columns identify the row and every other column is treated as an increment.
+
+    :param model: Model of the table to upsert into.
+    :param rows: Column values, one dictionary per row.
+    :return: Upsert statement.
+    """
+    table = model.__table__
+    statement = _sds.insert(model).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={
+            column.name: _s.func.coalesce(column, 0) + statement.excluded[column.name]
+            for column in table.columns
+            if not column.primary_key
+        },
+    )
+
+
+def _get_records_query(
+    statement: _s.Select,
+    record_filter: _sch.RecordFilter | None,
+    record_page: _sch.RecordPage | None,
+) -> _s.Select:
+    """
+    Add filters and keyset pagination on the pint record ID to a pint record query.
+
+    :param statement: Query selecting from the pint record table.
+    :param record_filter: Filter applied to the pint records.
+    :param record_page: Page of pint records to get.
+    :return: Query.
+    """
+    statement = _get_filtered_records_query(statement, record_filter)
+
+    statement = statement.order_by(_m.PintRecord.id_)
+    if record_page is not None:
+        if record_page.after_id is not None:
+            statement = statement.where(_m.PintRecord.id_ > record_page.after_id)
+        if record_page.limit is not None:
+            statement = statement.limit(record_page.limit)
+
+    return statement
+
+
+def _get_record_dicts_query(
+    record_filter: _sch.RecordFilter | None, record_page: _sch.RecordPage | None
+) -> _s.Select:
+    """
+    Get a query selecting pint record column values, with each record's friend names aggregated into a JSON array in alphabetical order.
+
+    :param record_filter: Filter applied to the pint records.
+    :param record_page: Page of pint records to get.
+    :return: Query.
+    """
+    # NOTE: SQLite before 3.44 has no ORDER BY within aggregates, so the names are aggregated from an ordered subquery, read from the primary key
+    friend_names = (
+        _s.select(_m.FriendPintRecord.friend_name)
+        .where(_m.FriendPintRecord.pint_record_id == _m.PintRecord.id_)
+        .order_by(_m.FriendPintRecord.friend_name)
+        .correlate(_m.PintRecord)
+        .subquery()
+    )
+    friend_names_subquery = _s.select(
+        _s.func.json_group_array(friend_names.c.friend_name)
+    ).scalar_subquery()
+    return _get_records_query(
+        _s.select(
+            *_m.PintRecord.__table__.columns,
+            friend_names_subquery.label("friend_names"),
+        ),
+        record_filter,
+        record_page,
+    )
+
+
+def _get_record_dict(row: _s.RowMapping) -> dict[str, _t.Any]:
+    """
+    Get pint record column values from a row of `_get_record_dicts_query`.
+
+    :param row: Row.
+    :return: Pint record column values, including friend names.
+    """
+    record_dict = dict(row)
+    record_dict["friend_names"] = _json.loads(record_dict["friend_names"])
+    return record_dict
+
+
+def _get_filtered_records_query(
+    statement: _s.Select, record_filter: _sch.RecordFilter | None
+) -> _s.Select:
+    """
+    Add filters to a pint record query.
+
+    :param statement: Query selecting from the pint record table.
+    :param record_filter: Filter applied to the pint records.
+    :return: Query.
+    """
+    if record_filter is not None:
+        if record_filter.date_from is not None or record_filter.date_to is not None:
+            # NOTE: Without statistics, SQLite expects a range open at one end to match too many records to be worth the date index, and
+            #       scans the table in ID order instead, so the range is closed with the earliest or latest date
+            statement = statement.where(
+                _m.PintRecord.date.between(
+                    record_filter.date_from or _dt.date.min,
+                    record_filter.date_to or _dt.date.max,
+                )
+            )
+        if record_filter.location is not None:
+            statement = statement.where(
+                _m.PintRecord.location == record_filter.location
+            )
+        if record_filter.pint_brand is not None:
+            statement = statement.where(
+                _m.PintRecord.pint_brand == record_filter.pint_brand
+            )
+        if record_filter.friend_name is not None:
+            # Friend-first lookup, so the friend name index is used
+            statement = statement.where(
+                _m.PintRecord.id_.in_(
+                    _s.select(_m.FriendPintRecord.pint_record_id).where(
+                        _m.FriendPintRecord.friend_name == record_filter.friend_name
+                    )
+                )
+            )
+
+    return statement
+
+
+def _get_leaderboard_query(
+    statement: _s.Select,
+    value_column: _s.ColumnElement,
+    name_column: _s.ColumnElement,
+    leaderboard_page: _sch.LeaderboardPage | None,
+) -> _s.Select:
+    """
+    Order a query by descending value, with ties ordered by name, and add the minimum value filter and offset pagination of a leaderboard.
+    NOTE: Rows under the minimum value are ranked below every other row, so filtering them out does not change any other row's rank.
+
+    :param statement: Query.
+    :param value_column: Column the rows are ranked by.
+    :param name_column: Column ties are ordered by.
+    :param leaderboard_page: Page of the leaderboard to get.
+    :return: Query.
+    """
+    statement = statement.order_by(_sm.desc(value_column), name_column)
+    if leaderboard_page is not None:
+        if leaderboard_page.min_pints is not None:
+            statement = statement.where(value_column >= leaderboard_page.min_pints)
+        if leaderboard_page.offset:
+            statement = statement.offset(leaderboard_page.offset)
+        if leaderboard_page.limit is not None:
+            statement = statement.limit(leaderboard_page.limit)
+
+    return statement
+
+
+def _get_sorted_pub_2_frequency(
+    pub_2_frequency: dict[str, float], is_capped: bool
+) -> dict[str, float]:
+    """
+    Sort a friend's pints per location, as JSON aggregates do not guarantee any order.
+
+    :param pub_2_frequency: Mapping of location to pints.
+    :param is_capped: Flag which determines whether the locations are ordered by descending pints rather than by location.
+    :return: Sorted mapping of location to pints.
+    """
+    if is_capped:
+        return dict(sorted(pub_2_frequency.items(), key=lambda x: (-x[1], x[0])))
+    return dict(sorted(pub_2_frequency.items()))
+
+
+def _get_date_bucket_column(bucket: _sch.TimeSeriesBucket) -> _s.ColumnElement:
+    """
+    Get the first date of each pint record's date bucket.
+    Weeks start on Monday, as ISO 8601 weeks do.
+
+    :param bucket: Date bucket.
+    :return: Column.
+    """
+    date = _m.PintRecord.date
+    if bucket == "day":
+        return date
+    if bucket == "week":
+        # Step back 6 days, then forward to the next Monday, which gives the Monday on or before the date
+        return _s.func.date(date, "-6 days", "weekday 1", type_=_s.Date)
+    return _s.func.date(date, "start of month", type_=_s.Date)
+
+
+def _get_friend_summary_query() -> _s.Select:
+    """
+    Get a query computing each friend's pint count from the raw pint records.
+
+    :return: Query.
+    """
+    return (
+        _s.select(
+            _m.FriendPintRecord.friend_name.label("name"),
+            _s.func.sum(_m.PintRecord.number).label("total_pint_count"),
+        )
+        .join(_m.PintRecord, _m.FriendPintRecord.pint_record_id == _m.PintRecord.id_)
+        .group_by(_m.FriendPintRecord.friend_name)
+    )
+
+
+def _get_summary_model_2_query() -> dict[type[_t.Any], _s.Select]:
+    """
+    Get the queries computing each summary table from the raw pint records.
+    The query columns are labelled with the summary table's column names.
+
+    :return: Mapping of summary table model to query.
+    """
+    return {
+        _m.LocationSummary: _s.select(
+            _m.PintRecord.location,
+            _s.func.count().label("number_of_visits"),
+            _s.func.sum(_m.PintRecord.number).label("number_of_pints"),
+        ).group_by(_m.PintRecord.location),
+        _m.FriendLocationSummary: _s.select(
+            _m.FriendPintRecord.friend_name,
+            _m.PintRecord.location,
+            _s.func.sum(_m.PintRecord.number).label("number_of_pints"),
+        )
+        .join(_m.PintRecord, _m.FriendPintRecord.pint_record_id == _m.PintRecord.id_)
+        .group_by(_m.FriendPintRecord.friend_name, _m.PintRecord.location),
+        _m.BrandSummary: _s.select(
+            _m.PintRecord.pint_brand,
+            _s.func.sum(_m.PintRecord.number).label("number_of_pints"),
+        )
+        .where(_m.PintRecord.pint_brand.is_not(None))
+        .group_by(_m.PintRecord.pint_brand),
+    }
+
+
+def _get_rounded_columns(
+    columns: _t.Iterable[_s.ColumnElement[_t.Any]],
+) -> list[_s.ColumnElement[_t.Any]]:
+    """
+    Round floating point columns, so sums accumulated in a different order still compare equal.
+
+    :param columns: Columns.
+    :return: Columns, with floating point ones rounded.
+    """
+    return [
+        (_s.func.round(x, 6).label(x.name) if isinstance(x.type, _s.Float) else x)
+        for x in columns
+    ]
@@ -0,0 +1,48 @@
+import cache as _c
+import dependencies as _dp
+import fastapi as _fa
+import repositories.base as _rb
+import services.location as _sl
+import schemas as _sch
+import typing as _t
+
+
+router = _fa.APIRouter()
+
+
+def get_location_service(
+    repository: _rb.Repository = _fa.Depends(_dp.get_repository),
+    stats_cache: _c.StatsCache = _fa.Depends(_dp.get_stats_cache),
+) -> _sl.LocationService:
+    """
+    Get a service instance.
+
+    :param repository: A repository instance for data access.
+    :param stats_cache: A stats cache instance, invalidated when locations are committed.
+    :return: A location service instance.
+    """
+    return _sl.LocationService(repository=repository, stats_cache=stats_cache)
+
+
+location_service = _t.Annotated[_sl.LocationService, _fa.Depends(get_location_service)]
+
+
+# ================================================================================
+# Routes
+# ================================================================================
+
+
+@router.put("/api/locations/geo", status_code=200)
+async def update_geos(
+    data: list[_sch.LocationGeoUpdate], service: location_service
+) -> _sch.LocationGeoBulkResponse:
+    """
+    Create or replace the coordinates and borough of many locations in a single transaction.
+    Locations are geocoded and assigned to boroughs offline, see "backend/scripts/load_location_geo_data.py".
+
+    :param data: Data.
+    :param service: Service.
+    :return: Number of locations updated.
+    """
+    number_of_locations = await service.update_geos(data)
+    return _sch.LocationGeoBulkResponse(number_of_locations=number_of_locations)
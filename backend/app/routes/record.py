@@ -1,8 +1,12 @@
+import cache as _c
 import database as _db
+import datetime as _dt
 import dependencies as _dp
 import fastapi as _fa
+import ingestion as _ing
 import models as _m
-import repositories.sql as _rs
+import pydantic as _pyd
+import repositories.base as _rb
 import services.record as _sr
 import schemas as _sch
 import sqlalchemy.ext.asyncio as _sea
@@ -13,55 +17,209 @@ router = _fa.APIRouter()
 
 
 def get_record_service(
-    repository: _rs.SQLRepository = _fa.Depends(_dp.get_sql_repository),
+    repository: _rb.Repository = _fa.Depends(_dp.get_repository),
+    stats_cache: _c.StatsCache = _fa.Depends(_dp.get_stats_cache),
 ) -> _sr.RecordService:
     """
     Get a service instance.
 
     :param repository: A repository instance for data access.
+    :param stats_cache: A stats cache instance, invalidated when records are committed.
     :return: An entry service instance.
     """
-    return _sr.RecordService(repository=repository)
+    return _sr.RecordService(repository=repository, stats_cache=stats_cache)
 
 
 record_service = _t.Annotated[_sr.RecordService, _fa.Depends(get_record_service)]
 
 
+def get_record_ingestion_queue(
+    request: _fa.Request,
+) -> _ing.RecordIngestionQueue | None:
+    """
+    Get the record ingestion queue of the application.
+
+    :param request: Request.
+    :return: A record ingestion queue instance, or None if records are not written behind.
+    """
+    return getattr(request.app.state, "record_ingestion_queue", None)
+
+
+record_ingestion_queue = _t.Annotated[
+    _ing.RecordIngestionQueue | None, _fa.Depends(get_record_ingestion_queue)
+]
+
+
 # ================================================================================
 # Routes
 # ================================================================================
 
 
-@router.get("/api/records/", status_code=200)
-async def get_all(service: record_service) -> list[_sch.RecordResponse]:
+@router.get(
+    "/api/records/",
+    status_code=200,
+    response_model=list[_sch.RecordResponse],
+)
+async def get_all(
+    service: record_service,
+    date_from: _dt.date | None = None,
+    date_to: _dt.date | None = None,
+    location: str | None = None,
+    friend_name: str | None = None,
+    pint_brand: str | None = None,
+    after_id: int | None = None,
+    limit: _t.Annotated[int | None, _fa.Query(ge=1)] = None,
+    format: _t.Literal["json", "ndjson"] = "json",
+) -> _fa.Response:
     """
     Get all entries from the service.
+    Pages are requested with `limit`, and the next page starts after the ID given by the `X-Next-Cursor` header.
+    The "ndjson" format streams one record per line, so full exports are never held in memory.
+    Records are serialised straight from their column values in one pass, rather than constructing and validating a model per record.
 
     :param service: Service.
+    :param date_from: Earliest date of the records, inclusive.
+    :param date_to: Latest date of the records, inclusive.
+    :param location: Location of the records.
+    :param friend_name: Name of a friend in the records' company.
+    :param pint_brand: Pint brand of the records.
+    :param after_id: ID after which the page of records starts.
+    :param limit: Maximum number of records in the page.
+    :param format: Response format.
     :return: Record responses.
     """
-    pint_records = await service.get_all()
-    return [
-        _sch.RecordResponse(
-            **p.__dict__,
-            friend_names=[x.friend_name for x in p.friend_pint_record],
+    record_filter = _sch.RecordFilter(
+        date_from=date_from,
+        date_to=date_to,
+        location=location,
+        friend_name=friend_name,
+        pint_brand=pint_brand,
+    )
+    record_page = _sch.RecordPage(after_id=after_id, limit=limit)
+    if format == "ndjson":
+        return _fa.responses.StreamingResponse(
+            _get_ndjson_lines(service.stream_all(record_filter, record_page)),
+            media_type="application/x-ndjson",
         )
-        for p in pint_records
-    ]
+
+    record_dicts = await service.get_all(record_filter, record_page)
+
+    # NOTE: Headers set on the injected response are not applied to a response returned directly
+    headers = {}
+    if record_page.limit is not None and len(record_dicts) == record_page.limit:
+        headers["X-Next-Cursor"] = str(record_dicts[-1]["id_"])
+
+    return _fa.Response(
+        content=_RECORD_RESPONSE_DICTS_ADAPTER.dump_json(record_dicts),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
-@router.post("/api/records/", status_code=201)
+@router.post(
+    "/api/records/",
+    status_code=201,
+    responses={202: {"model": _sch.RecordIngestionStatus}},
+)
 async def create(
-    data: _sch.RecordCreate, service: record_service
+    data: _sch.RecordCreate,
+    service: record_service,
+    ingestion_queue: record_ingestion_queue,
+    idempotency_key: _t.Annotated[
+        str | None, _fa.Header(max_length=255, pattern=r"^[A-Za-z0-9_.~-]+$")
+    ] = None,
 ) -> _sch.RecordResponse:
     """
     Create a record.
+    In write-behind mode, the record is queued once validated and accepted with a 202 response, whose `Location` header gives its status.
+    Retries should send the `Idempotency-Key` header of the first attempt, or the key it was given, so the record is only created once.
 
     :param data: Data.
     :param service: Service.
-    :return: Record.
+    :param ingestion_queue: Record ingestion queue, or None if records are not written behind.
+    :param idempotency_key: Key identifying the submission in write-behind mode, defaults to None which generates a new key.
+    :return: Record, or its ingestion status in write-behind mode.
     """
+    if ingestion_queue is not None:
+        try:
+            ingestion_status = ingestion_queue.submit(data, idempotency_key)
+        except _ing.QueueFullError as e:
+            raise _fa.HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": "1"}
+            )
+
+        return _fa.responses.JSONResponse(  # type: ignore
+            content=ingestion_status.model_dump(),
+            status_code=202,
+            headers={
+                "Location": f"/api/records/ingestion/{ingestion_status.idempotency_key}"
+            },
+        )
+
     pint_record = await service.create(data)
 
     pint_record_dict = pint_record.__dict__
     return _sch.RecordResponse(**pint_record_dict, friend_names=[])
+
+
+@router.post("/api/records/bulk", status_code=201)
+async def create_bulk(
+    data: list[_sch.RecordCreate], service: record_service
+) -> _sch.RecordBulkResponse:
+    """
+    Create many records in a single transaction.
+
+    :param data: Data.
+    :param service: Service.
+    :return: Number of records created.
+    """
+    number_of_records = await service.create_bulk(data)
+    return _sch.RecordBulkResponse(number_of_records=number_of_records)
+
+
+@router.get("/api/records/ingestion/{idempotency_key}", status_code=200)
+async def get_ingestion_status(
+    idempotency_key: str, ingestion_queue: record_ingestion_queue
+) -> _sch.RecordIngestionStatus:
+    """
+    Get the status of a record created in write-behind mode.
+
+    :param idempotency_key: Key identifying the submission.
+    :param ingestion_queue: Record ingestion queue, or None if records are not written behind.
+    :return: Ingestion status.
+    """
+    ingestion_status = (
+        ingestion_queue.get_status(idempotency_key)
+        if ingestion_queue is not None
+        else None
+    )
+    if ingestion_status is None:
+        raise _fa.HTTPException(
+            status_code=404,
+            detail="No record has been submitted recently under this idempotency key",
+        )
+
+    return ingestion_status
+
+
+# ================================================================================
+# Private helpers
+# ================================================================================
+
+
+async def _get_ndjson_lines(
+    record_dicts: _t.AsyncIterator[dict[str, _t.Any]],
+) -> _t.AsyncIterator[bytes]:
+    """
+    Get newline-delimited JSON lines from records.
+
+    :param record_dicts: Records, see `schemas.RecordResponseDict`.
+    :return: One JSON line per record.
+    """
+    async for record_dict in record_dicts:
+        yield _RECORD_RESPONSE_DICT_ADAPTER.dump_json(record_dict) + b"\n"
+
+
+# Serialisers of plain column values, where keys which are not response fields, e.g. "id_", are left out
+_RECORD_RESPONSE_DICT_ADAPTER = _pyd.TypeAdapter(_sch.RecordResponseDict)
+_RECORD_RESPONSE_DICTS_ADAPTER = _pyd.TypeAdapter(list[_sch.RecordResponseDict])
@@ -1,8 +1,10 @@
+import cache as _c
 import database as _db
+import datetime as _dt
 import dependencies as _dp
 import fastapi as _fa
 import models as _m
-import repositories.sql as _rs
+import repositories.base as _rb
 import services.stats as _st
 import schemas as _sch
 import sqlalchemy.ext.asyncio as _sea
@@ -13,18 +15,27 @@ router = _fa.APIRouter()
 
 
 def get_stats_service(
-    repository: _rs.SQLRepository = _fa.Depends(_dp.get_sql_repository),
+    repository: _rb.Repository = _fa.Depends(_dp.get_repository),
+    stats_cache: _c.StatsCache = _fa.Depends(_dp.get_stats_cache),
+    repository_factory: _dp.RepositoryFactory = _fa.Depends(_dp.get_repository_factory),
 ) -> _st.StatsService:
     """
     Get a service instance.
 
     :param repository: A repository instance for data access.
+    :param stats_cache: A stats cache instance.
+    :param repository_factory: A factory opening repositories with their own sessions.
     :return: An entry service instance.
     """
-    return _st.StatsService(repository=repository)
+    return _st.StatsService(
+        repository=repository,
+        stats_cache=stats_cache,
+        repository_factory=repository_factory,
+    )
 
 
 stats_service = _t.Annotated[_st.StatsService, _fa.Depends(get_stats_service)]
+stats_cache = _t.Annotated[_c.StatsCache, _fa.Depends(_dp.get_stats_cache)]
 
 
 # ================================================================================
@@ -33,22 +44,234 @@ stats_service = _t.Annotated[_st.StatsService, _fa.Depends(get_stats_service)]
 
 
 @router.get("/stats/friends/", status_code=200)
-async def get_friends_stats(service: stats_service) -> _sch.FriendsStatsResponse:
+async def get_friends_stats(
+    service: stats_service,
+    cache: stats_cache,
+    request: _fa.Request,
+    response: _fa.Response,
+    limit: _t.Annotated[int | None, _fa.Query(ge=1)] = None,
+    offset: _t.Annotated[int, _fa.Query(ge=0)] = 0,
+    min_pints: float | None = None,
+    max_pubs_per_friend: _t.Annotated[int | None, _fa.Query(ge=0)] = None,
+) -> _sch.FriendsStatsResponse:
     """
-    Get friends stats.
+    Get friends stats, ranked by pint count, where tied friends share the lowest rank.
+    Leaderboards are paged with `limit` and `offset`, and a compact response caps or, with 0, leaves out each friend's pubs.
+    Responses carry an entity tag, so clients polling with `If-None-Match` get a 304 until the data changes.
 
     :param service: Service
+    :param cache: Stats cache.
+    :param request: Request.
+    :param response: Response.
+    :param limit: Maximum number of friends.
+    :param offset: Number of friends skipped.
+    :param min_pints: Minimum pint count of the friends.
+    :param max_pubs_per_friend: Maximum number of pubs per friend, in descending order of pints.
     :return: Friends stats response.
     """
-    return await service.get_friends_stats()
+    not_modified_response = _get_not_modified_response(request, response, cache)
+    if not_modified_response is not None:
+        return not_modified_response  # type: ignore
+
+    return await service.get_friends_stats(
+        _get_leaderboard_page(limit, offset, min_pints), max_pubs_per_friend
+    )
 
 
 @router.get("/stats/location/", status_code=200)
-async def get_location_stats(service: stats_service) -> _sch.LocationStatsResponse:
+async def get_location_stats(
+    service: stats_service,
+    cache: stats_cache,
+    request: _fa.Request,
+    response: _fa.Response,
+    limit: _t.Annotated[int | None, _fa.Query(ge=1)] = None,
+    offset: _t.Annotated[int, _fa.Query(ge=0)] = 0,
+    min_pints: float | None = None,
+) -> _sch.LocationStatsResponse:
     """
-    Get all location stats.
+    Get location stats, ranked by pints, where tied locations share the lowest rank. Leaderboards are paged with `limit` and `offset`.
+    Responses carry an entity tag, so clients polling with `If-None-Match` get a 304 until the data changes.
 
     :param service: Service.
+    :param cache: Stats cache.
+    :param request: Request.
+    :param response: Response.
+    :param limit: Maximum number of locations.
+    :param offset: Number of locations skipped.
+    :param min_pints: Minimum number of pints of the locations.
     :return: Locations stats response.
     """
-    return await service.get_location_stats()
+    not_modified_response = _get_not_modified_response(request, response, cache)
+    if not_modified_response is not None:
+        return not_modified_response  # type: ignore
+
+    return await service.get_location_stats(
+        _get_leaderboard_page(limit, offset, min_pints)
+    )
+
+
+@router.get("/stats/brands/", status_code=200)
+async def get_brand_stats(
+    service: stats_service,
+    cache: stats_cache,
+    request: _fa.Request,
+    response: _fa.Response,
+) -> _sch.BrandStatsResponse:
+    """
+    Get all brand stats.
+    Responses carry an entity tag, so clients polling with `If-None-Match` get a 304 until the data changes.
+
+    :param service: Service.
+    :param cache: Stats cache.
+    :param request: Request.
+    :param response: Response.
+    :return: Brand stats response.
+    """
+    not_modified_response = _get_not_modified_response(request, response, cache)
+    if not_modified_response is not None:
+        return not_modified_response  # type: ignore
+
+    return await service.get_brand_stats()
+
+
+@router.get("/stats/boroughs/", status_code=200)
+async def get_borough_stats(
+    service: stats_service,
+    cache: stats_cache,
+    request: _fa.Request,
+    response: _fa.Response,
+) -> _sch.BoroughStatsResponse:
+    """
+    Get all borough stats, i.e. the visited pubs, visits and pints per borough, so a map can be coloured without any geometry.
+    Responses carry an entity tag, so clients polling with `If-None-Match` get a 304 until the data changes.
+
+    :param service: Service.
+    :param cache: Stats cache.
+    :param request: Request.
+    :param response: Response.
+    :return: Borough stats response.
+    """
+    not_modified_response = _get_not_modified_response(request, response, cache)
+    if not_modified_response is not None:
+        return not_modified_response  # type: ignore
+
+    return await service.get_borough_stats()
+
+
+@router.get("/stats/summary/", status_code=200)
+async def get_summary(
+    service: stats_service,
+    cache: stats_cache,
+    request: _fa.Request,
+    response: _fa.Response,
+    limit: _t.Annotated[int | None, _fa.Query(ge=1)] = None,
+    offset: _t.Annotated[int, _fa.Query(ge=0)] = 0,
+    min_pints: float | None = None,
+    max_pubs_per_friend: _t.Annotated[int | None, _fa.Query(ge=0)] = None,
+) -> _sch.StatsSummaryResponse:
+    """
+    Get friends, location, brand and borough stats in one response, computed concurrently, so a dashboard loads with a single request.
+    The leaderboard parameters page the friends and locations, as in `/stats/friends/` and `/stats/location/`.
+    Responses carry an entity tag, so clients polling with `If-None-Match` get a 304 until the data changes.
+
+    :param service: Service.
+    :param cache: Stats cache.
+    :param request: Request.
+    :param response: Response.
+    :param limit: Maximum number of friends and of locations.
+    :param offset: Number of friends and of locations skipped.
+    :param min_pints: Minimum number of pints of the friends and locations.
+    :param max_pubs_per_friend: Maximum number of pubs per friend, in descending order of pints.
+    :return: Stats summary response.
+    """
+    not_modified_response = _get_not_modified_response(request, response, cache)
+    if not_modified_response is not None:
+        return not_modified_response  # type: ignore
+
+    return await service.get_summary(
+        _get_leaderboard_page(limit, offset, min_pints), max_pubs_per_friend
+    )
+
+
+@router.get("/stats/timeseries/", status_code=200)
+async def get_time_series(
+    service: stats_service,
+    cache: stats_cache,
+    request: _fa.Request,
+    response: _fa.Response,
+    bucket: _sch.TimeSeriesBucket = "day",
+    date_from: _dt.date | None = None,
+    date_to: _dt.date | None = None,
+    friend_name: str | None = None,
+    max_points: _t.Annotated[int | None, _fa.Query(ge=3)] = None,
+) -> _sch.TimeSeriesResponse:
+    """
+    Get visits, pints and cumulative pints per day, week or month. Cumulative pints are totalled from the start of the date range.
+    Long histories can be downsampled to at most `max_points` points, so the response size is bounded however old the data is.
+    Responses carry an entity tag, so clients polling with `If-None-Match` get a 304 until the data changes.
+
+    :param service: Service.
+    :param cache: Stats cache.
+    :param request: Request.
+    :param response: Response.
+    :param bucket: Date bucket, where weeks start on Monday.
+    :param date_from: Earliest date of the records, inclusive.
+    :param date_to: Latest date of the records, inclusive.
+    :param friend_name: Name of a friend in the records' company.
+    :param max_points: Maximum number of points.
+    :return: Time series response.
+    """
+    not_modified_response = _get_not_modified_response(request, response, cache)
+    if not_modified_response is not None:
+        return not_modified_response  # type: ignore
+
+    record_filter = _sch.RecordFilter(
+        date_from=date_from, date_to=date_to, friend_name=friend_name
+    )
+    return await service.get_time_series(bucket, record_filter, max_points)
+
+
+# ================================================================================
+# Private helpers
+# ================================================================================
+
+
+def _get_leaderboard_page(
+    limit: int | None, offset: int, min_pints: float | None
+) -> _sch.LeaderboardPage | None:
+    """
+    Get a leaderboard page from query parameters.
+
+    :param limit: Maximum number of rows.
+    :param offset: Number of rows skipped.
+    :param min_pints: Minimum number of pints of the rows.
+    :return: Leaderboard page, or None if the full leaderboard is requested.
+    """
+    if limit is None and not offset and min_pints is None:
+        return None
+    return _sch.LeaderboardPage(limit=limit, offset=offset, min_pints=min_pints)
+
+
+def _get_not_modified_response(
+    request: _fa.Request, response: _fa.Response, cache: _c.StatsCache
+) -> _fa.Response | None:
+    """
+    Get a 304 response if the client already holds the current data version, otherwise tag the response.
+    NOTE: The entity tag is read before any data, so a commit during the request can only make the tag stale, never the data.
+
+    :param request: Request.
+    :param response: Response.
+    :param cache: Stats cache.
+    :return: A 304 response, or None if the client needs the full response.
+    """
+    etag = cache.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        client_etags = {x.strip().removeprefix("W/") for x in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            return _fa.Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
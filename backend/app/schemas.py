@@ -1,4 +1,26 @@
+import datetime as _dt
 import pydantic as _pyd
+import typing as _t
+
+
+class BrandStats(_pyd.BaseModel):
+    number_of_pints: float
+    number_of_pints_rank: int
+
+
+class BrandStatsResponse(_pyd.BaseModel):
+    brand_info: dict[str, BrandStats]
+
+
+class BoroughStats(_pyd.BaseModel):
+    pub_count: int
+    number_of_visits: int
+    number_of_pints: float
+    number_of_pints_rank: int
+
+
+class BoroughStatsResponse(_pyd.BaseModel):
+    borough_info: dict[str, BoroughStats]
 
 
 class FriendStats(_pyd.BaseModel):
@@ -12,6 +34,12 @@ class FriendsStatsResponse(_pyd.BaseModel):
     friends_info: dict[str, FriendStats]
 
 
+class LeaderboardPage(_pyd.BaseModel):
+    limit: int | None = _pyd.Field(default=None, ge=1)
+    offset: int = _pyd.Field(default=0, ge=0)
+    min_pints: float | None = None
+
+
 class LocationStats(_pyd.BaseModel):
     number_of_visits: int
     number_of_pints: float
@@ -22,8 +50,19 @@ class LocationStatsResponse(_pyd.BaseModel):
     location_info: dict[str, LocationStats]
 
 
+class LocationGeoUpdate(_pyd.BaseModel):
+    location: str
+    longitude: float | None
+    latitude: float | None
+    borough: str | None
+
+
+class LocationGeoBulkResponse(_pyd.BaseModel):
+    number_of_locations: int
+
+
 class RecordCreate(_pyd.BaseModel):
-    date: str
+    date: _dt.date
     location: str
     number: float
     friend_names: list[str]
@@ -32,5 +71,62 @@ class RecordCreate(_pyd.BaseModel):
     pint_cost: float | None
 
 
+class RecordFilter(_pyd.BaseModel):
+    date_from: _dt.date | None = None
+    date_to: _dt.date | None = None
+    location: str | None = None
+    friend_name: str | None = None
+    pint_brand: str | None = None
+
+
+class RecordPage(_pyd.BaseModel):
+    after_id: int | None = None
+    limit: int | None = _pyd.Field(default=None, ge=1)
+
+
 class RecordResponse(RecordCreate):
     total_cost: float | None
+
+
+class RecordResponseDict(_t.TypedDict):
+    # Same fields as "RecordResponse", for serialising plain column values without constructing a model per record
+    date: _dt.date
+    location: str
+    number: float
+    friend_names: list[str]
+    comment: str | None
+    pint_brand: str | None
+    pint_cost: float | None
+    total_cost: float | None
+
+
+class RecordBulkResponse(_pyd.BaseModel):
+    number_of_records: int
+
+
+class RecordIngestionStatus(_pyd.BaseModel):
+    # Records accepted in write-behind mode are "pending" until their batch is "committed", or has "failed"
+    idempotency_key: str
+    status: _t.Literal["pending", "committed", "failed"]
+
+
+class StatsSummaryResponse(_pyd.BaseModel):
+    friends_info: dict[str, FriendStats]
+    location_info: dict[str, LocationStats]
+    brand_info: dict[str, BrandStats]
+    borough_info: dict[str, BoroughStats]
+
+
+TimeSeriesBucket = _t.Literal["day", "week", "month"]
+
+
+class TimeSeriesPoint(_pyd.BaseModel):
+    date: _dt.date
+    number_of_visits: int
+    number_of_pints: float
+    cumulative_number_of_pints: float
+
+
+class TimeSeriesResponse(_pyd.BaseModel):
+    bucket: TimeSeriesBucket
+    points: list[TimeSeriesPoint]
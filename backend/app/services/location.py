@@ -0,0 +1,42 @@
+import cache as _c
+import repositories.base as _rb
+import schemas as _sch
+
+
+class LocationService:
+    """
+    Service for managing location-related records.
+    """
+
+    def __init__(self, repository: _rb.Repository, stats_cache: _c.StatsCache):
+        """
+        Initialise service.
+
+        :param repository: Repository.
+        :param stats_cache: Stats cache.
+        """
+        self.__repository = repository
+        self.__stats_cache = stats_cache
+
+    async def update_geos(
+        self, location_geo_updates: list[_sch.LocationGeoUpdate]
+    ) -> int:
+        """
+        Create or replace the coordinates and borough of many locations in a single transaction.
+
+        :param location_geo_updates: Location geo input data.
+        :return: Number of locations updated.
+        """
+        repository = self.__repository
+
+        # Duplicate locations would update the same row twice in one statement, so the last update wins
+        location_2_geo_dict = {x.location: x.model_dump() for x in location_geo_updates}
+        try:
+            await repository.upsert_location_geos(list(location_2_geo_dict.values()))
+            await repository.commit()
+            self.__stats_cache.bump()
+            return len(location_2_geo_dict)
+
+        except Exception:
+            await repository.rollback()
+            raise
@@ -1,6 +1,9 @@
+import cache as _c
+import collections as _coll
 import models as _m
 import schemas as _sch
-import repositories.sql as _rs
+import repositories.base as _rb
+import typing as _t
 
 
 class RecordService:
@@ -8,14 +11,15 @@ class RecordService:
     Service for managing pint-related records.
     """
 
-    # IMPORTANT NOTE: The repository should be an abstract class, as *any* repository type can be used here
-    def __init__(self, repository: _rs.SQLRepository):
+    def __init__(self, repository: _rb.Repository, stats_cache: _c.StatsCache):
         """
         Initialise service.
 
         :param repository: Repository.
+        :param stats_cache: Stats cache.
         """
         self.__repository = repository
+        self.__stats_cache = stats_cache
 
     async def create(self, record_create: _sch.RecordCreate) -> _m.PintRecord:
         """
@@ -26,56 +30,170 @@ class RecordService:
         """
         repository = self.__repository
 
-        friend_names = record_create.friend_names
-        number = record_create.number
-        pint_cost = record_create.pint_cost
-        total_cost = number * pint_cost if pint_cost is not None else None
+        # Duplicate names would violate the friend pint record primary key
+        friend_names = list(dict.fromkeys(record_create.friend_names))
 
         # Create a pint record
-        pint_record_dict = {
-            "comment": record_create.comment,
-            "date": record_create.date,
-            "location": record_create.location,
-            "number": record_create.number,
-            "pint_brand": record_create.pint_brand,
-            "pint_cost": record_create.pint_cost,
-            "total_cost": total_cost,
-        }
+        pint_record_dict = _get_pint_record_dict(record_create)
         pint_record = _m.PintRecord(**pint_record_dict)
         try:
             pint_record_obj = await repository.create_pint_record(pint_record)
-            for friend_name in friend_names:
-                # Create a record linking pint to friend
-                await repository.create_friend_pint_record(
-                    pint_record_obj.id_, friend_name
-                )
 
-                # Create or update how many pints a friend has had
-                await repository.create_or_update_friend_record(
-                    friend_name, pint_record_obj.number
-                )
+            # Create or update how many pints each friend has had, and the stats summaries
+            await self.__update_summaries([pint_record_dict], [friend_names])
+
+            # Create records linking pint to friends
+            await repository.create_friend_pint_records(
+                [
+                    {"pint_record_id": pint_record_obj.id_, "friend_name": x}
+                    for x in friend_names
+                ]
+            )
 
             await repository.commit()
+            self.__stats_cache.bump()
             return pint_record
 
         except Exception:
             await repository.rollback()
             raise
 
-    async def get_all(self) -> list[_m.PintRecord]:
+    async def create_bulk(self, record_creates: list[_sch.RecordCreate]) -> int:
+        """
+        Create many full records in a single transaction.
+        Records are written with batched inserts, and friend pint counts and summaries are aggregated into one upsert per table.
+
+        :param record_creates: Record input data.
+        :return: Number of records created.
+        """
+        repository = self.__repository
+
+        pint_record_dicts = [_get_pint_record_dict(x) for x in record_creates]
+
+        # Duplicate names would violate the friend pint record primary key
+        friend_names_list = [
+            list(dict.fromkeys(x.friend_names)) for x in record_creates
+        ]
+        try:
+            pint_record_ids = await repository.create_pint_records(pint_record_dicts)
+            await self.__update_summaries(pint_record_dicts, friend_names_list)
+            await repository.create_friend_pint_records(
+                [
+                    {"pint_record_id": pint_record_id, "friend_name": friend_name}
+                    for pint_record_id, friend_names in zip(
+                        pint_record_ids, friend_names_list
+                    )
+                    for friend_name in friend_names
+                ]
+            )
+
+            await repository.commit()
+            self.__stats_cache.bump()
+            return len(pint_record_ids)
+
+        except Exception:
+            await repository.rollback()
+            raise
+
+    async def __update_summaries(
+        self,
+        pint_record_dicts: list[dict[str, _t.Any]],
+        friend_names_list: list[list[str]],
+    ) -> None:
         """
-        Get all records.
+        Add the pint records to the friend pint counts and stats summaries.
+        NOTE: This must be called in the same transaction as the pint records are created in.
 
-        :return: All records.
+        :param pint_record_dicts: Pint record column values.
+        :param friend_names_list: Friend names of each pint record.
         """
         repository = self.__repository
 
-        pint_records = await repository.get_all_records()
+        friend_name_2_pint_count: dict[str, float] = _coll.defaultdict(float)
+        location_2_visits_and_pints: dict[str, tuple[int, float]] = {}
+        friend_location_2_pint_count: dict[tuple[str, str], float] = _coll.defaultdict(
+            float
+        )
+        pint_brand_2_pint_count: dict[str, float] = _coll.defaultdict(float)
+        for pint_record_dict, friend_names in zip(pint_record_dicts, friend_names_list):
+            number = pint_record_dict["number"]
+            location = pint_record_dict["location"]
+            pint_brand = pint_record_dict["pint_brand"]
+
+            number_of_visits, number_of_pints = location_2_visits_and_pints.get(
+                location, (0, 0.0)
+            )
+            location_2_visits_and_pints[location] = (
+                number_of_visits + 1,
+                number_of_pints + number,
+            )
+            if pint_brand is not None:
+                pint_brand_2_pint_count[pint_brand] += number
+            for friend_name in friend_names:
+                friend_name_2_pint_count[friend_name] += number
+                friend_location_2_pint_count[(friend_name, location)] += number
+
+        await repository.upsert_friend_pint_counts(friend_name_2_pint_count)
+        await repository.upsert_location_summaries(location_2_visits_and_pints)
+        await repository.upsert_friend_location_summaries(friend_location_2_pint_count)
+        await repository.upsert_brand_summaries(pint_brand_2_pint_count)
+
+    async def get_all(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> list[dict[str, _t.Any]]:
+        """
+        Get all records, as plain column values, so they can be serialised without constructing a model per record.
+
+        :param record_filter: Filter applied to the records, defaults to None
+        :param record_page: Page of records to get, defaults to None which gets all of them
+        :return: All records, see `schemas.RecordResponseDict`.
+        """
+        repository = self.__repository
+
+        return await repository.get_record_dicts(record_filter, record_page)
+
+    async def stream_all(
+        self,
+        record_filter: _sch.RecordFilter | None = None,
+        record_page: _sch.RecordPage | None = None,
+    ) -> _t.AsyncIterator[dict[str, _t.Any]]:
+        """
+        Stream all records, as plain column values, without holding them all in memory.
 
-        # TODO Can the following be done via a pydantic API, rather than constructing the object ourselves?
-        return pint_records
+        :param record_filter: Filter applied to the records, defaults to None
+        :param record_page: Page of records to get, defaults to None which gets all of them
+        :return: Records, see `schemas.RecordResponseDict`.
+        """
+        repository = self.__repository
+
+        async for record_dict in repository.stream_records(record_filter, record_page):
+            yield record_dict
 
 
 # ================================================================================
 # Private helpers
 # ================================================================================
+
+
+def _get_pint_record_dict(record_create: _sch.RecordCreate) -> dict[str, _t.Any]:
+    """
+    Get the pint record column values from the record input data.
+
+    :param record_create: Record input data.
+    :return: Pint record column values.
+    """
+    number = record_create.number
+    pint_cost = record_create.pint_cost
+    total_cost = number * pint_cost if pint_cost is not None else None
+
+    return {
+        "comment": record_create.comment,
+        "date": record_create.date,
+        "location": record_create.location,
+        "number": number,
+        "pint_brand": record_create.pint_brand,
+        "pint_cost": pint_cost,
+        "total_cost": total_cost,
+    }
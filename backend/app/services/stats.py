@@ -1,7 +1,13 @@
+import asyncio as _asy
+import cache as _c
 import collections as _coll
 import models as _m
+import numpy as _np
 import schemas as _sch
-import repositories.sql as _rs
+import repositories.base as _rb
+import typing as _t
+
+_T = _t.TypeVar("_T")
 
 
 class StatsService:
@@ -9,60 +15,298 @@ class StatsService:
     Service for managing pint-related records.
     """
 
-    # IMPORTANT NOTE: The repository should be an abstract class, as *any* repository type can be used here
-    def __init__(self, repository: _rs.SQLRepository):
+    def __init__(
+        self,
+        repository: _rb.Repository,
+        stats_cache: _c.StatsCache,
+        repository_factory: (
+            _t.Callable[[], _t.AsyncContextManager[_rb.Repository]] | None
+        ) = None,
+    ):
         """
         Initialise service.
 
         :param repository: Repository.
+        :param stats_cache: Stats cache.
+        :param repository_factory: Factory opening repositories with their own sessions, used to compute stats concurrently, defaults to None
+                                   which computes them one after the other with the repository
         """
         self.__repository = repository
+        self.__stats_cache = stats_cache
+        self.__repository_factory = repository_factory
+
+    async def get_summary(
+        self,
+        leaderboard_page: _sch.LeaderboardPage | None = None,
+        max_pubs_per_friend: int | None = None,
+    ) -> _sch.StatsSummaryResponse:
+        """
+        Get friends, location, brand and borough stats together. Each is computed concurrently with its own repository, and cached as if requested
+        on its own.
+
+        :param leaderboard_page: Page of friends and locations to get, defaults to None which gets all of them
+        :param max_pubs_per_friend: Maximum number of pubs per friend, where 0 leaves out every pub, defaults to None which gets every pub
+        :return: Stats summary.
+        """
+        get_stats_functions = (
+            lambda x: x.get_friends_stats(leaderboard_page, max_pubs_per_friend),
+            lambda x: x.get_location_stats(leaderboard_page),
+            lambda x: x.get_brand_stats(),
+            lambda x: x.get_borough_stats(),
+        )
+        if self.__repository_factory is None:
+            # A session cannot run queries concurrently, so without a factory the stats are computed one after the other
+            stats = [await x(self) for x in get_stats_functions]
+        else:
+            stats = await _asy.gather(
+                *(self.__run_with_own_repository(x) for x in get_stats_functions)
+            )
+        friends_stats, location_stats, brand_stats, borough_stats = stats
+
+        return _sch.StatsSummaryResponse(
+            friends_info=friends_stats.friends_info,
+            location_info=location_stats.location_info,
+            brand_info=brand_stats.brand_info,
+            borough_info=borough_stats.borough_info,
+        )
+
+    async def __run_with_own_repository(
+        self, get_stats: _t.Callable[["StatsService"], _t.Awaitable[_T]]
+    ) -> _T:
+        """
+        Get stats with a service using its own repository, opened by the repository factory.
 
-    async def get_friends_stats(self) -> _sch.FriendsStatsResponse:
+        :param get_stats: Coroutine function getting the stats from a service.
+        :return: Stats.
         """
-        Get friends stats.
+        async with self.__repository_factory() as repository:  # type: ignore
+            return await get_stats(StatsService(repository, self.__stats_cache))
 
+    async def get_friends_stats(
+        self,
+        leaderboard_page: _sch.LeaderboardPage | None = None,
+        max_pubs_per_friend: int | None = None,
+    ) -> _sch.FriendsStatsResponse:
+        """
+        Get friends stats. Full results are cached until the next commit, whereas pages are computed on every call.
+
+        :param leaderboard_page: Page of friends to get, defaults to None which gets all of them
+        :param max_pubs_per_friend: Maximum number of pubs per friend, where 0 leaves out every pub, defaults to None which gets every pub
         :return: Friend stats.
         """
-        repository = self.__repository
+        if leaderboard_page is None and max_pubs_per_friend is None:
+            return await self.__stats_cache.get_or_compute(
+                "friends", self.__compute_friends_stats
+            )
+        return await self.__compute_friends_stats(leaderboard_page, max_pubs_per_friend)
 
-        friend_pint_count = await repository.get_friend_pint_count()
-        friend_pub_frequency = await repository.get_friend_pub_frequency()
+    async def __compute_friends_stats(
+        self,
+        leaderboard_page: _sch.LeaderboardPage | None = None,
+        max_pubs_per_friend: int | None = None,
+    ) -> _sch.FriendsStatsResponse:
+        """
+        Compute friends stats.
 
-        friend_2_pub_2_frequency = {}
-        for entry in friend_pub_frequency:
-            friend = entry.friend_name
-            pub_2_frequency = {entry.location: entry.pints_at_location}
-            friend_2_pub_2_frequency.setdefault(friend, {}).update(pub_2_frequency)
+        :param leaderboard_page: Page of friends to get, defaults to None
+        :param max_pubs_per_friend: Maximum number of pubs per friend, defaults to None
+        :return: Friend stats.
+        """
+        repository = self.__repository
 
-        response_dict = {}
-        for rank, entry in enumerate(friend_pint_count, start=1):
-            friend = entry.name
-            pint_count = entry.pint_count
-            response_dict[friend] = _sch.FriendStats(
-                pint_count=pint_count,
-                pint_count_rank=rank,
-                pub_2_frequency=friend_2_pub_2_frequency.get(friend, {}),
+        friend_stats = await repository.get_friend_stats(
+            leaderboard_page, max_pubs_per_friend
+        )
+        response_dict = {
+            x.name: _sch.FriendStats(
+                pint_count=x.pint_count,
+                pint_count_rank=x.pint_count_rank,
+                pub_2_frequency=x.pub_2_frequency,
             )
+            for x in friend_stats
+        }
 
         return _sch.FriendsStatsResponse(friends_info=response_dict)
 
-    async def get_location_stats(self) -> _sch.LocationStatsResponse:
+    async def get_location_stats(
+        self, leaderboard_page: _sch.LeaderboardPage | None = None
+    ) -> _sch.LocationStatsResponse:
         """
-        Get location stats.
+        Get location stats. Full results are cached until the next commit, whereas pages are computed on every call.
 
+        :param leaderboard_page: Page of locations to get, defaults to None which gets all of them
+        :return: Location stats.
+        """
+        if leaderboard_page is None:
+            return await self.__stats_cache.get_or_compute(
+                "location", self.__compute_location_stats
+            )
+        return await self.__compute_location_stats(leaderboard_page)
+
+    async def __compute_location_stats(
+        self, leaderboard_page: _sch.LeaderboardPage | None = None
+    ) -> _sch.LocationStatsResponse:
+        """
+        Compute location stats.
+
+        :param leaderboard_page: Page of locations to get, defaults to None
         :return: Location stats.
         """
         repository = self.__repository
 
-        location_stats = await repository.get_location_stats()
+        location_stats = await repository.get_location_stats(leaderboard_page)
         response_dict = {}
-        for rank, location_info_row in enumerate(location_stats, start=1):
+        for location_info_row in location_stats:
             location_name = location_info_row.location
             response_dict[location_name] = _sch.LocationStats(
                 number_of_visits=location_info_row.number_of_visits,
                 number_of_pints=float(location_info_row.number_of_pints),
-                number_of_pints_rank=rank,
+                number_of_pints_rank=location_info_row.number_of_pints_rank,
             )
 
         return _sch.LocationStatsResponse(location_info=response_dict)
+
+    async def get_brand_stats(self) -> _sch.BrandStatsResponse:
+        """
+        Get brand stats. Results are cached until the next commit.
+
+        :return: Brand stats.
+        """
+        return await self.__stats_cache.get_or_compute(
+            "brand", self.__compute_brand_stats
+        )
+
+    async def __compute_brand_stats(self) -> _sch.BrandStatsResponse:
+        """
+        Compute brand stats.
+
+        :return: Brand stats.
+        """
+        repository = self.__repository
+
+        brand_stats = await repository.get_brand_stats()
+        response_dict = {}
+        for brand_info_row in brand_stats:
+            response_dict[brand_info_row.pint_brand] = _sch.BrandStats(
+                number_of_pints=brand_info_row.number_of_pints,
+                number_of_pints_rank=brand_info_row.number_of_pints_rank,
+            )
+
+        return _sch.BrandStatsResponse(brand_info=response_dict)
+
+    async def get_borough_stats(self) -> _sch.BoroughStatsResponse:
+        """
+        Get borough stats. Results are cached until the next commit.
+
+        :return: Borough stats.
+        """
+        return await self.__stats_cache.get_or_compute(
+            "borough", self.__compute_borough_stats
+        )
+
+    async def __compute_borough_stats(self) -> _sch.BoroughStatsResponse:
+        """
+        Compute borough stats.
+
+        :return: Borough stats.
+        """
+        repository = self.__repository
+
+        borough_stats = await repository.get_borough_stats()
+        response_dict = {}
+        for borough_info_row in borough_stats:
+            response_dict[borough_info_row.borough] = _sch.BoroughStats(
+                pub_count=borough_info_row.pub_count,
+                number_of_visits=borough_info_row.number_of_visits,
+                number_of_pints=float(borough_info_row.number_of_pints),
+                number_of_pints_rank=borough_info_row.number_of_pints_rank,
+            )
+
+        return _sch.BoroughStatsResponse(borough_info=response_dict)
+
+    async def get_time_series(
+        self,
+        bucket: _sch.TimeSeriesBucket,
+        record_filter: _sch.RecordFilter | None = None,
+        max_points: int | None = None,
+    ) -> _sch.TimeSeriesResponse:
+        """
+        Get visits, pints and cumulative pints per date bucket.
+        NOTE: Unlike the other stats, results are not cached, as every filter would add its own entry until the next commit.
+
+        :param bucket: Date bucket.
+        :param record_filter: Filter applied to the pint records, defaults to None
+        :param max_points: Maximum number of points, chosen by LTTB downsampling so peaks and troughs are kept, defaults to None which
+                           returns every bucket
+        :return: Time series.
+        """
+        time_series = await self.__repository.get_time_series(bucket, record_filter)
+        if max_points is not None and len(time_series) > max_points:
+            indices = _get_lttb_indices(
+                _np.array([x.date.toordinal() for x in time_series], dtype=_np.float64),
+                _np.array([x.number_of_pints for x in time_series], dtype=_np.float64),
+                max_points,
+            )
+            time_series = [time_series[x] for x in indices.tolist()]
+
+        return _sch.TimeSeriesResponse(
+            bucket=bucket,
+            points=[
+                _sch.TimeSeriesPoint(
+                    date=x.date,
+                    number_of_visits=x.number_of_visits,
+                    number_of_pints=float(x.number_of_pints),
+                    cumulative_number_of_pints=float(x.cumulative_number_of_pints),
+                )
+                for x in time_series
+            ],
+        )
+
+
+# ================================================================================
+# Private helpers
+# ================================================================================
+
+
+def _get_lttb_indices(
+    x_values: _np.ndarray, y_values: _np.ndarray, max_points: int
+) -> _np.ndarray:
+    """
+    Get the indices of the points to keep when downsampling, using Largest-Triangle-Three-Buckets.
+    The first and last points are always kept. The other points are split into equal buckets, and from each bucket the point forming the largest
+    triangle with the previously kept point and the average of the next bucket is kept.
+
+    :param x_values: X values, in ascending order.
+    :param y_values: Y values.
+    :param max_points: Maximum number of points, at least 3.
+    :return: Indices of the points to keep, in ascending order.
+    """
+    point_count = len(x_values)
+    if point_count <= max_points:
+        return _np.arange(point_count)
+
+    bucket_count = max_points - 2
+    bucket_edges = _np.linspace(1, point_count - 1, bucket_count + 1).astype(_np.int64)
+
+    indices = _np.zeros(max_points, dtype=_np.int64)
+    indices[-1] = point_count - 1
+    previous_index = 0
+    for i in range(bucket_count):
+        start, end = bucket_edges[i], bucket_edges[i + 1]
+        if i + 1 < bucket_count:
+            next_start, next_end = end, bucket_edges[i + 2]
+        else:
+            next_start, next_end = point_count - 1, point_count
+        next_x = x_values[next_start:next_end].mean()
+        next_y = y_values[next_start:next_end].mean()
+
+        # Twice the area of the triangle formed by the previously kept point, each point in the bucket and the average of the next bucket
+        previous_x, previous_y = x_values[previous_index], y_values[previous_index]
+        areas = _np.abs(
+            (previous_x - next_x) * (y_values[start:end] - previous_y)
+            - (previous_x - x_values[start:end]) * (next_y - previous_y)
+        )
+        previous_index = start + int(_np.argmax(areas))
+        indices[i + 1] = previous_index
+
+    return indices
@@ -0,0 +1,151 @@
+import dataclasses as _dc
+import os as _os
+
+
+@_dc.dataclass(frozen=True)
+class SQLiteProfile:
+    """
+    SQLite pragmas applied to every new database connection.
+    The defaults favour concurrent readers alongside a single writer: WAL lets readers proceed while a write is in progress,
+    and synchronous NORMAL is durable in WAL mode except against power loss.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    # Negative values are in KiB rather than pages
+    cache_size: int = -64 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000
+
+    def __post_init__(self) -> None:
+        """
+        Validate the pragma values, as pragmas do not accept bound parameters.
+        """
+        for name, value, allowed_values in (
+            ("journal_mode", self.journal_mode, _JOURNAL_MODES),
+            ("synchronous", self.synchronous, _SYNCHRONOUS_MODES),
+            ("temp_store", self.temp_store, _TEMP_STORE_MODES),
+        ):
+            if value.upper() not in allowed_values:
+                raise ValueError(
+                    f"Invalid SQLite {name} {value!r}, expected one of {sorted(allowed_values)}"
+                )
+
+    def get_pragma_statements(self) -> list[str]:
+        """
+        Get the statements applying the profile to a connection.
+
+        :return: Pragma statements.
+        """
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode.upper()}",
+            f"PRAGMA synchronous = {self.synchronous.upper()}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA temp_store = {self.temp_store.upper()}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+        ]
+
+
+@_dc.dataclass(frozen=True)
+class Settings:
+    """
+    Application settings.
+    """
+
+    # Either "sql", or "memory" to serve everything from process memory, loaded from the database on startup.
+    # NOTE: The "memory" repository never writes to the database, so records created while it is used are lost when the process exits
+    repository: str = "sql"
+    database_url: str = "sqlite+aiosqlite:///./test.db"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    # Acknowledge created records once validated, and write them in batches in the background, see "ingestion.py"
+    write_behind: bool = False
+    write_behind_batch_size: int = 500
+    write_behind_max_queue_size: int = 10_000
+    sqlite_profile: SQLiteProfile = _dc.field(default_factory=SQLiteProfile)
+
+    def __post_init__(self) -> None:
+        """
+        Validate the settings.
+        """
+        if self.repository not in _REPOSITORIES:
+            raise ValueError(
+                f"Invalid repository {self.repository!r}, expected one of {sorted(_REPOSITORIES)}"
+            )
+        if self.write_behind_batch_size < 1 or self.write_behind_max_queue_size < 1:
+            raise ValueError("Write-behind batch and queue sizes must be positive")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Get settings from "PINTS_"-prefixed environment variables, using the defaults for any that are not set.
+
+        :return: Settings.
+        """
+        default_settings = cls()
+        default_profile = default_settings.sqlite_profile
+
+        sqlite_profile = SQLiteProfile(
+            journal_mode=_os.getenv(
+                "PINTS_SQLITE_JOURNAL_MODE", default_profile.journal_mode
+            ),
+            synchronous=_os.getenv(
+                "PINTS_SQLITE_SYNCHRONOUS", default_profile.synchronous
+            ),
+            mmap_size=int(
+                _os.getenv("PINTS_SQLITE_MMAP_SIZE", default_profile.mmap_size)
+            ),
+            cache_size=int(
+                _os.getenv("PINTS_SQLITE_CACHE_SIZE", default_profile.cache_size)
+            ),
+            temp_store=_os.getenv(
+                "PINTS_SQLITE_TEMP_STORE", default_profile.temp_store
+            ),
+            busy_timeout=int(
+                _os.getenv("PINTS_SQLITE_BUSY_TIMEOUT", default_profile.busy_timeout)
+            ),
+        )
+        return cls(
+            repository=_os.getenv("PINTS_REPOSITORY", default_settings.repository),
+            database_url=_os.getenv(
+                "PINTS_DATABASE_URL", default_settings.database_url
+            ),
+            pool_size=int(
+                _os.getenv("PINTS_DATABASE_POOL_SIZE", default_settings.pool_size)
+            ),
+            max_overflow=int(
+                _os.getenv("PINTS_DATABASE_MAX_OVERFLOW", default_settings.max_overflow)
+            ),
+            pool_timeout=float(
+                _os.getenv("PINTS_DATABASE_POOL_TIMEOUT", default_settings.pool_timeout)
+            ),
+            write_behind=_os.getenv(
+                "PINTS_WRITE_BEHIND", str(default_settings.write_behind)
+            ).lower()
+            in _TRUE_VALUES,
+            write_behind_batch_size=int(
+                _os.getenv(
+                    "PINTS_WRITE_BEHIND_BATCH_SIZE",
+                    default_settings.write_behind_batch_size,
+                )
+            ),
+            write_behind_max_queue_size=int(
+                _os.getenv(
+                    "PINTS_WRITE_BEHIND_MAX_QUEUE_SIZE",
+                    default_settings.write_behind_max_queue_size,
+                )
+            ),
+            sqlite_profile=sqlite_profile,
+        )
+
+
+_REPOSITORIES = {"sql", "memory"}
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE_MODES = {"DEFAULT", "FILE", "MEMORY"}
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+SETTINGS = Settings.from_env()
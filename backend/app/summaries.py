@@ -0,0 +1,70 @@
+import argparse as _ap
+import asyncio as _aio
+import database as _db
+import migrations as _mig
+import models as _m
+import repositories.sql as _rs
+import sys as _sys
+
+
+async def rebuild() -> None:
+    """
+    Recompute friend pint counts and every summary table from the raw pint records, in a single transaction.
+    """
+    async with _db.AsyncSessionLocal() as session:
+        repository = _rs.SQLRepository(session=session)
+        try:
+            await repository.rebuild_summaries()
+            await repository.commit()
+        except Exception:
+            await repository.rollback()
+            raise
+
+    print("Summaries rebuilt")
+
+
+async def check() -> bool:
+    """
+    Check friend pint counts and every summary table are consistent with the raw pint records.
+
+    :return: Flag which determines whether all summaries are consistent.
+    """
+    async with _db.AsyncSessionLocal() as session:
+        repository = _rs.SQLRepository(session=session)
+        table_name_2_mismatch_count = await repository.get_summary_mismatch_counts()
+
+    for table_name, mismatch_count in table_name_2_mismatch_count.items():
+        print(f"{table_name}: {mismatch_count} mismatched row(s)")
+
+    return not any(table_name_2_mismatch_count.values())
+
+
+async def main(command: str) -> int:
+    """
+    Run a summaries command.
+
+    :param command: Either "rebuild" or "check".
+    :return: Exit code.
+    """
+    try:
+        # Databases created before the summary tables existed need them creating first
+        async with _db.Engine.begin() as conn:
+            await conn.run_sync(_mig.migrate, _db.Base.metadata)
+
+        # A rebuild is always followed by a check
+        if command == "rebuild":
+            await rebuild()
+
+        return 0 if await check() else 1
+
+    finally:
+        await _db.Engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Rebuild or check the stats summary tables against the raw pint records."
+    )
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+    _sys.exit(_aio.run(main(args.command)))
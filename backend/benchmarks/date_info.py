@@ -0,0 +1,171 @@
+import argparse as _ap
+import json as _json
+import numpy as _np
+import pandas as _pd
+import pathlib as _pth
+import sys as _sys
+import time as _tm
+import typing as _t
+
+#
+# Benchmark `pints_data._compute_date_info` against the per-row and per-group implementation it replaced, on synthetic input.
+#
+
+_SCRIPTS_DIR = _pth.Path(__file__).resolve().parents[1] / "scripts"
+
+
+def main(rows: int, companies: int, drinks: int) -> None:
+    """
+    Run both implementations on the same synthetic input, check they agree, and print their timings.
+
+    :param rows: Number of input rows.
+    :param companies: Number of distinct companies.
+    :param drinks: Number of distinct drinks.
+    """
+    _sys.path.insert(0, str(_SCRIPTS_DIR))
+    import pints_data as _pi
+
+    input_pints_df = _get_input_pints_df(rows, companies, drinks)
+    all_names = sorted({y for x in input_pints_df["company_list"] for y in x})
+
+    start = _tm.perf_counter()
+    vectorised_result = _pi._compute_date_info(input_pints_df, all_names)
+    vectorised_seconds = _tm.perf_counter() - start
+
+    start = _tm.perf_counter()
+    legacy_result = _compute_date_info_legacy(
+        input_pints_df, all_names, _pi._get_time_series_info
+    )
+    legacy_seconds = _tm.perf_counter() - start
+
+    # NOTE: The legacy implementation sorts buckets by label, e.g. "April" first, so the results are compared regardless of order
+    if _get_normalised(vectorised_result) != _get_normalised(legacy_result):
+        raise AssertionError("Vectorised and legacy results differ")
+
+    print(f"{'implementation':<16}{'seconds':>10}")
+    print(f"{'legacy':<16}{legacy_seconds:>10.2f}")
+    print(f"{'vectorised':<16}{vectorised_seconds:>10.2f}")
+    print(f"speed-up: {legacy_seconds / vectorised_seconds:.1f}x")
+
+
+def _get_input_pints_df(rows: int, companies: int, drinks: int) -> _pd.DataFrame:
+    """
+    Get a synthetic, cleaned-up input pints data frame.
+
+    :param rows: Number of rows.
+    :param companies: Number of distinct companies.
+    :param drinks: Number of distinct drinks.
+    :return: Input pints data frame.
+    """
+    rng = _np.random.default_rng(0)
+    friend_names = [f"Friend {x}" for x in range(20)]
+    company_lists = [
+        sorted(rng.choice(friend_names, size=rng.integers(1, 5), replace=False))
+        for _ in range(companies)
+    ]
+    drink_names = [f"Drink {x}" for x in range(drinks)] + [None]
+    return _pd.DataFrame(
+        {
+            "Date": _pd.Timestamp("2020-01-01")
+            + _pd.to_timedelta(rng.integers(0, 4 * 365, size=rows), unit="D"),
+            "Number": rng.choice([0.5, 1.0, 2.0, 3.0], size=rows),
+            "Pint": _pd.Categorical(
+                [drink_names[x] for x in rng.integers(0, len(drink_names), size=rows)]
+            ),
+            "company_list": [
+                list(company_lists[x]) for x in rng.integers(0, companies, size=rows)
+            ],
+        }
+    )
+
+
+def _get_normalised(value: _t.Any) -> _t.Any:
+    """
+    Get a value with every list sorted, e.g. buckets and companies, so results can be compared regardless of order.
+
+    :param value: Value.
+    :return: Normalised value.
+    """
+    if isinstance(value, dict):
+        return {str(k): _get_normalised(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return sorted(
+            (_get_normalised(x) for x in value),
+            key=lambda x: _json.dumps(x, sort_keys=True),
+        )
+    return value
+
+
+def _compute_date_info_legacy(
+    input_pints_df: _pd.DataFrame,
+    all_names: list[str],
+    get_time_series_info: _t.Callable[..., dict[str, _t.Any]],
+) -> dict[str, _t.Any]:
+    """
+    Compute pints-related date data with a `strftime` map per bucket and a Python mode per group, as `pints_data._compute_date_info` did
+    before it was vectorised.
+
+    :param input_pints_df: Input pints data frame.
+    :param all_names: All names.
+    :param get_time_series_info: `pints_data._get_time_series_info`.
+    :return: Pints-related date data.
+    """
+
+    def get_mode(series: _pd.Series) -> _t.Any:
+        mode_series = series.mode()
+        return mode_series.iloc[0] if len(mode_series) else None
+
+    date_info_dict = {}
+    date_series = input_pints_df["Date"]
+    pint_series = input_pints_df["Pint"].astype(object)
+    df = input_pints_df.assign(
+        **{"_datetime_date_": date_series.dt.date, "Pint": pint_series}
+    )
+
+    for date_col_name, output_str, time_format_str in (
+        ("day", "pints_per_day_of_the_week", "%A"),
+        ("week", "pints_per_week_of_the_year", "%U"),
+        ("month", "pints_per_month_of_the_year", "%B"),
+    ):
+        df[date_col_name] = df["_datetime_date_"].map(
+            lambda x: x.strftime(time_format_str)
+        )
+        date_info_dict[output_str] = (
+            df.groupby(date_col_name)
+            .agg({"Number": "sum", "Pint": get_mode})
+            .reset_index()
+            .rename(columns={"Number": "number_of_pints", "Pint": "most_popular_drink"})
+            .to_dict("records")
+        )
+
+    stats_per_entry_df = input_pints_df.assign(
+        **{
+            "company": input_pints_df["company_list"].apply(lambda x: tuple(sorted(x))),
+            "_datetime_date_": date_series.dt.date,
+            "Pint": pint_series,
+        }
+    )
+    stats_per_entry_df = stats_per_entry_df.groupby(
+        ["_datetime_date_", "company"], as_index=False
+    ).agg({"Number": "sum", "Pint": get_mode})
+    stats_per_entry_df["_datetime_date_"] = stats_per_entry_df["_datetime_date_"].apply(
+        str
+    )
+    stats_per_entry_df["company"] = stats_per_entry_df["company"].apply(
+        lambda x: list(set(x))
+    )
+    date_info_dict.update(get_time_series_info(stats_per_entry_df, all_names, False))
+
+    return date_info_dict
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Benchmark the vectorised date info computation against the legacy per-group implementation."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--drinks", type=int, default=30)
+    args = parser.parse_args()
+
+    main(args.rows, args.companies, args.drinks)
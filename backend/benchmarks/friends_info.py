@@ -0,0 +1,117 @@
+import argparse as _ap
+import collections as _coll
+import json as _json
+import numpy as _np
+import pandas as _pd
+import pathlib as _pth
+import sys as _sys
+import time as _tm
+import typing as _t
+
+#
+# Benchmark `pints_data._compute_friends_info` against the row-by-row loop it replaced, on synthetic input.
+#
+
+_SCRIPTS_DIR = _pth.Path(__file__).resolve().parents[1] / "scripts"
+
+
+def main(rows: int, friends: int, locations: int) -> None:
+    """
+    Run both implementations on the same synthetic input, check they agree, and print their timings.
+
+    :param rows: Number of input rows.
+    :param friends: Number of distinct friends.
+    :param locations: Number of distinct locations.
+    """
+    _sys.path.insert(0, str(_SCRIPTS_DIR))
+    import pints_data as _pi
+
+    input_pints_df = _get_input_pints_df(rows, friends, locations)
+
+    start = _tm.perf_counter()
+    vectorised_result = _pi._compute_friends_info(input_pints_df)
+    vectorised_seconds = _tm.perf_counter() - start
+
+    start = _tm.perf_counter()
+    loop_result = _compute_friends_info_loop(input_pints_df)
+    loop_seconds = _tm.perf_counter() - start
+
+    if _json.dumps(vectorised_result) != _json.dumps(loop_result):
+        raise AssertionError("Vectorised and loop results differ")
+
+    print(f"{'implementation':<16}{'seconds':>10}")
+    print(f"{'loop':<16}{loop_seconds:>10.2f}")
+    print(f"{'vectorised':<16}{vectorised_seconds:>10.2f}")
+    print(f"speed-up: {loop_seconds / vectorised_seconds:.1f}x")
+
+
+def _get_input_pints_df(rows: int, friends: int, locations: int) -> _pd.DataFrame:
+    """
+    Get a synthetic, cleaned-up input pints data frame.
+
+    :param rows: Number of rows.
+    :param friends: Number of distinct friends.
+    :param locations: Number of distinct locations.
+    :return: Input pints data frame.
+    """
+    rng = _np.random.default_rng(0)
+    friend_names = _np.array([f"Friend {x}" for x in range(friends)], dtype=object)
+    company_sizes = rng.integers(0, 5, size=rows)
+    company_names = friend_names[rng.integers(0, friends, size=company_sizes.sum())]
+    company_list = _np.split(company_names, _np.cumsum(company_sizes)[:-1])
+    return _pd.DataFrame(
+        {
+            "Location": [f"Pub {x}" for x in rng.integers(0, locations, size=rows)],
+            "Number": rng.choice([0.5, 1.0, 2.0, 3.0], size=rows),
+            "company_list": [x.tolist() for x in company_list],
+        }
+    )
+
+
+def _compute_friends_info_loop(
+    input_pints_df: _pd.DataFrame,
+) -> tuple[dict[_t.Any, _t.Any], list[str]]:
+    """
+    Compute friend pint-related information row by row, as `pints_data._compute_friends_info` did before it was vectorised.
+
+    :param input_pints_df: Input pints data frame.
+    :return: Sorted leaderboard in descending order, and every friend name in each entry in order of appearance.
+    """
+    name_2_pint_info = _coll.defaultdict(dict)
+    all_names = []
+    for _, row in input_pints_df.iterrows():
+        for name in row["company_list"]:
+            all_names.append(name)
+            pint_info = name_2_pint_info[name]
+            number = row["Number"]
+            location = row["Location"]
+            if not bool(pint_info):
+                pint_info["pint_count"] = number
+                pint_info["pub_2_frequency"] = _coll.defaultdict(
+                    int, **{location: number}
+                )
+                pint_info["icon"] = "&#x1F37A"
+            else:
+                pint_info["pint_count"] += number
+                pint_info["pub_2_frequency"][location] += number
+
+    df = _pd.DataFrame(
+        index=list(name_2_pint_info.keys()), data=name_2_pint_info.values()
+    )
+    df["pint_count_rank"] = df["pint_count"].rank(method="min", ascending=False)
+    df = df.sort_values("pint_count_rank", ascending=True)
+    name_2_rank = df.to_dict("index")
+
+    return name_2_rank, all_names
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Benchmark the vectorised friends info computation against the row-by-row loop."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--friends", type=int, default=50)
+    parser.add_argument("--locations", type=int, default=500)
+    args = parser.parse_args()
+
+    main(args.rows, args.friends, args.locations)
@@ -0,0 +1,186 @@
+import argparse as _ap
+import asyncio as _aio
+import json as _json
+import os as _os
+import pathlib as _pth
+import random as _rnd
+import sys as _sys
+import tempfile as _tf
+import time as _tm
+import typing as _t
+
+#
+# Benchmark reading and serialising "/api/records/" responses, comparing plain column values serialised in one pass against the ORM objects
+# and per-record models it replaced, on a temporary SQLite database.
+#
+
+_APP_DIR = _pth.Path(__file__).resolve().parents[1] / "app"
+_SEED_CHUNK_SIZE = 1000
+
+
+def main(records: int, repeats: int) -> None:
+    """
+    Seed a temporary database, run both implementations on it, check they agree, and print their timings.
+
+    :param records: Number of records.
+    :param repeats: Number of times each implementation is run, of which the fastest is reported.
+    """
+    with _tf.TemporaryDirectory() as directory:
+        # NOTE: The engine is created on import, so the database is configured before the application is imported
+        _os.environ["PINTS_DATABASE_URL"] = (
+            f"sqlite+aiosqlite:///{_pth.Path(directory) / 'benchmark.db'}"
+        )
+        _os.environ["PINTS_REPOSITORY"] = "sql"
+        _sys.path.insert(0, str(_APP_DIR))
+        _aio.run(_run(records, repeats))
+
+
+async def _run(records: int, repeats: int) -> None:
+    """
+    Run the benchmark against the database configured in the environment.
+
+    :param records: Number of records.
+    :param repeats: Number of times each implementation is run.
+    """
+    import database as _db
+    import main as _main
+    import repositories.sql as _rs
+    import services.record as _sr
+    import routes.record as _rr
+    import schemas as _sch
+
+    async with _db.lifespan(_main.app):
+        # Records are seeded in chunks, as "load_pint_data.py" sends them, since very large batched inserts are slow to return their IDs
+        rnd = _rnd.Random(0)
+        for start in range(0, records, _SEED_CHUNK_SIZE):
+            async with _db.AsyncSessionLocal() as session:
+                record_service = _sr.RecordService(
+                    _rs.SQLRepository(session), _NoCache()
+                )
+                await record_service.create_bulk(
+                    [
+                        _sch.RecordCreate(**_get_record_payload(rnd))
+                        for _ in range(min(_SEED_CHUNK_SIZE, records - start))
+                    ]
+                )
+
+        implementation_2_seconds = {}
+        implementation_2_content = {}
+        for implementation, get_content in (
+            ("legacy", _get_legacy_content),
+            ("fast", _get_fast_content),
+        ):
+            seconds = []
+            for _ in range(repeats):
+                async with _db.AsyncSessionLocal() as session:
+                    start = _tm.perf_counter()
+                    content = await get_content(session, _rs, _rr, _sch)
+                    seconds.append(_tm.perf_counter() - start)
+            implementation_2_seconds[implementation] = min(seconds)
+            implementation_2_content[implementation] = content
+
+    legacy_records = _json.loads(implementation_2_content["legacy"])
+    fast_records = _json.loads(implementation_2_content["fast"])
+    if legacy_records != fast_records or len(fast_records) != records:
+        raise AssertionError("Legacy and fast responses differ")
+
+    legacy_seconds = implementation_2_seconds["legacy"]
+    fast_seconds = implementation_2_seconds["fast"]
+    print(f"{'implementation':<16}{'seconds':>10}{'MB':>8}")
+    for implementation, seconds in implementation_2_seconds.items():
+        size = len(implementation_2_content[implementation]) / 1e6
+        print(f"{implementation:<16}{seconds:>10.2f}{size:>8.1f}")
+    print(f"speed-up: {legacy_seconds / fast_seconds:.1f}x")
+
+
+async def _get_legacy_content(
+    session: _t.Any, _rs: _t.Any, _rr: _t.Any, _sch: _t.Any
+) -> bytes:
+    """
+    Get the response content as "/api/records/" did before the fast path: load ORM objects with their friend pint records, construct a
+    `RecordResponse` per record from its `__dict__`, then validate and serialise the list as FastAPI does for a response model.
+
+    :param session: Session.
+    :param _rs: `repositories.sql` module.
+    :param _rr: `routes.record` module.
+    :param _sch: `schemas` module.
+    :return: Response content.
+    """
+    import models as _m
+    import pydantic as _pyd
+    import sqlalchemy as _s
+    import sqlalchemy.orm as _sao
+
+    statement = _rs._get_records_query(_s.select(_m.PintRecord), None, None).options(
+        _sao.selectinload(_m.PintRecord.friend_pint_record)
+    )
+    result = await session.execute(statement)
+    record_responses = [
+        _sch.RecordResponse(
+            **p.__dict__,
+            friend_names=[x.friend_name for x in p.friend_pint_record],
+        )
+        for p in result.scalars().all()
+    ]
+
+    adapter = _pyd.TypeAdapter(list[_sch.RecordResponse])
+    content = adapter.dump_python(
+        adapter.validate_python(record_responses), mode="json"
+    )
+    return _json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+async def _get_fast_content(
+    session: _t.Any, _rs: _t.Any, _rr: _t.Any, _sch: _t.Any
+) -> bytes:
+    """
+    Get the response content as "/api/records/" does: plain column values, serialised in one pass.
+
+    :param session: Session.
+    :param _rs: `repositories.sql` module.
+    :param _rr: `routes.record` module.
+    :param _sch: `schemas` module.
+    :return: Response content.
+    """
+    record_dicts = await _rs.SQLRepository(session).get_record_dicts()
+    return _rr._RECORD_RESPONSE_DICTS_ADAPTER.dump_json(record_dicts)
+
+
+class _NoCache:
+    """
+    Stats cache which does nothing, as no stats are read.
+    """
+
+    def bump(self) -> None:
+        pass
+
+
+def _get_record_payload(rnd: _rnd.Random) -> dict:
+    """
+    Get a random record payload.
+
+    :param rnd: Random number generator.
+    :return: Record payload.
+    """
+    return {
+        "date": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        "location": f"Pub {rnd.randint(0, 200)}",
+        "number": rnd.choice([0.5, 1.0, 2.0, 3.0]),
+        "friend_names": rnd.sample([f"Friend {x}" for x in range(30)], k=3),
+        "comment": rnd.choice([None, "Good pint"]),
+        "pint_brand": f"Brand {rnd.randint(0, 40)}",
+        "pint_cost": rnd.choice([None, 6.0]),
+    }
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Benchmark serialising /api/records/ responses from plain column values against ORM objects and per-record models."
+    )
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.records, args.repeats)
@@ -0,0 +1,191 @@
+import argparse as _ap
+import asyncio as _aio
+import json as _json
+import os as _os
+import pathlib as _pth
+import random as _rnd
+import subprocess as _sp
+import sys as _sys
+import tempfile as _tf
+import time as _tm
+
+#
+# Benchmark read throughput on the "/stats/*" endpoints while records are being written.
+# Each SQLite profile runs in its own process, against its own temporary database, as the engine is created on import.
+#
+
+_APP_DIR = _pth.Path(__file__).resolve().parents[1] / "app"
+
+# Environment overrides of each profile, where "tuned" is the application default
+_PROFILE_2_ENV = {
+    "sqlite-defaults": {
+        "PINTS_SQLITE_JOURNAL_MODE": "DELETE",
+        "PINTS_SQLITE_SYNCHRONOUS": "FULL",
+        "PINTS_SQLITE_MMAP_SIZE": "0",
+        "PINTS_SQLITE_CACHE_SIZE": "-2000",
+        "PINTS_SQLITE_TEMP_STORE": "DEFAULT",
+    },
+    "tuned": {},
+}
+_READ_URLS = (
+    "/stats/friends/",
+    "/stats/location/",
+    "/stats/brands/",
+    "/api/records/?limit=100",
+)
+
+
+def main(duration: float, readers: int, writers: int, seed_records: int) -> None:
+    """
+    Run the benchmark for every profile and print a summary.
+
+    :param duration: Number of seconds reads and writes run for.
+    :param readers: Number of concurrent readers.
+    :param writers: Number of concurrent writers.
+    :param seed_records: Number of records in the database before the benchmark starts.
+    """
+    print(
+        f"{'profile':<16}{'reads/s':>10}{'p95 read ms':>14}{'writes/s':>10}{'p95 write ms':>14}"
+    )
+    for profile, env in _PROFILE_2_ENV.items():
+        with _tf.TemporaryDirectory() as directory:
+            database_path = _pth.Path(directory) / "benchmark.db"
+            output = _sp.run(
+                [
+                    _sys.executable,
+                    __file__,
+                    "--worker",
+                    f"--duration={duration}",
+                    f"--readers={readers}",
+                    f"--writers={writers}",
+                    f"--seed-records={seed_records}",
+                ],
+                env={
+                    **_os.environ,
+                    **env,
+                    "PINTS_DATABASE_URL": f"sqlite+aiosqlite:///{database_path}",
+                },
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        result = _json.loads(output.splitlines()[-1])
+        print(
+            f"{profile:<16}{result['reads_per_second']:>10.1f}{result['p95_read_ms']:>14.1f}"
+            f"{result['writes_per_second']:>10.1f}{result['p95_write_ms']:>14.1f}"
+        )
+
+
+async def _run_worker(
+    duration: float, readers: int, writers: int, seed_records: int
+) -> dict[str, float]:
+    """
+    Run the benchmark against the application, using the database configured in the environment.
+
+    :param duration: Number of seconds reads and writes run for.
+    :param readers: Number of concurrent readers.
+    :param writers: Number of concurrent writers.
+    :param seed_records: Number of records in the database before the benchmark starts.
+    :return: Throughput and latency results.
+    """
+    _sys.path.insert(0, str(_APP_DIR))
+    import database as _db
+    import httpx as _hx
+    import main as _main
+
+    rnd = _rnd.Random(0)
+    async with _db.lifespan(_main.app):
+        transport = _hx.ASGITransport(app=_main.app)
+        async with _hx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            response = await client.post(
+                "/api/records/bulk",
+                json=[_get_record_payload(rnd) for _ in range(seed_records)],
+            )
+            response.raise_for_status()
+
+            read_latencies: list[float] = []
+            write_latencies: list[float] = []
+            end_time = _tm.perf_counter() + duration
+
+            async def read() -> None:
+                index = 0
+                while _tm.perf_counter() < end_time:
+                    start = _tm.perf_counter()
+                    response = await client.get(_READ_URLS[index % len(_READ_URLS)])
+                    response.raise_for_status()
+                    read_latencies.append(_tm.perf_counter() - start)
+                    index += 1
+
+            async def write() -> None:
+                while _tm.perf_counter() < end_time:
+                    start = _tm.perf_counter()
+                    response = await client.post(
+                        "/api/records/", json=_get_record_payload(rnd)
+                    )
+                    response.raise_for_status()
+                    write_latencies.append(_tm.perf_counter() - start)
+
+            await _aio.gather(
+                *[read() for _ in range(readers)], *[write() for _ in range(writers)]
+            )
+
+    return {
+        "reads_per_second": len(read_latencies) / duration,
+        "p95_read_ms": _get_percentile(read_latencies, 0.95) * 1000,
+        "writes_per_second": len(write_latencies) / duration,
+        "p95_write_ms": _get_percentile(write_latencies, 0.95) * 1000,
+    }
+
+
+def _get_record_payload(rnd: _rnd.Random) -> dict:
+    """
+    Get a random record payload.
+
+    :param rnd: Random number generator.
+    :return: Record payload.
+    """
+    return {
+        "date": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        "location": f"Pub {rnd.randint(0, 200)}",
+        "number": rnd.choice([0.5, 1.0, 2.0, 3.0]),
+        "friend_names": rnd.sample([f"Friend {x}" for x in range(30)], k=3),
+        "comment": None,
+        "pint_brand": f"Brand {rnd.randint(0, 40)}",
+        "pint_cost": 6.0,
+    }
+
+
+def _get_percentile(values: list[float], percentile: float) -> float:
+    """
+    Get a percentile of some values.
+
+    :param values: Values.
+    :param percentile: Percentile, between 0 and 1.
+    :return: Percentile value, or 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Benchmark /stats/* read throughput while records are written."
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seed-records", type=int, default=5000)
+    parser.add_argument("--worker", action="store_true", help=_ap.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = _aio.run(
+            _run_worker(args.duration, args.readers, args.writers, args.seed_records)
+        )
+        print(_json.dumps(result))
+    else:
+        main(args.duration, args.readers, args.writers, args.seed_records)
@@ -0,0 +1,169 @@
+import argparse as _ap
+import asyncio as _aio
+import json as _json
+import os as _os
+import pathlib as _pth
+import random as _rnd
+import subprocess as _sp
+import sys as _sys
+import tempfile as _tf
+import time as _tm
+
+#
+# Benchmark the latency of "POST /api/records/" under a burst of concurrent submissions, e.g. everyone logging their pints at closing time,
+# writing each record in its own transaction against acknowledging it and writing it behind in batches.
+# Each mode runs in its own process, against its own temporary database, as the settings are read on import.
+#
+
+_APP_DIR = _pth.Path(__file__).resolve().parents[1] / "app"
+
+# Environment overrides of each mode, where "direct" is the application default
+_MODE_2_ENV = {
+    "direct": {},
+    "write-behind": {"PINTS_WRITE_BEHIND": "1"},
+}
+
+
+def main(clients: int, records_per_client: int) -> None:
+    """
+    Run the benchmark for every mode and print a summary.
+
+    :param clients: Number of concurrent clients.
+    :param records_per_client: Number of records each client submits, one after the other.
+    """
+    print(
+        f"{'mode':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'failed':>8}{'written s':>12}"
+    )
+    for mode, env in _MODE_2_ENV.items():
+        with _tf.TemporaryDirectory() as directory:
+            database_path = _pth.Path(directory) / "benchmark.db"
+            output = _sp.run(
+                [
+                    _sys.executable,
+                    __file__,
+                    "--worker",
+                    f"--clients={clients}",
+                    f"--records-per-client={records_per_client}",
+                ],
+                env={
+                    **_os.environ,
+                    **env,
+                    "PINTS_REPOSITORY": "sql",
+                    "PINTS_DATABASE_URL": f"sqlite+aiosqlite:///{database_path}",
+                },
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        result = _json.loads(output.splitlines()[-1])
+        print(
+            f"{mode:<16}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{result['failed']:>8}{result['written_seconds']:>12.2f}"
+        )
+
+
+async def _run_worker(clients: int, records_per_client: int) -> dict[str, float]:
+    """
+    Run the benchmark against the application, using the database and mode configured in the environment.
+
+    :param clients: Number of concurrent clients.
+    :param records_per_client: Number of records each client submits.
+    :return: Latency results, the number of failed submissions, and the number of seconds until every accepted record was written.
+    """
+    _sys.path.insert(0, str(_APP_DIR))
+    import database as _db
+    import httpx as _hx
+    import main as _main
+    import sqlalchemy as _s
+
+    rnd = _rnd.Random(0)
+    latencies: list[float] = []
+    failed = 0
+    start_time = _tm.perf_counter()
+
+    # NOTE: Records written behind are flushed when the lifespan ends, so every record is written once it has exited
+    async with _db.lifespan(_main.app):
+        # Errors, e.g. the database being locked by other writers, are returned as responses so they are counted as failed submissions
+        transport = _hx.ASGITransport(app=_main.app, raise_app_exceptions=False)
+        async with _hx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def submit() -> None:
+                nonlocal failed
+                for _ in range(records_per_client):
+                    start = _tm.perf_counter()
+                    response = await client.post(
+                        "/api/records/", json=_get_record_payload(rnd)
+                    )
+                    latencies.append(_tm.perf_counter() - start)
+                    failed += response.is_error
+
+            await _aio.gather(*[submit() for _ in range(clients)])
+
+    written_seconds = _tm.perf_counter() - start_time
+
+    async with _db.AsyncSessionLocal() as session:
+        number_of_records = await session.scalar(
+            _s.text("SELECT COUNT(*) FROM pint_record")
+        )
+    if number_of_records != clients * records_per_client - failed:
+        raise AssertionError(
+            f"Expected {clients * records_per_client - failed} records, got {number_of_records}"
+        )
+
+    return {
+        "p50_ms": _get_percentile(latencies, 0.5) * 1000,
+        "p95_ms": _get_percentile(latencies, 0.95) * 1000,
+        "p99_ms": _get_percentile(latencies, 0.99) * 1000,
+        "failed": failed,
+        "written_seconds": written_seconds,
+    }
+
+
+def _get_record_payload(rnd: _rnd.Random) -> dict:
+    """
+    Get a random record payload.
+
+    :param rnd: Random number generator.
+    :return: Record payload.
+    """
+    return {
+        "date": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        "location": f"Pub {rnd.randint(0, 200)}",
+        "number": rnd.choice([0.5, 1.0, 2.0, 3.0]),
+        "friend_names": rnd.sample([f"Friend {x}" for x in range(30)], k=3),
+        "comment": None,
+        "pint_brand": f"Brand {rnd.randint(0, 40)}",
+        "pint_cost": 6.0,
+    }
+
+
+def _get_percentile(values: list[float], percentile: float) -> float:
+    """
+    Get a percentile of some values.
+
+    :param values: Values.
+    :param percentile: Percentile, between 0 and 1.
+    :return: Percentile value, or 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Benchmark POST /api/records/ latency under a burst of submissions, with and without write-behind."
+    )
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--records-per-client", type=int, default=20)
+    parser.add_argument("--worker", action="store_true", help=_ap.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = _aio.run(_run_worker(args.clients, args.records_per_client))
+        print(_json.dumps(result))
+    else:
+        main(args.clients, args.records_per_client)
@@ -1,14 +1,166 @@
-import copy as _cpy
+import geocoder as _gc
+import json as _json
 import numpy as _np
 import pandas as _pd
+import pathlib as _pth
 import shapely as _sh
-import os as _os
-import requests as _req
+import shapely.geometry as _shg
 import typing as _t
 
-#
-# TODO: Currently GEO information isn't persisted in the JSON, we would need to add that
-#
+
+class BoroughIndex:
+    """
+    Spatial index of boroughs, which assigns pubs to the borough containing them.
+    Each borough's GEO dictionary is parsed once into a prepared geometry, including any holes and parts of multi-polygons, and the geometries are
+    indexed by an STRtree so each pub is only tested against the boroughs whose bounding box contains it.
+    """
+
+    def __init__(self, name_2_geo_dict: _t.Dict[str, _t.Dict[str, _t.Any]]) -> None:
+        """
+        Initialise borough index.
+
+        :param name_2_geo_dict: Mapping of borough name to its GEO dictionary, i.e. a GeoJSON feature.
+        """
+        self.__name_2_geo_dict = dict(name_2_geo_dict)
+        self.__names = list(self.__name_2_geo_dict)
+        self.__geometries = _np.array(
+            [_shg.shape(x["geometry"]) for x in self.__name_2_geo_dict.values()],
+            dtype=object,
+        )
+        _sh.prepare(self.__geometries)
+        self.__tree = _sh.STRtree(self.__geometries)
+
+    @classmethod
+    def from_dir(
+        cls, geo_jsons_dir: _t.Union[str, _pth.Path, None] = None
+    ) -> "BoroughIndex":
+        """
+        Load a borough index from every "*.geo.json" file in a directory, named after the files, e.g. "hackney".
+
+        :param geo_jsons_dir: GEO JSONs directory, defaults to None which uses the "geo-jsons" directory at the root of the repository
+        :return: Borough index.
+        """
+        if geo_jsons_dir is None:
+            geo_jsons_dir = _GEO_JSONS_DIR
+
+        name_2_geo_dict = {}
+        for file_path in sorted(_pth.Path(geo_jsons_dir).glob("*.geo.json")):
+            with open(file_path, mode="r", encoding="utf-8") as file:
+                name_2_geo_dict[file_path.name.removesuffix(".geo.json")] = _json.load(
+                    file
+                )
+
+        return cls(name_2_geo_dict)
+
+    @property
+    def names(self) -> list[str]:
+        """
+        Get the borough names.
+
+        :return: Borough names.
+        """
+        return list(self.__names)
+
+    def get_borough_names(
+        self, geo_coordinates: _t.Sequence[_t.Optional[_t.Tuple[float, float]]]
+    ) -> list[_t.Optional[str]]:
+        """
+        Get the borough containing each point, querying every point in bulk.
+
+        :param geo_coordinates: Longitude and latitude of each point, or None if unknown.
+        :return: Name of the borough containing each point, or None if no borough contains it.
+        """
+        borough_indices = self.__get_borough_indices(geo_coordinates)
+        return [self.__names[x] if x >= 0 else None for x in borough_indices]
+
+    def get_borough_pints_info(
+        self,
+        geo_coordinates: _t.Sequence[_t.Optional[_t.Tuple[float, float]]],
+        numbers_of_pints: _t.Sequence[float],
+    ) -> _t.Dict[str, _t.Dict[str, _t.Any]]:
+        """
+        Compute pints information per borough.
+
+        :param geo_coordinates: Longitude and latitude of each pub, or None if unknown.
+        :param numbers_of_pints: Number of pints drunk at each pub.
+        :return: Mapping of borough name to its number of pubs and pints, for every borough.
+        """
+        borough_indices = self.__get_borough_indices(geo_coordinates)
+        is_in_borough = borough_indices >= 0
+        pub_counts = _np.bincount(
+            borough_indices[is_in_borough], minlength=len(self.__names)
+        )
+        numbers_of_pints_per_borough = _np.bincount(
+            borough_indices[is_in_borough],
+            weights=_np.asarray(numbers_of_pints, dtype=float)[is_in_borough],
+            minlength=len(self.__names),
+        )
+
+        return {
+            name: {
+                "pub_count": int(pub_count),
+                "number_of_pints": float(number_of_pints),
+            }
+            for name, pub_count, number_of_pints in zip(
+                self.__names, pub_counts, numbers_of_pints_per_borough
+            )
+        }
+
+    def get_geo_dict(
+        self, name: str, pints_info: _t.Dict[str, _t.Any]
+    ) -> _t.Dict[str, _t.Any]:
+        """
+        Get a borough's GEO dictionary with pints information added to its "properties" section.
+        Only the dictionaries which change are copied, so the geometry is shared with the index rather than deep-copied.
+
+        :param name: Borough name.
+        :param pints_info: Pints information, see `get_borough_pints_info`.
+        :return: GEO dictionary.
+        """
+        geo_dict = self.__name_2_geo_dict[name]
+        return {
+            **geo_dict,
+            "properties": {**geo_dict["properties"], "pints_info": pints_info},
+        }
+
+    def __get_borough_indices(
+        self, geo_coordinates: _t.Sequence[_t.Optional[_t.Tuple[float, float]]]
+    ) -> _np.ndarray:
+        """
+        Get the index of the borough containing each point.
+        Candidate boroughs come from one bulk STRtree query of bounding boxes, and are then tested exactly using the prepared geometries.
+
+        :param geo_coordinates: Longitude and latitude of each point, or None if unknown.
+        :return: Index of the borough containing each point, or -1 if no borough contains it.
+        """
+        borough_indices = _np.full(len(geo_coordinates), -1, dtype=_np.intp)
+        point_indices = _np.array(
+            [i for i, x in enumerate(geo_coordinates) if x is not None], dtype=_np.intp
+        )
+        if not len(point_indices):
+            return borough_indices
+
+        points = _sh.points(
+            _np.array([geo_coordinates[i] for i in point_indices], dtype=float)
+        )
+        candidate_point_indices, candidate_borough_indices = self.__tree.query(points)
+        is_contained = _sh.contains(
+            self.__geometries[candidate_borough_indices],
+            points[candidate_point_indices],
+        )
+
+        # NOTE: Boroughs do not overlap, but should they, points are assigned to the first borough containing them
+        candidate_point_indices = candidate_point_indices[is_contained]
+        candidate_borough_indices = candidate_borough_indices[is_contained]
+        order = _np.lexsort((candidate_borough_indices, candidate_point_indices))
+        candidate_point_indices = candidate_point_indices[order]
+        candidate_borough_indices = candidate_borough_indices[order]
+        _, first_indices = _np.unique(candidate_point_indices, return_index=True)
+        borough_indices[point_indices[candidate_point_indices[first_indices]]] = (
+            candidate_borough_indices[first_indices]
+        )
+
+        return borough_indices
 
 
 def get_geo_pints_info(
@@ -16,23 +168,21 @@ def get_geo_pints_info(
 ):
     """
     Compute a GEO dictionary with pints information added.
-    NOTE: We take a deep copy of the data as we intend to add an extra "pints_info" to the "properties" section of the GEO dictionary.
+    To compute pints information for several boroughs, use `BoroughIndex`, which parses each borough only once.
 
     :param geo_coordinates: GEO coordinates.
-    :param geo_location_names: GEO location names.
+    :param geo_dict: GEO dictionary, i.e. a GeoJSON feature.
+    :return: GEO dictionary, with pints information in its "properties" section.
     """
-    geo_dict = _cpy.deepcopy(geo_dict)
-    pints_info_dict = {}
+    borough_index = BoroughIndex({"borough": geo_dict})
+    geo_coordinates = list(geo_coordinates)
+    pints_info_dict = {
+        "pub_count": borough_index.get_borough_pints_info(
+            geo_coordinates, [0.0] * len(geo_coordinates)
+        )["borough"]["pub_count"]
+    }
 
-    # "pub_count"
-    pub_points = _sh.points(_np.array(geo_coordinates))
-    coordinates_list = geo_dict["geometry"]["coordinates"][0]
-    polygon = _sh.Polygon(coordinates_list)
-    pints_info_dict["pub_count"] = int(polygon.contains(pub_points).sum())
-
-    geo_dict["properties"]["pints_info"] = pints_info_dict
-
-    return geo_dict
+    return borough_index.get_geo_dict("borough", pints_info_dict)
 
 
 def _get_location_name_2_geo_coorindates(
@@ -40,39 +190,16 @@ def _get_location_name_2_geo_coorindates(
 ) -> _t.Dict[str, _t.Tuple]:
     """
     Compute the coordinates of locations that are defined in the input data.
-    NOTE: We make multiple calls to a Google REST API in this function, but we are limited daily to the number of requests we can make.
-          As a result we should try to avoid making uneccessary calls, and therefore we check if we have seen the pub before
+    NOTE: The geocoder caches results on disk, so each location is only looked up using the Google REST API once.
 
     :param input_pints_df: Input pints data frame.
     :return: Mapping of location name to their respective longitude and lattidute geo coordinates.
     """
-    api_key = _os.getenv("GOOGLE_MAPS_API_KEY")
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
-
-    input_location_set = set(input_pints_df["Location"])
-
-    location_name_2_geo_coordinates = {}
-    for location_str in input_location_set:
-        # If we have already encountered this location, simply add the visit count by one
-        if location_str in location_name_2_geo_coordinates:
-            continue
-
-        params = {
-            "address": location_str,
-            "key": api_key,
-        }
-        response = _req.get(url, params=params)
-        data = response.json()
-        if data["status"] == "OK":
-            geo_location = data["results"][0]["geometry"]["location"]
-            coordinates = (geo_location["lng"], geo_location["lat"])
-            location_name_2_geo_coordinates[location_str] = coordinates
-        else:
-            location_name_2_geo_coordinates[location_str] = None
-
-    return location_name_2_geo_coordinates
+    with _gc.Geocoder() as geocoder:
+        return geocoder.geocode(input_pints_df["Location"].unique())
 
 
+_GEO_JSONS_DIR = _pth.Path(__file__).resolve().parents[2] / "geo-jsons"
 _LOCATION_FILE_NAMES = (
     "camden",
     "city-of-london",
@@ -0,0 +1,229 @@
+import concurrent.futures as _cf
+import json as _json
+import os as _os
+import pathlib as _pth
+import requests as _req
+import sqlite3 as _sql
+import threading as _th
+import time as _tm
+import typing as _t
+
+#
+# NOTE: The Google Geocoding API is billed per request and limited daily, so every result is cached on disk.
+#       Addresses which cannot be found are cached too, but only for a while, in case the API finds them later.
+#
+
+
+class Geocoder:
+    """
+    Geocoder which looks up the coordinates of addresses, backed by an on-disk SQLite cache.
+    Uncached addresses are looked up concurrently, using a bounded pool of threads sharing a token bucket rate limiter.
+    """
+
+    def __init__(
+        self,
+        cache_path: _t.Union[str, _pth.Path, None] = None,
+        *,
+        url: _t.Optional[str] = None,
+        api_key: _t.Optional[str] = None,
+        max_workers: int = 8,
+        requests_per_second: float = 10.0,
+        negative_ttl_seconds: float = 7 * 24 * 60 * 60,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        """
+        Initialise geocoder.
+
+        :param cache_path: Path of the SQLite cache, defaults to None which uses "GEOCODER_CACHE_PATH" or a file next to this module
+        :param url: Geocoding API URL, defaults to None which uses "GEOCODER_URL" or the Google Geocoding API. Point this at a local server to test
+        :param api_key: API key, defaults to None which uses "GOOGLE_MAPS_API_KEY"
+        :param max_workers: Maximum number of concurrent requests, defaults to 8
+        :param requests_per_second: Maximum sustained request rate, defaults to 10.0
+        :param negative_ttl_seconds: Number of seconds an address which cannot be found is cached for, defaults to a week
+        :param timeout_seconds: Timeout of each request, defaults to 10.0
+        """
+        if cache_path is None:
+            cache_path = _os.getenv("GEOCODER_CACHE_PATH", _DEFAULT_CACHE_PATH)
+        self.__url = url or _os.getenv("GEOCODER_URL", _GOOGLE_GEOCODE_URL)
+        self.__api_key = api_key or _os.getenv("GOOGLE_MAPS_API_KEY")
+        self.__max_workers = max_workers
+        self.__negative_ttl_seconds = negative_ttl_seconds
+        self.__timeout_seconds = timeout_seconds
+        self.__token_bucket = _TokenBucket(
+            rate=requests_per_second, capacity=max(1.0, requests_per_second)
+        )
+        self.__thread_local = _th.local()
+
+        self.__connection = _sql.connect(cache_path)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode (
+                address TEXT PRIMARY KEY,
+                longitude REAL,
+                latitude REAL,
+                looked_up_at REAL NOT NULL
+            )
+            """
+        )
+        self.__connection.commit()
+
+    def __enter__(self) -> "Geocoder":
+        return self
+
+    def __exit__(self, *_: _t.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the cache.
+        """
+        self.__connection.close()
+
+    def geocode(
+        self, addresses: _t.Iterable[str]
+    ) -> dict[str, _t.Optional[tuple[float, float]]]:
+        """
+        Get the coordinates of addresses, looking up any which are not cached.
+
+        :param addresses: Addresses.
+        :return: Mapping of address to its longitude and latitude, or None if it cannot be found.
+        """
+        addresses = list(dict.fromkeys(addresses))
+        address_2_coordinates = self.__get_cached_coordinates(addresses)
+        uncached_addresses = [x for x in addresses if x not in address_2_coordinates]
+        if not uncached_addresses:
+            return address_2_coordinates
+
+        # NOTE: The cache is only written from this thread, as SQLite connections cannot be shared between threads
+        with _cf.ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            future_2_address = {
+                executor.submit(self.__look_up, x): x for x in uncached_addresses
+            }
+            for future in _cf.as_completed(future_2_address):
+                address = future_2_address[future]
+                try:
+                    is_found, coordinates = future.result()
+                except (_req.RequestException, ValueError, KeyError) as e:
+                    # Errors are not cached, so the address is looked up again next time
+                    print(f"Geocoding {address} failed, defaulting to null: {e}")
+                    address_2_coordinates[address] = None
+                    continue
+
+                if not is_found:
+                    print(f"{address} coordinates cannot be found, defaulting to null")
+                address_2_coordinates[address] = coordinates
+                self.__connection.execute(
+                    "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)",
+                    (
+                        address,
+                        *(coordinates or (None, None)),
+                        _tm.time(),
+                    ),
+                )
+                self.__connection.commit()
+
+        return address_2_coordinates
+
+    def __get_cached_coordinates(
+        self, addresses: list[str]
+    ) -> dict[str, _t.Optional[tuple[float, float]]]:
+        """
+        Get cached coordinates of addresses, ignoring expired negative results.
+
+        :param addresses: Addresses.
+        :return: Mapping of cached address to its longitude and latitude, or None if it cannot be found.
+        """
+        expiry_time = _tm.time() - self.__negative_ttl_seconds
+        address_2_coordinates = {}
+        for address, longitude, latitude, looked_up_at in self.__connection.execute(
+            """
+            SELECT address, longitude, latitude, looked_up_at
+            FROM geocode
+            WHERE address IN (SELECT value FROM json_each(?))
+            """,
+            (_json.dumps(addresses),),
+        ):
+            if longitude is None:
+                if looked_up_at >= expiry_time:
+                    address_2_coordinates[address] = None
+            else:
+                address_2_coordinates[address] = (longitude, latitude)
+
+        return address_2_coordinates
+
+    def __look_up(self, address: str) -> tuple[bool, _t.Optional[tuple[float, float]]]:
+        """
+        Look up the coordinates of an address using the API. This is called from the worker threads.
+
+        :param address: Address.
+        :return: Flag which determines whether the address was found, and its longitude and latitude if it was.
+        """
+        session = getattr(self.__thread_local, "session", None)
+        if session is None:
+            session = self.__thread_local.session = _req.Session()
+
+        self.__token_bucket.acquire()
+        print(f"Making geocoding request for {address}'s coordinates...")
+        response = session.get(
+            self.__url,
+            params={"address": address, "key": self.__api_key},
+            timeout=self.__timeout_seconds,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data["status"] == "OK" and data.get("results"):
+            geo_location = data["results"][0]["geometry"]["location"]
+            return True, (geo_location["lng"], geo_location["lat"])
+        # NOTE: An "OK" response without results is treated as not found, rather than failing the whole batch
+        if data["status"] in ("OK", "ZERO_RESULTS"):
+            return False, None
+
+        # Other statuses, e.g. "OVER_QUERY_LIMIT", are errors rather than negative results
+        raise ValueError(f"Unexpected status {data['status']!r}")
+
+
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket, which limits the sustained rate of an operation while allowing short bursts.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Initialise a full bucket.
+
+        :param rate: Number of tokens added per second.
+        :param capacity: Maximum number of tokens.
+        """
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = capacity
+        self.__updated_at = _tm.monotonic()
+        self.__lock = _th.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take a token, waiting until one is available.
+        """
+        while True:
+            with self.__lock:
+                now = _tm.monotonic()
+                self.__tokens = min(
+                    self.__capacity,
+                    self.__tokens + (now - self.__updated_at) * self.__rate,
+                )
+                self.__updated_at = now
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                wait_seconds = (1 - self.__tokens) / self.__rate
+
+            _tm.sleep(wait_seconds)
+
+
+_GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+_DEFAULT_CACHE_PATH = _pth.Path(__file__).resolve().parent / "geocoder_cache.db"
@@ -0,0 +1,54 @@
+import argparse as _ap
+import geo_pints_info as _gpi
+import geocoder as _gc
+import pandas as pd
+import pints_input_data_clean_up as _pcu
+import requests as req
+
+
+def main(chunk_size: int = 500):
+    """
+    Geocode the locations in the raw pint data CSV, assign each to its borough, and populate the test database via a REST API service.
+    Boroughs are assigned offline, so the API can aggregate pints per borough without any GeoJSON.
+
+    :param chunk_size: Number of locations sent per request, defaults to 500
+    """
+    url = "http://127.0.0.1:8000/api/locations/geo"
+    df = pd.read_csv("../../Pints_raw_data_2.csv")
+    df = _pcu.clean_up_input_pints_data(df)
+
+    locations = [str(x) for x in df["Location"].dropna().unique()]
+    with _gc.Geocoder() as geocoder:
+        location_2_coordinates = geocoder.geocode(locations)
+    geo_coordinates = [location_2_coordinates.get(x) for x in locations]
+    borough_names = _gpi.BoroughIndex.from_dir().get_borough_names(geo_coordinates)
+
+    payloads = [
+        {
+            "location": location,
+            "longitude": coordinates[0] if coordinates is not None else None,
+            "latitude": coordinates[1] if coordinates is not None else None,
+            "borough": borough_name,
+        }
+        for location, coordinates, borough_name in zip(
+            locations, geo_coordinates, borough_names
+        )
+    ]
+
+    for start in range(0, len(payloads), chunk_size):
+        chunk = payloads[start : start + chunk_size]
+        print(f"Sending request with locations {start} to {start + len(chunk) - 1}")
+        response = req.put(url, json=chunk)
+        response.raise_for_status()
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="Number of locations sent per request.",
+    )
+    args = parser.parse_args()
+    main(chunk_size=args.chunk_size)
@@ -1,40 +1,49 @@
-import datetime as dt
-import numpy as np
+import argparse as _ap
 import pandas as pd
 import pints_input_data_clean_up as _pcu
 import requests as req
 
 
-def main():
+def main(chunk_size: int = 500):
     """
     Load raw pint data from a CSV and populate the test database via a REST API service.
+    Records are sent to the bulk endpoint in chunks, each of which is written in a single transaction.
+
+    :param chunk_size: Number of records sent per request, defaults to 500
     """
-    url = "http://127.0.0.1:8000/api/records/"
+    url = "http://127.0.0.1:8000/api/records/bulk"
     df = pd.read_csv("../../Pints_raw_data_2.csv")
     df = _pcu.clean_up_input_pints_data(df)
-    df = df.replace({np.nan: None})
 
-    for _, row in df.iterrows():
-        date = dt.datetime.strptime(row["Date"], "%d/%m/%Y").date()
-        payload = {
-            "comment": row["Comments"],
-            "date": str(date),
-            "location": row["Location"],
-            "number": row["Number"],
-            "pint_brand": row["Pint"],
-            "pint_cost": _get_cost_float(row["Cost (per pint)"]),
-            "total_cost": _get_cost_float(row["Spend"]),
-            "friend_names": (
-                row["Company"].split(", ") if row["Company"] is not None else []
-            ),
+    # NOTE: Every column is already parsed, so the payloads are built column-wise with missing values as None
+    payload_df = pd.DataFrame(
+        {
+            "comment": df["Comments"],
+            "date": df["Date"].dt.strftime("%Y-%m-%d"),
+            "location": df["Location"],
+            "number": df["Number"],
+            "pint_brand": df["Pint"],
+            "pint_cost": df["Cost (per pint)"],
+            "total_cost": df["Spend"],
+            "friend_names": df["company_list"],
         }
-        print(f"Sending request: {payload}")
-        _ = req.post(url, json=payload)
-
+    ).astype(object)
+    payloads = payload_df.where(payload_df.notnull(), None).to_dict("records")
 
-def _get_cost_float(cost_str: str) -> float:
-    return float(cost_str[1:])
+    for start in range(0, len(payloads), chunk_size):
+        chunk = payloads[start : start + chunk_size]
+        print(f"Sending request with records {start} to {start + len(chunk) - 1}")
+        response = req.post(url, json=chunk)
+        response.raise_for_status()
 
 
 if __name__ == "__main__":
-    main()
+    parser = _ap.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="Number of records sent per request.",
+    )
+    args = parser.parse_args()
+    main(chunk_size=args.chunk_size)
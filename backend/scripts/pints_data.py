@@ -1,8 +1,7 @@
-import collections as _coll
-import datetime as _dt
-import os as _os
+import calendar as _cal
+import geocoder as _gc
+import json as _json
 import pandas as _pd
-import requests as _req
 import typing as _t
 
 
@@ -10,12 +9,14 @@ def compute_pints_data(
     input_pints_df: _pd.DataFrame,
     *,
     visited_locations_2_coordinates: _t.Optional[dict[str, _t.Iterable[str]]] = None,
+    compact: bool = False,
 ) -> _t.Dict[str, _t.Any]:
     """
     Compute pints-related data using the input data provided.
 
     :param input_pints_df: Input pints data frame.
     :param visited_locations_2_coordinates: Locations and their coordinates that have already been visited. This is used to avoid unneccessary calls to the Google Maps API. Defaults to None
+    :param compact: Flag which determines whether the time series of entries is in the compact, versioned form, defaults to False
     :return: Pints-related data which will be used for visualisation.
     """
     friends_info, all_names = _compute_friends_info(input_pints_df)
@@ -25,7 +26,171 @@ def compute_pints_data(
         "location_info": _compute_location_info(
             input_pints_df, visited_locations_2_coordinates
         ),
-        "date_info": _compute_date_info(input_pints_df, all_names),
+        "date_info": _compute_date_info(input_pints_df, all_names, compact=compact),
+        "friends_info": friends_info,
+    }
+
+
+def compute_pints_aggregates(input_pints_df: _pd.DataFrame) -> _t.Dict[str, _t.Any]:
+    """
+    Compute mergeable aggregates of the input data, from which the pints-related data can be computed without the input data.
+    Aggregates of consecutive chunks of input data can be merged using `merge_pints_aggregates`, so only new data needs to be aggregated.
+
+    :param input_pints_df: Input pints data frame.
+    :return: JSON-serialisable aggregates.
+    """
+    date_series = input_pints_df["Date"]
+    iso_date_series = date_series.dt.strftime("%Y-%m-%d")
+    number_series = input_pints_df["Number"]
+    pint_series = input_pints_df["Pint"]
+
+    # Friends, in order of first appearance
+    exploded_df = _get_exploded_company_df(input_pints_df)
+    name_2_pint_count = (
+        exploded_df.groupby("company_list", sort=False, observed=True)["Number"]
+        .sum()
+        .to_dict()
+    )
+    friends = {
+        name: {"pint_count": pint_count, "pub_2_frequency": {}}
+        for name, pint_count in name_2_pint_count.items()
+    }
+    for (name, location), number in (
+        exploded_df.groupby(["company_list", "Location"], sort=False, observed=True)[
+            "Number"
+        ]
+        .sum()
+        .to_dict()
+        .items()
+    ):
+        friends[name]["pub_2_frequency"][location] = number
+
+    # Locations keep the dates they were visited on, as visits are counted per distinct date
+    location_groupby = iso_date_series.groupby(
+        input_pints_df["Location"], observed=True
+    )
+    location_2_number_of_pints = (
+        number_series.groupby(input_pints_df["Location"], observed=True).sum().to_dict()
+    )
+    locations = {
+        location: {
+            "dates": sorted(dates),
+            "number_of_pints": location_2_number_of_pints[location],
+        }
+        for location, dates in location_groupby.unique().items()
+    }
+
+    # Date buckets and entries keep drink counts, as the most popular drink is the mode
+    date_buckets = {}
+    for date_col_name, _, get_bucket_series, _ in _DATE_BUCKETS:
+        date_buckets[date_col_name] = _get_bucket_aggregates(
+            get_bucket_series(date_series).astype(str), number_series, pint_series
+        )
+
+    entry_key_series = _pd.Series(
+        [
+            _json.dumps([date, sorted(company)])
+            for date, company in zip(iso_date_series, input_pints_df["company_list"])
+        ],
+        index=input_pints_df.index,
+    )
+
+    return {
+        "total_pint_count": float(number_series.sum()),
+        "pints": number_series.groupby(pint_series, observed=True).sum().to_dict(),
+        "friends": friends,
+        "locations": locations,
+        "date_buckets": date_buckets,
+        "entries": _get_bucket_aggregates(entry_key_series, number_series, pint_series),
+    }
+
+
+def merge_pints_aggregates(
+    aggregates: _t.Dict[str, _t.Any], other_aggregates: _t.Dict[str, _t.Any]
+) -> _t.Dict[str, _t.Any]:
+    """
+    Merge the aggregates of two chunks of input data, where `other_aggregates` is of the later chunk.
+
+    :param aggregates: Aggregates.
+    :param other_aggregates: Other aggregates.
+    :return: Merged aggregates.
+    """
+    return _get_merged_aggregate(aggregates, other_aggregates)
+
+
+def compute_pints_data_from_aggregates(
+    aggregates: _t.Dict[str, _t.Any],
+    *,
+    visited_locations_2_coordinates: _t.Optional[dict[str, _t.Iterable[str]]] = None,
+    compact: bool = False,
+) -> _t.Dict[str, _t.Any]:
+    """
+    Compute pints-related data using aggregates of the input data, see `compute_pints_data`.
+
+    :param aggregates: Aggregates, see `compute_pints_aggregates`.
+    :param visited_locations_2_coordinates: Locations and their coordinates that have already been visited. This is used to avoid unneccessary calls to the Google Maps API. Defaults to None
+    :param compact: Flag which determines whether the time series of entries is in the compact, versioned form, defaults to False
+    :return: Pints-related data which will be used for visualisation.
+    """
+    friends = aggregates["friends"]
+    all_names = list(friends)
+    friends_info = _get_friends_leaderboard(
+        _pd.Series({k: v["pint_count"] for k, v in friends.items()}, dtype=float),
+        {k: v["pub_2_frequency"] for k, v in friends.items()},
+    )
+
+    locations = aggregates["locations"]
+    location_df = _pd.DataFrame(
+        {
+            "number_of_visits": [len(v["dates"]) for v in locations.values()],
+            "number_of_pints": [v["number_of_pints"] for v in locations.values()],
+        },
+        index=list(locations),
+    ).sort_index()
+
+    date_info_dict = {}
+    for date_col_name, output_str, _, get_bucket_label in _DATE_BUCKETS:
+        # Buckets are keyed by number, e.g. the month number, so they are sorted chronologically
+        buckets = aggregates["date_buckets"][date_col_name]
+        date_info_dict[output_str] = [
+            {
+                date_col_name: get_bucket_label(int(key)),
+                "number_of_pints": buckets[key]["number"],
+                "most_popular_drink": _get_most_popular_drink(
+                    buckets[key]["drink_2_count"]
+                ),
+            }
+            for key in sorted(buckets, key=int)
+        ]
+
+    # Entries are ordered by date and company, as when grouping the input data
+    entries = sorted(
+        (_json.loads(key), bucket) for key, bucket in aggregates["entries"].items()
+    )
+    stats_per_entry_df = _pd.DataFrame(
+        {
+            "_datetime_date_": [date for (date, _), _ in entries],
+            "company": [list(set(company)) for (_, company), _ in entries],
+            "Number": [bucket["number"] for _, bucket in entries],
+            "Pint": [
+                _get_most_popular_drink(bucket["drink_2_count"])
+                for _, bucket in entries
+            ],
+        }
+    )
+    date_info_dict.update(
+        _get_time_series_info(stats_per_entry_df, all_names, compact=compact)
+    )
+
+    return {
+        "total_pint_count": aggregates["total_pint_count"],
+        "pint_info": _get_pint_info(
+            _pd.Series(aggregates["pints"], dtype=float).sort_index()
+        ),
+        "location_info": _get_location_info(
+            location_df, visited_locations_2_coordinates or {}
+        ),
+        "date_info": date_info_dict,
         "friends_info": friends_info,
     }
 
@@ -42,110 +207,150 @@ def _compute_friends_info(
     Compute friend pint-related information.
 
     :param input_pints_df: Input pints data frame.
-    :return: Sorted leaderboard in descending order.
+    :return: Sorted leaderboard in descending order, and every friend name in each entry in order of appearance.
     """
-    # Create a mapping from name to pint count
-    name_2_pint_info = _coll.defaultdict(dict)
-    all_names = []
-    for _, row in input_pints_df.iterrows():
-        for name in row["company_list"]:
-            all_names.append(name)
-            pint_info = name_2_pint_info[name]
-            number = row["Number"]
-            location = row["Location"]
-            if not bool(pint_info):
-                pint_info["pint_count"] = number
-                pint_info["pub_2_frequency"] = _coll.defaultdict(
-                    int, **{location: number}
-                )
-                pint_info["icon"] = "&#x1F37A"
-            else:
-                pint_info["pint_count"] += number
-                pint_info["pub_2_frequency"][location] += number
-
-    # NOTE: We only use a data frame here to leverage the `rank` and `sort_values` functionality
-    df = _pd.DataFrame(
-        index=list(name_2_pint_info.keys()), data=name_2_pint_info.values()
+    exploded_df = _get_exploded_company_df(input_pints_df)
+    all_names = exploded_df["company_list"].tolist()
+
+    # NOTE: Groups are kept in order of first appearance, so friends and their pubs are ordered as they appear in the input
+    pint_count_series = exploded_df.groupby("company_list", sort=False, observed=True)[
+        "Number"
+    ].sum()
+    name_2_pub_2_frequency = {x: {} for x in pint_count_series.index}
+    for (name, location), number in (
+        exploded_df.groupby(["company_list", "Location"], sort=False, observed=True)[
+            "Number"
+        ]
+        .sum()
+        .items()
+    ):
+        name_2_pub_2_frequency[name][location] = number
+
+    return (
+        _get_friends_leaderboard(pint_count_series, name_2_pub_2_frequency),
+        all_names,
     )
+
+
+def _get_friends_leaderboard(
+    pint_count_series: _pd.Series, name_2_pub_2_frequency: dict[str, dict[str, float]]
+) -> dict[_t.Any, _t.Any]:
+    """
+    Get the friends leaderboard.
+
+    :param pint_count_series: Pint count per friend, in order of first appearance.
+    :param name_2_pub_2_frequency: Mapping of friend name to the number of pints drunk at each location.
+    :return: Sorted leaderboard in descending order.
+    """
+    df = pint_count_series.rename_axis(None).to_frame("pint_count")
+    df["pub_2_frequency"] = [name_2_pub_2_frequency[x] for x in df.index]
+    df["icon"] = "&#x1F37A"
     df["pint_count_rank"] = df["pint_count"].rank(method="min", ascending=False)
     df = df.sort_values("pint_count_rank", ascending=True)
-    name_2_rank = df.to_dict("index")
+    return df.to_dict("index")
 
-    return name_2_rank, all_names
+
+def _get_exploded_company_df(input_pints_df: _pd.DataFrame) -> _pd.DataFrame:
+    """
+    Get one row per friend per entry. Entries without company explode to a null name, which is dropped.
+
+    :param input_pints_df: Input pints data frame.
+    :return: Friend name, location and number of pints per friend per entry, where friend names are categorical.
+    """
+    return (
+        input_pints_df[["company_list", "Location", "Number"]]
+        .explode("company_list")
+        .dropna(subset=["company_list"])
+        .astype({"company_list": "category"})
+    )
 
 
 def _compute_date_info(
-    input_pints_df: _pd.DataFrame, all_names: _t.Iterable[str]
+    input_pints_df: _pd.DataFrame, all_names: _t.Iterable[str], compact: bool = False
 ) -> _t.Dict[str, _t.Any]:
     """
     Compute pints-related data.
+    Every date feature comes from the parsed "Date" column's `.dt` accessors, and every output is in chronological order.
 
     :param input_pints_df: Input pints data frame.
     :param all_names: All names.
+    :param compact: Flag which determines whether the time series of entries is in the compact, versioned form, defaults to False
     :return: Pints-related date data.
     """
     date_info_dict = {}
     date_series = input_pints_df["Date"]
-    df = input_pints_df.assign(
-        **{
-            "_datetime_date_": date_series.map(
-                lambda x: _dt.datetime.strptime(x, "%d/%m/%Y").date()
-            )
-        }
-    )
-
-    # TODO Sort each entry chronologically
-    for date_col_name, output_str, time_format_str in [
-        ("day", "pints_per_day_of_the_week", "%A"),
-        ("week", "pints_per_week_of_the_year", "%U"),
-        ("month", "pints_per_month_of_the_year", "%B"),
-    ]:
-        df[date_col_name] = df["_datetime_date_"].map(
-            lambda x: x.strftime(time_format_str)
+    number_series = input_pints_df["Number"]
+    pint_series = input_pints_df["Pint"]
+
+    # Buckets are grouped by number, e.g. the month number, so they are in chronological order
+    for date_col_name, output_str, get_bucket_series, get_bucket_label in _DATE_BUCKETS:
+        bucket_series = get_bucket_series(date_series).rename(date_col_name)
+        bucket_df = (
+            number_series.groupby(bucket_series).sum().to_frame("number_of_pints")
         )
-        date_info_dict[output_str] = (
-            df.groupby(date_col_name)
-            .agg({"Number": "sum", "Pint": lambda x: x.mode().iloc[0]})
-            .reset_index()
-            .rename(
-                columns={
-                    "Number": "number_of_pints",
-                    "Pint": "most_popular_drink",
-                }
-            )
-            .to_dict("records")
+        bucket_df["most_popular_drink"] = _get_most_popular_drink_series(
+            [bucket_series], pint_series, bucket_df.index
         )
+        bucket_df.index = bucket_df.index.map(get_bucket_label)
+        date_info_dict[output_str] = bucket_df.reset_index().to_dict("records")
 
     # Compute pints stats per entry; which is essentially grouping data by date and company
-    stats_per_entry_df = input_pints_df.assign(
-        **{
-            "company": input_pints_df["company_list"].apply(lambda x: tuple(sorted(x))),
-            "_datetime_date_": date_series.map(
-                lambda x: _dt.datetime.strptime(x, "%d/%m/%Y").date()
-            ),
-        }
+    entry_key_series_list = [
+        date_series.rename("_datetime_date_"),
+        input_pints_df["company_list"]
+        .map(lambda x: tuple(sorted(x)))
+        .rename("company"),
+    ]
+    stats_per_entry_df = (
+        number_series.groupby(entry_key_series_list).sum().to_frame("Number")
     )
-    stats_per_entry_df = stats_per_entry_df.groupby(
-        ["_datetime_date_", "company"], as_index=False
-    ).agg({"Number": "sum", "Pint": lambda x: x.mode().iloc[0]})
-    stats_per_entry_df["_datetime_date_"] = stats_per_entry_df["_datetime_date_"].apply(
-        str
+    stats_per_entry_df["Pint"] = _get_most_popular_drink_series(
+        entry_key_series_list, pint_series, stats_per_entry_df.index
     )
-    stats_per_entry_df["company"] = stats_per_entry_df["company"].apply(
+    stats_per_entry_df = stats_per_entry_df.reset_index()
+    stats_per_entry_df["_datetime_date_"] = stats_per_entry_df[
+        "_datetime_date_"
+    ].dt.strftime("%Y-%m-%d")
+    stats_per_entry_df["company"] = stats_per_entry_df["company"].map(
         lambda x: list(set(x))
     )
+    date_info_dict.update(
+        _get_time_series_info(stats_per_entry_df, all_names, compact=compact)
+    )
+
+    return date_info_dict
+
+
+def _get_time_series_info(
+    stats_per_entry_df: _pd.DataFrame, all_names: _t.Iterable[str], compact: bool
+) -> _t.Dict[str, _t.Any]:
+    """
+    Get the time series of pints per entry and per date.
+
+    :param stats_per_entry_df: Pints stats per entry, in chronological order.
+    :param all_names: All names.
+    :param compact: Flag which determines whether the time series of entries is in the compact, versioned form.
+    :return: Time series of entries and dates.
+    """
+    date_info_dict = {}
+
     stats_per_entry_df["cumulative_number"] = stats_per_entry_df["Number"].cumsum()
-    stats_per_entry_dict = stats_per_entry_df.to_dict(orient="index")
+    if compact:
+        date_info_dict["time_series_entry_info"] = _get_compact_time_series_entry_info(
+            stats_per_entry_df, all_names
+        )
+    else:
+        stats_per_entry_dict = stats_per_entry_df.to_dict(orient="index")
 
-    name_2_cumulative_pints = {x: 0.0 for x in all_names}
-    for info in stats_per_entry_dict.values():
-        for name in info["company"]:
-            name_2_cumulative_pints[name] += info["Number"]
+        name_2_cumulative_pints = {x: 0.0 for x in all_names}
+        for info in stats_per_entry_dict.values():
+            for name in info["company"]:
+                name_2_cumulative_pints[name] += info["Number"]
 
-        # Take a shallow copy
-        info["company_2_cumulative_pints"] = dict(name_2_cumulative_pints)
+            # Take a shallow copy
+            info["company_2_cumulative_pints"] = dict(name_2_cumulative_pints)
 
-    date_info_dict["time_series_entry_info"] = stats_per_entry_dict
+        date_info_dict["time_series_entry_info"] = stats_per_entry_dict
 
     # Stats per day
     stats_per_date_df = stats_per_entry_df.groupby("_datetime_date_").agg(
@@ -164,6 +369,41 @@ def _compute_date_info(
     return date_info_dict
 
 
+def _get_compact_time_series_entry_info(
+    stats_per_entry_df: _pd.DataFrame, all_names: _t.Iterable[str]
+) -> _t.Dict[str, _t.Any]:
+    """
+    Get the time series of entries in a compact, columnar form.
+    Each friend in an entry's company drinks the entry's "Number" of pints, so rather than storing every friend's cumulative pints for every entry,
+    which grows with entries x friends, each entry's company is stored as indices into the friends list and clients rebuild the cumulative pints with a running sum.
+
+    :param stats_per_entry_df: Pints stats per entry, in chronological order.
+    :param all_names: All names.
+    :return: Time series of entries, with one list per column.
+    """
+    friends = list(dict.fromkeys(all_names))
+
+    # Map each entry's company to friend indices, keeping entries without company as empty lists
+    company_series = stats_per_entry_df["company"].explode().dropna()
+    friend_index_series = _pd.Series(
+        _pd.Categorical(company_series, categories=friends).codes,
+        index=company_series.index,
+    )
+    company_friend_indices = friend_index_series.groupby(level=0).agg(list)
+
+    return {
+        "schema_version": _TIME_SERIES_ENTRY_INFO_SCHEMA_VERSION,
+        "friends": friends,
+        "_datetime_date_": stats_per_entry_df["_datetime_date_"].tolist(),
+        "Number": stats_per_entry_df["Number"].tolist(),
+        "Pint": stats_per_entry_df["Pint"].tolist(),
+        "cumulative_number": stats_per_entry_df["cumulative_number"].tolist(),
+        "company": [
+            company_friend_indices.get(x, []) for x in stats_per_entry_df.index
+        ],
+    }
+
+
 def _compute_location_info(
     input_pints_df: _pd.DataFrame,
     visited_locations_2_coordinates: _t.Optional[dict[str, _t.Iterable[str]]] = None,
@@ -186,11 +426,25 @@ def _compute_location_info(
                 "number_of_pints": input_pints_df["Number"],
             }
         )
-        .groupby("name")
+        .groupby("name", observed=True)
         .agg({"date": "nunique", "number_of_pints": "sum"})
         .rename(columns={"date": "number_of_visits"})
-        .sort_values("number_of_pints", ascending=False)
     )
+    return _get_location_info(df, visited_locations_2_coordinates)
+
+
+def _get_location_info(
+    df: _pd.DataFrame,
+    visited_locations_2_coordinates: dict[str, _t.Iterable[str]],
+) -> dict[_t.Any, dict[_t.Any, _t.Any]]:
+    """
+    Get pints-related data about each location visited, ranked by the number of pints and with coordinates added.
+
+    :param df: Number of visits and pints, indexed by location name in ascending order.
+    :param visited_locations_2_coordinates: Locations and their coordinates that have already been visited.
+    :return: Pints-related data as a list of dictionaries.
+    """
+    df = df.sort_values("number_of_pints", ascending=False)
     df["number_of_pints_rank"] = df["number_of_pints"].rank(
         method="min", ascending=False
     )
@@ -198,29 +452,21 @@ def _compute_location_info(
     # t = dict[_t.Hashable, dict[, _t.Any]]
     location_name_2_info_dict = df.to_dict(orient="index")
 
-    # Add location coordinates if necessary
-    api_key = _os.getenv("GOOGLE_MAPS_API_KEY")
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
-    for name, info_dict in location_name_2_info_dict.items():
-
-        if name in visited_locations_2_coordinates:
-            info_dict["coordinates"] = visited_locations_2_coordinates[name_str]  # type: ignore
-            continue
+    # Add location coordinates, only geocoding locations without known coordinates
+    # NOTE: Locations previously not found are geocoded again, as the geocoder's cache decides when to retry them
+    unknown_location_names = [
+        x
+        for x in location_name_2_info_dict
+        if visited_locations_2_coordinates.get(x) is None
+    ]
+    with _gc.Geocoder() as geocoder:
+        location_name_2_coordinates = geocoder.geocode(unknown_location_names)
 
-        params = {
-            "address": name,
-            "key": api_key,
-        }
-        print(f"Making Google API request for {name}'s coordinates...")
-        response = _req.get(url, params=params)
-        data = response.json()
-        if data["status"] == "OK":
-            geo_location = data["results"][0]["geometry"]["location"]
-            coordinates = (geo_location["lng"], geo_location["lat"])
-            info_dict["coordinates"] = coordinates
+    for name, info_dict in location_name_2_info_dict.items():
+        if name in location_name_2_coordinates:
+            info_dict["coordinates"] = location_name_2_coordinates[name]
         else:
-            print(f"{name} coordinates cannot be found, defaulting to null")
-            info_dict["coordinates"] = None
+            info_dict["coordinates"] = visited_locations_2_coordinates[name]
 
     return location_name_2_info_dict
 
@@ -233,16 +479,123 @@ def _compute_pint_info(input_pints_df: _pd.DataFrame) -> list[dict[_t.Any, _t.An
     :return: Pints-related information.
     """
     # TODO Add pints related information
+    return _get_pint_info(input_pints_df.groupby("Pint", observed=True)["Number"].sum())
+
+
+def _get_pint_info(pint_count_series: _pd.Series) -> list[dict[_t.Any, _t.Any]]:
+    """
+    Get pints-related data about the brand/type of drink, in descending order.
+
+    :param pint_count_series: Number of pints per brand/type of drink, indexed in ascending order.
+    :return: Pints-related information.
+    """
     return (
-        input_pints_df.groupby("Pint")["Number"]
-        .sum()
+        pint_count_series.rename_axis("name")
+        .rename("count")
         .reset_index()
-        .sort_values("Number", ascending=False)
-        .rename(columns={"Pint": "name", "Number": "count"})
+        .sort_values("count", ascending=False)
         .to_dict("records")
     )
 
 
+def _get_bucket_aggregates(
+    key_series: _pd.Series, number_series: _pd.Series, pint_series: _pd.Series
+) -> dict[str, dict[str, _t.Any]]:
+    """
+    Get the number of pints, and the number of entries per drink, in each bucket.
+
+    :param key_series: Bucket key per entry.
+    :param number_series: Number of pints per entry.
+    :param pint_series: Drink per entry.
+    :return: Mapping of bucket key to its aggregates.
+    """
+    buckets = {
+        key: {"number": number, "drink_2_count": {}}
+        for key, number in number_series.groupby(key_series).sum().to_dict().items()
+    }
+    for (key, drink), count in (
+        pint_series.groupby([key_series, pint_series], observed=True)
+        .size()
+        .to_dict()
+        .items()
+    ):
+        buckets[key]["drink_2_count"][drink] = count
+
+    return buckets
+
+
+def _get_most_popular_drink(drink_2_count: dict[str, int]) -> _t.Optional[str]:
+    """
+    Get the most popular drink, breaking ties by name as `pandas.Series.mode` does.
+
+    :param drink_2_count: Mapping of drink to its number of entries.
+    :return: Most popular drink, or None if no drinks are known.
+    """
+    if not drink_2_count:
+        return None
+    return min(drink_2_count, key=lambda x: (-drink_2_count[x], x))
+
+
+def _get_most_popular_drink_series(
+    key_series_list: list[_pd.Series], pint_series: _pd.Series, index: _pd.Index
+) -> _pd.Series:
+    """
+    Get the most popular drink in each group, breaking ties by name as `pandas.Series.mode` does.
+    Drinks are counted per group and drink in one pass, then the first of each group's highest counts is taken, which has the lowest name as counts are sorted by name.
+
+    :param key_series_list: Group keys per entry.
+    :param pint_series: Drink per entry.
+    :param index: Index of the groups.
+    :return: Most popular drink per group, or None if no drinks are known.
+    """
+    drink_count_series = pint_series.groupby(
+        [*key_series_list, pint_series], observed=True
+    ).size()
+    most_popular_drink_series = (
+        drink_count_series.groupby(level=list(range(len(key_series_list))))
+        .idxmax()
+        .map(lambda x: x[-1])
+        .reindex(index)
+        .astype(object)
+    )
+    return most_popular_drink_series.where(most_popular_drink_series.notnull(), None)
+
+
+def _get_week_of_year_series(date_series: _pd.Series) -> _pd.Series:
+    """
+    Get the week of the year as `strftime("%U")` does, where weeks start on Sunday and days before the first Sunday are in week 0.
+
+    :param date_series: Dates.
+    :return: Week of the year.
+    """
+    day_of_week_from_sunday_series = (date_series.dt.dayofweek + 1) % 7
+    return (date_series.dt.dayofyear + 6 - day_of_week_from_sunday_series) // 7
+
+
+def _get_merged_aggregate(aggregate: _t.Any, other_aggregate: _t.Any) -> _t.Any:
+    """
+    Merge two aggregates recursively: mappings are merged by key, lists of distinct values are unioned and numbers are added.
+
+    :param aggregate: Aggregate.
+    :param other_aggregate: Other aggregate.
+    :return: Merged aggregate.
+    """
+    if isinstance(aggregate, dict):
+        merged_aggregate = dict(aggregate)
+        for key, value in other_aggregate.items():
+            merged_aggregate[key] = (
+                _get_merged_aggregate(merged_aggregate[key], value)
+                if key in merged_aggregate
+                else value
+            )
+        return merged_aggregate
+
+    if isinstance(aggregate, list):
+        return sorted(set(aggregate) | set(other_aggregate))
+
+    return aggregate + other_aggregate
+
+
 def _compute_total_pint_count(input_pints_df: _pd.DataFrame) -> float:
     """
     Get the total number of pints consumed
@@ -251,3 +604,32 @@ def _compute_total_pint_count(input_pints_df: _pd.DataFrame) -> float:
     :return: The total number of pints consumed.
     """
     return sum(input_pints_df["Number"])
+
+
+# Date buckets as (column name, output name, bucket number per date, label of a bucket number), where bucket numbers are in chronological order
+_DATE_BUCKETS: tuple[
+    tuple[str, str, _t.Callable[[_pd.Series], _pd.Series], _t.Callable[[int], str]],
+    ...,
+] = (
+    (
+        "day",
+        "pints_per_day_of_the_week",
+        lambda x: x.dt.dayofweek,
+        lambda x: _cal.day_name[x],
+    ),
+    (
+        "week",
+        "pints_per_week_of_the_year",
+        _get_week_of_year_series,
+        lambda x: f"{x:02d}",
+    ),
+    (
+        "month",
+        "pints_per_month_of_the_year",
+        lambda x: x.dt.month,
+        lambda x: _cal.month_name[x],
+    ),
+)
+
+# Version of the compact "time_series_entry_info" form. NOTE: Increment this whenever the form changes, as the UI reads it
+_TIME_SERIES_ENTRY_INFO_SCHEMA_VERSION = 2
@@ -4,39 +4,77 @@ import pandas as _pd
 def clean_up_input_pints_data(input_data_df: _pd.DataFrame) -> _pd.DataFrame:
     """
     Clean up input data.
+    Every column is parsed once, using vectorised operations, so downstream functions never parse text:
+    "Date" is a datetime64 column, money columns are float64 (NaN if missing), and "Location" and "Pint" are categorical.
 
-    :param input_data_df: Input data frame.
+    :param input_data_df: Input data frame, either raw or parsed by `parse_input_pints_data_types`.
     :return: Cleaned-up data frame.
     """
     # Remove empty entries
     date_series = input_data_df["Date"]
-    df = input_data_df.loc[date_series.notnull()]
+    df = parse_input_pints_data_types(input_data_df.loc[date_series.notnull()])
 
-    # Force data types is required becasue the data polled from the Google Sheets API results in string data types when we expect floats
-    # TODO Check that the columns names in `_COLUMN_NAME_TO_DTYPE` match the raw data's column names
-    df = df.astype(_COLUMN_NAME_TO_DTYPE)
+    for column_name in _CATEGORICAL_COLUMN_NAMES:
+        df[column_name] = df[column_name].astype("category")
 
-    # Add column "company_list" to data frame
-    company_list_series = df["Company"].map(
-        lambda x: x.split(",") if _pd.notnull(x) else []
-    )
-    company_list_series = company_list_series.map(lambda x: [y.lstrip() for y in x])
-    # - There is probably a much more efficient way of doing this
-    df["company_list"] = company_list_series.map(
-        lambda x: [_FRIENDS_RENAME_MAP.get(y, y) for y in x]
+    # Add column "company_list" to data frame, i.e. the renamed friends in each entry
+    # NOTE: "Company" is a float column if every entry is missing, e.g. read from a CSV file, which has no string methods
+    friend_name_series = (
+        df["Company"]
+        .astype("string")
+        .str.split(",")
+        .explode()
+        .str.strip()
+        .replace(_FRIENDS_RENAME_MAP)
     )
+    friend_name_series = friend_name_series.loc[
+        friend_name_series.notnull() & (friend_name_series != "")
+    ]
+    company_list_series = friend_name_series.groupby(level=0).agg(list)
+    df["company_list"] = [company_list_series.get(x, []) for x in df.index]
+
+    return df
+
+
+def parse_input_pints_data_types(input_data_df: _pd.DataFrame) -> _pd.DataFrame:
+    """
+    Parse the data types of input data, keeping every row, so chunks of rows can be parsed as they are read.
+    "Date" is a datetime64 column (NaT if missing), and "Number" and money columns are float64 (NaN if missing).
+    Columns which are already parsed are left as they are.
+
+    :param input_data_df: Input data frame.
+    :return: Parsed data frame.
+    """
+    df = input_data_df.copy()
+
+    # Force data types is required becasue the data polled from the Google Sheets API results in string data types when we expect floats
+    df["Date"] = _pd.to_datetime(df["Date"], format=_DATE_FORMAT)
+    df["Number"] = df["Number"].astype(float)
+    for column_name in _COST_COLUMN_NAMES:
+        df[column_name] = _get_cost_series(df[column_name])
 
     return df
 
 
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+def _get_cost_series(cost_series: _pd.Series) -> _pd.Series:
+    """
+    Get costs, e.g. "£1,234.50", as floats.
+
+    :param cost_series: Cost strings.
+    :return: Costs, or NaN if missing.
+    """
+    return _pd.to_numeric(
+        cost_series.astype("string").str.replace(r"[£,\s]", "", regex=True),
+        errors="raise",
+    ).astype(float)
+
+
 _FRIENDS_RENAME_MAP = {"Roisin": "Róisín", "Stan": "Stanley"}
-_COLUMN_NAME_TO_DTYPE = {
-    "Date": str,
-    "Location": str,
-    "Pint": str,
-    "Number": float,
-    "Cost (per pint)": str,
-    "Company": str,
-    # "Comments": str,
-    "Spend": str,
-}
+_DATE_FORMAT = "%d/%m/%Y"
+_COST_COLUMN_NAMES = ("Cost (per pint)", "Spend")
+_CATEGORICAL_COLUMN_NAMES = ("Location", "Pint")
@@ -1,34 +1,121 @@
-import google.auth as _ga
-import googleapiclient.discovery as _gd
 import os as _os
 import pandas as _pd
+import pathlib as _pth
+import pints_input_data_clean_up as _idc
+import typing as _t
 
 
-def get_pints_input_data(write_to_file: bool = False) -> _pd.DataFrame:
+def get_pints_input_data(
+    write_to_file: bool = False,
+    *,
+    file_path: _t.Union[str, _pth.Path] = "./Pints_raw_data.csv",
+    chunk_size: int = 1000,
+    service: _t.Any = None,
+) -> _pd.DataFrame:
     """
     Get pints input data from the spreadsheet using Google Sheets API service.
     In order to successfully query the data, authentication is required to use the API and permission is requred to access the spreadsheet.
 
-    :param write_to_file: Flag which determines whether we write to a CSV file, defaults to False
-    :return: Raw pints input data frame.
+    :param write_to_file: Flag which determines whether we write a snapshot of the data to a file, defaults to False
+    :param file_path: Snapshot file path, written as Parquet, which requires the "snapshot" extra, if it ends with ".parquet" and as CSV otherwise, defaults to "./Pints_raw_data.csv"
+    :param chunk_size: Number of rows fetched per request, defaults to 1000
+    :param service: Google Sheets API service, defaults to None which builds one using the default credentials
+    :return: Pints input data frame, with the data types parsed, see `iter_pints_input_data`.
     """
-    credentials, _ = _ga.default()
-    spreadsheet_id = _os.getenv("GOOGLE_SPREADSHEET_ID")
-    cell_range = "A1:H1000"
-    with _gd.build("sheets", "v4", credentials=credentials) as service:
-        pints_input_data_rows = (
-            service.spreadsheets()
-            .values()
-            .get(spreadsheetId=spreadsheet_id, range=cell_range)
-            .execute()
-        )["values"]
-
-    input_pints_df = _pd.DataFrame(
-        columns=pints_input_data_rows[0], data=pints_input_data_rows[1:]
+    input_pints_df = _pd.concat(
+        iter_pints_input_data(chunk_size=chunk_size, service=service),
+        ignore_index=True,
     )
 
     if write_to_file:
-        # TODO Write to a CSV file
-        pass
+        file_path = _pth.Path(file_path)
+        if file_path.suffix == ".parquet":
+            input_pints_df.to_parquet(file_path, index=False)
+        else:
+            input_pints_df.to_csv(file_path, index=False)
 
     return input_pints_df
+
+
+def iter_pints_input_data(
+    chunk_size: int = 1000, *, service: _t.Any = None
+) -> _t.Iterator[_pd.DataFrame]:
+    """
+    Get pints input data from the spreadsheet in chunks of rows, so any number of rows can be read without holding every row at once.
+    Chunks are fetched until one has no rows, so blank rows between rows of data are read, see `get_pints_input_data`.
+
+    :param chunk_size: Number of rows fetched per request, defaults to 1000
+    :param service: Google Sheets API service, defaults to None which builds one using the default credentials
+    :return: Pints input data frames, with the header row's columns and the data types parsed by `parse_input_pints_data_types`.
+             Other values are strings, and blank cells are None. An empty data frame is only yielded if there are no rows, so the columns are
+             still known.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size {chunk_size}, expected at least 1")
+
+    if service is None:
+        # NOTE: The Google API client is only imported when it is needed, so a service can be passed in without it being installed
+        import google.auth as _ga
+        import googleapiclient.discovery as _gd
+
+        credentials, _ = _ga.default()
+        with _gd.build("sheets", "v4", credentials=credentials) as service:
+            yield from iter_pints_input_data(chunk_size, service=service)
+        return
+
+    spreadsheet_id = _os.getenv("GOOGLE_SPREADSHEET_ID")
+    values = service.spreadsheets().values()
+    columns = _get_rows(values, spreadsheet_id, 1, 1)[0]
+
+    # NOTE: Ranges of whole rows are used, so the number of columns is set by the header row alone
+    start_row = 2
+    while True:
+        rows = _get_rows(values, spreadsheet_id, start_row, start_row + chunk_size - 1)
+        if rows or start_row == 2:
+            yield _idc.parse_input_pints_data_types(
+                _pd.DataFrame(
+                    columns=columns,
+                    data=[_get_padded_row(x, len(columns)) for x in rows],
+                )
+            )
+
+        # The API omits trailing blank rows, so a short chunk can be followed by more rows after a blank gap, and only an empty one is the last
+        if not rows:
+            return
+        start_row += chunk_size
+
+
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+def _get_rows(
+    values: _t.Any, spreadsheet_id: _t.Optional[str], start_row: int, end_row: int
+) -> list[list[str]]:
+    """
+    Get a range of rows from the spreadsheet.
+
+    :param values: Google Sheets API values resource.
+    :param spreadsheet_id: Spreadsheet ID.
+    :param start_row: First row, starting from 1.
+    :param end_row: Last row, inclusive.
+    :return: Rows, without any trailing blank rows or cells.
+    """
+    return (
+        values.get(spreadsheetId=spreadsheet_id, range=f"{start_row}:{end_row}")
+        .execute()
+        .get("values", [])
+    )
+
+
+def _get_padded_row(row: list[str], length: int) -> list[_t.Optional[str]]:
+    """
+    Get a row with blank cells as None, padded or truncated to a length.
+
+    :param row: Row, without any trailing blank cells.
+    :param length: Length.
+    :return: Padded row.
+    """
+    row = [x if x != "" else None for x in row[:length]]
+    return row + [None] * (length - len(row))
@@ -0,0 +1,449 @@
+import datetime as _dt
+import json as _json
+import pandas as _pd
+import pathlib as _pth
+import typing as _t
+
+try:
+    import pyarrow as _pa
+    import pyarrow.ipc as _ipc
+except ImportError:
+    _pa = None
+
+#
+# NOTE: Snapshots are uncompressed Arrow IPC files with typed schemas, so they can be memory-mapped and read without parsing any text.
+#       Each section of the pints information is a separate set of files, so sections can be reloaded on their own.
+#
+
+
+def write_pints_snapshot(
+    snapshot_dir: _t.Union[str, _pth.Path],
+    input_pints_df: _pd.DataFrame,
+    pints_info: dict[str, _t.Any],
+    *,
+    row_count: int,
+) -> None:
+    """
+    Write a snapshot of the cleaned-up input data and of each section of the pints information.
+
+    :param snapshot_dir: Snapshot directory.
+    :param input_pints_df: Cleaned-up input pints data frame.
+    :param pints_info: Pints information, with the compact time series of entries, see `pints_data.compute_pints_data`.
+    :param row_count: Number of raw input rows the snapshot was computed from.
+    """
+    _check_pyarrow()
+    snapshot_dir = _pth.Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    _write_table(snapshot_dir / _INPUT_FILE_NAME, _get_input_table(input_pints_df))
+    for section_name, (get_tables, _) in _SECTION_2_CONVERTERS.items():
+        for table_name, table in get_tables(pints_info[section_name]).items():
+            _write_table(snapshot_dir / f"{table_name}.arrow", table)
+
+    # NOTE: The metadata is written last, so an interrupted snapshot is not read
+    with open(snapshot_dir / _METADATA_FILE_NAME, mode="w", encoding="utf-8") as file:
+        _json.dump(
+            {
+                "version": _SNAPSHOT_VERSION,
+                "row_count": row_count,
+                "total_pint_count": pints_info["total_pint_count"],
+            },
+            file,
+        )
+
+
+def read_pints_snapshot_metadata(
+    snapshot_dir: _t.Union[str, _pth.Path],
+) -> _t.Optional[dict[str, _t.Any]]:
+    """
+    Read the metadata of a snapshot.
+
+    :param snapshot_dir: Snapshot directory.
+    :return: Metadata, with the number of raw input rows and the total pint count, or None if there is no snapshot of the current version.
+    """
+    metadata_file_path = _pth.Path(snapshot_dir) / _METADATA_FILE_NAME
+    if not metadata_file_path.exists():
+        return None
+
+    with open(metadata_file_path, mode="r", encoding="utf-8") as file:
+        metadata = _json.load(file)
+
+    if metadata.get("version") != _SNAPSHOT_VERSION:
+        return None
+    return metadata
+
+
+def read_pints_snapshot_input(
+    snapshot_dir: _t.Union[str, _pth.Path], *, memory_map: bool = True
+) -> _pd.DataFrame:
+    """
+    Read the cleaned-up input data of a snapshot, with the same data types as `pints_input_data_clean_up.clean_up_input_pints_data`.
+
+    :param snapshot_dir: Snapshot directory.
+    :param memory_map: Flag which determines whether the file is memory-mapped rather than read into memory, defaults to True
+    :return: Cleaned-up input pints data frame.
+    """
+    _check_pyarrow()
+    table = _read_table(_pth.Path(snapshot_dir) / _INPUT_FILE_NAME, memory_map)
+    input_pints_df = table.to_pandas()
+    input_pints_df["company_list"] = [
+        x.tolist() for x in input_pints_df["company_list"]
+    ]
+    return input_pints_df
+
+
+def read_pints_snapshot(
+    snapshot_dir: _t.Union[str, _pth.Path],
+    section_names: _t.Optional[_t.Iterable[str]] = None,
+    *,
+    memory_map: bool = True,
+) -> dict[str, _t.Any]:
+    """
+    Read sections of the pints information from a snapshot.
+
+    :param snapshot_dir: Snapshot directory.
+    :param section_names: Names of the sections, e.g. "date_info", defaults to None which reads every section
+    :param memory_map: Flag which determines whether the files are memory-mapped rather than read into memory, defaults to True
+    :return: Pints information, in the same form as `pints_data.compute_pints_data` with the compact time series of entries.
+    """
+    _check_pyarrow()
+    snapshot_dir = _pth.Path(snapshot_dir)
+    metadata = read_pints_snapshot_metadata(snapshot_dir)
+    if metadata is None:
+        raise FileNotFoundError(f"No snapshot in {snapshot_dir}")
+
+    pints_info = {"total_pint_count": metadata["total_pint_count"]}
+    for section_name in section_names or _SECTION_2_CONVERTERS:
+        if section_name not in _SECTION_2_CONVERTERS:
+            raise ValueError(
+                f"Invalid section {section_name}, expected one of {list(_SECTION_2_CONVERTERS)}"
+            )
+
+        _, get_section = _SECTION_2_CONVERTERS[section_name]
+        pints_info[section_name] = get_section(
+            lambda x: _read_table(snapshot_dir / f"{x}.arrow", memory_map)
+        )
+
+    return pints_info
+
+
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+def _check_pyarrow() -> None:
+    """
+    Check that pyarrow, which snapshots are read and written with, is installed.
+    """
+    if _pa is None:
+        raise ImportError(
+            'Snapshots require pyarrow, install the "snapshot" extra to use them'
+        )
+
+
+def _write_table(file_path: _pth.Path, table: "_pa.Table") -> None:
+    """
+    Write a table to an Arrow IPC file.
+
+    :param file_path: File path.
+    :param table: Table.
+    """
+    with _ipc.new_file(file_path, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_table(file_path: _pth.Path, memory_map: bool) -> "_pa.Table":
+    """
+    Read a table from an Arrow IPC file.
+
+    :param file_path: File path.
+    :param memory_map: Flag which determines whether the file is memory-mapped, so buffers are only paged in when used, rather than read into memory.
+    :return: Table.
+    """
+    source = (
+        _pa.memory_map(str(file_path)) if memory_map else _pa.OSFile(str(file_path))
+    )
+    with source:
+        return _ipc.open_file(source).read_all()
+
+
+def _get_input_table(input_pints_df: _pd.DataFrame) -> "_pa.Table":
+    """
+    Get the cleaned-up input data as a table.
+    Columns cleaned up to a known data type use it, and the data types of the remaining columns, e.g. "Comments", are inferred.
+
+    :param input_pints_df: Cleaned-up input pints data frame.
+    :return: Table.
+    """
+    column_name_2_type = {
+        "Date": _pa.timestamp("ns"),
+        "Location": _pa.dictionary(_pa.int32(), _pa.string()),
+        "Pint": _pa.dictionary(_pa.int32(), _pa.string()),
+        "Number": _pa.float64(),
+        "Cost (per pint)": _pa.float64(),
+        "Spend": _pa.float64(),
+        "company_list": _pa.list_(_pa.string()),
+    }
+    schema = _pa.Schema.from_pandas(input_pints_df, preserve_index=False)
+    schema = _pa.schema(
+        [(x.name, column_name_2_type.get(x.name, x.type)) for x in schema]
+    )
+    return _pa.Table.from_pandas(input_pints_df, schema=schema, preserve_index=False)
+
+
+def _get_pint_info_tables(pint_info: list[dict[str, _t.Any]]) -> dict[str, "_pa.Table"]:
+    """
+    Get the pint information as tables.
+
+    :param pint_info: Pint information.
+    :return: Mapping of table name to table.
+    """
+    return {
+        "pint_info": _pa.Table.from_pylist(pint_info, schema=_PINT_INFO_SCHEMA),
+    }
+
+
+def _get_pint_info(
+    read_table: _t.Callable[[str], "_pa.Table"],
+) -> list[dict[str, _t.Any]]:
+    """
+    Get the pint information from its tables.
+
+    :param read_table: Function which reads a table by name.
+    :return: Pint information.
+    """
+    return read_table("pint_info").to_pylist()
+
+
+def _get_location_info_tables(
+    location_info: dict[str, dict[str, _t.Any]],
+) -> dict[str, "_pa.Table"]:
+    """
+    Get the location information as tables.
+
+    :param location_info: Location information.
+    :return: Mapping of table name to table.
+    """
+    return {
+        "location_info": _pa.Table.from_pylist(
+            [
+                {
+                    "location": location,
+                    "number_of_visits": info["number_of_visits"],
+                    "number_of_pints": info["number_of_pints"],
+                    "number_of_pints_rank": info["number_of_pints_rank"],
+                    "coordinates": info["coordinates"],
+                }
+                for location, info in location_info.items()
+            ],
+            schema=_LOCATION_INFO_SCHEMA,
+        ),
+    }
+
+
+def _get_location_info(
+    read_table: _t.Callable[[str], "_pa.Table"],
+) -> dict[str, dict[str, _t.Any]]:
+    """
+    Get the location information from its tables.
+
+    :param read_table: Function which reads a table by name.
+    :return: Location information.
+    """
+    return {
+        info.pop("location"): info for info in read_table("location_info").to_pylist()
+    }
+
+
+def _get_friends_info_tables(
+    friends_info: dict[str, dict[str, _t.Any]],
+) -> dict[str, "_pa.Table"]:
+    """
+    Get the friends information as tables.
+
+    :param friends_info: Friends information.
+    :return: Mapping of table name to table.
+    """
+    return {
+        "friends_info": _pa.Table.from_pylist(
+            [
+                {
+                    "name": name,
+                    "pint_count": info["pint_count"],
+                    "pub_2_frequency": list(info["pub_2_frequency"].items()),
+                    "icon": info["icon"],
+                    "pint_count_rank": info["pint_count_rank"],
+                }
+                for name, info in friends_info.items()
+            ],
+            schema=_FRIENDS_INFO_SCHEMA,
+        ),
+    }
+
+
+def _get_friends_info(
+    read_table: _t.Callable[[str], "_pa.Table"],
+) -> dict[str, dict[str, _t.Any]]:
+    """
+    Get the friends information from its tables.
+
+    :param read_table: Function which reads a table by name.
+    :return: Friends information.
+    """
+    return {
+        info.pop("name"): {**info, "pub_2_frequency": dict(info["pub_2_frequency"])}
+        for info in read_table("friends_info").to_pylist()
+    }
+
+
+def _get_date_info_tables(date_info: dict[str, _t.Any]) -> dict[str, "_pa.Table"]:
+    """
+    Get the date information as tables, one per bucket and one per time series.
+    The compact time series of entries keeps each company as friend indices, with the friends in the schema's metadata.
+
+    :param date_info: Date information, with the compact time series of entries.
+    :return: Mapping of table name to table.
+    """
+    tables = {}
+    for date_col_name, output_str in _DATE_BUCKETS:
+        tables[f"date_info.{output_str}"] = _pa.Table.from_pylist(
+            date_info[output_str], schema=_get_bucket_schema(date_col_name)
+        )
+
+    entry_info = date_info["time_series_entry_info"]
+    if entry_info.get("schema_version") != _TIME_SERIES_ENTRY_INFO_SCHEMA_VERSION:
+        raise ValueError(
+            "Snapshots require the compact time series of entries, "
+            f"expected schema version {_TIME_SERIES_ENTRY_INFO_SCHEMA_VERSION}"
+        )
+    tables["date_info.time_series_entry_info"] = _pa.Table.from_pydict(
+        {
+            "date": [_dt.date.fromisoformat(x) for x in entry_info["_datetime_date_"]],
+            **{
+                x: entry_info[x]
+                for x in ("Number", "Pint", "cumulative_number", "company")
+            },
+        },
+        schema=_TIME_SERIES_ENTRY_INFO_SCHEMA.with_metadata(
+            {"friends": _json.dumps(entry_info["friends"])}
+        ),
+    )
+
+    tables["date_info.time_series_date_info"] = _pa.Table.from_pylist(
+        [
+            {"date": _dt.date.fromisoformat(date), **info}
+            for date, info in date_info["time_series_date_info"].items()
+        ],
+        schema=_TIME_SERIES_DATE_INFO_SCHEMA,
+    )
+
+    return tables
+
+
+def _get_date_info(read_table: _t.Callable[[str], "_pa.Table"]) -> dict[str, _t.Any]:
+    """
+    Get the date information from its tables.
+
+    :param read_table: Function which reads a table by name.
+    :return: Date information, with the compact time series of entries.
+    """
+    date_info = {}
+    for _, output_str in _DATE_BUCKETS:
+        date_info[output_str] = read_table(f"date_info.{output_str}").to_pylist()
+
+    entry_table = read_table("date_info.time_series_entry_info")
+    date_info["time_series_entry_info"] = {
+        "schema_version": _TIME_SERIES_ENTRY_INFO_SCHEMA_VERSION,
+        "friends": _json.loads(entry_table.schema.metadata[b"friends"]),
+        "_datetime_date_": [x.isoformat() for x in entry_table["date"].to_pylist()],
+        **{
+            x: entry_table[x].to_pylist()
+            for x in ("Number", "Pint", "cumulative_number", "company")
+        },
+    }
+
+    date_info["time_series_date_info"] = {
+        info.pop("date").isoformat(): info
+        for info in read_table("date_info.time_series_date_info").to_pylist()
+    }
+
+    return date_info
+
+
+def _get_bucket_schema(date_col_name: str) -> "_pa.Schema":
+    """
+    Get the schema of a date bucket's table.
+
+    :param date_col_name: Date bucket column name, e.g. "day".
+    :return: Schema.
+    """
+    return _pa.schema(
+        [
+            (date_col_name, _pa.string()),
+            ("number_of_pints", _pa.float64()),
+            ("most_popular_drink", _pa.string()),
+        ]
+    )
+
+
+# NOTE: Increment this whenever the files or their schemas change, so older snapshots are not read
+_SNAPSHOT_VERSION = 1
+_TIME_SERIES_ENTRY_INFO_SCHEMA_VERSION = 2
+_METADATA_FILE_NAME = "snapshot.json"
+_INPUT_FILE_NAME = "input.arrow"
+
+# Date buckets as (column name, output name), see `pints_data._DATE_BUCKETS`
+_DATE_BUCKETS = (
+    ("day", "pints_per_day_of_the_week"),
+    ("week", "pints_per_week_of_the_year"),
+    ("month", "pints_per_month_of_the_year"),
+)
+
+# Section name to the functions which convert the section to and from its tables
+_SECTION_2_CONVERTERS = {
+    "pint_info": (_get_pint_info_tables, _get_pint_info),
+    "location_info": (_get_location_info_tables, _get_location_info),
+    "date_info": (_get_date_info_tables, _get_date_info),
+    "friends_info": (_get_friends_info_tables, _get_friends_info),
+}
+
+if _pa is not None:
+    _PINT_INFO_SCHEMA = _pa.schema([("name", _pa.string()), ("count", _pa.float64())])
+    _LOCATION_INFO_SCHEMA = _pa.schema(
+        [
+            ("location", _pa.string()),
+            ("number_of_visits", _pa.int64()),
+            ("number_of_pints", _pa.float64()),
+            ("number_of_pints_rank", _pa.float64()),
+            # Longitude and latitude, or null if the location cannot be found
+            ("coordinates", _pa.list_(_pa.float64(), 2)),
+        ]
+    )
+    _FRIENDS_INFO_SCHEMA = _pa.schema(
+        [
+            ("name", _pa.string()),
+            ("pint_count", _pa.float64()),
+            ("pub_2_frequency", _pa.map_(_pa.string(), _pa.float64())),
+            ("icon", _pa.string()),
+            ("pint_count_rank", _pa.float64()),
+        ]
+    )
+    _TIME_SERIES_ENTRY_INFO_SCHEMA = _pa.schema(
+        [
+            ("date", _pa.date32()),
+            ("Number", _pa.float64()),
+            ("Pint", _pa.string()),
+            ("cumulative_number", _pa.float64()),
+            # Indices into the friends in the schema's metadata
+            ("company", _pa.list_(_pa.int32())),
+        ]
+    )
+    _TIME_SERIES_DATE_INFO_SCHEMA = _pa.schema(
+        [
+            ("date", _pa.date32()),
+            ("Number", _pa.float64()),
+            ("cumulative_number", _pa.float64()),
+            ("company", _pa.list_(_pa.string())),
+        ]
+    )
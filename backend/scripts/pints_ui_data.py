@@ -0,0 +1,153 @@
+import gzip as _gz
+import hashlib as _hl
+import json as _json
+import pathlib as _pth
+import typing as _t
+
+try:
+    import brotli as _br
+except ImportError:
+    _br = None
+
+#
+# NOTE: The UI fetches the manifest first, then each section as it is needed, e.g. the leaderboard before the large time series.
+#       Each section's URL includes its content hash, so sections can be cached for as long as their content is unchanged.
+#       The ".gz" and ".br" siblings are for servers which serve precompressed files, e.g. nginx's "gzip_static" and "brotli_static".
+#
+
+
+def write_pints_ui_data(
+    output_dir: _t.Union[str, _pth.Path],
+    output_file_name: str,
+    pints_info: dict[str, _t.Any],
+) -> dict[str, _t.Any]:
+    """
+    Write the pints information as one compact JSON file per section, each with precompressed siblings, and a manifest of the sections.
+    Sections are written to "{output_dir}/{output_file_name}/", and the manifest to "{output_dir}/{output_file_name}.manifest.json".
+
+    :param output_dir: Output directory.
+    :param output_file_name: Output file name, without the extension.
+    :param pints_info: Pints information, see `pints_data.compute_pints_data`.
+    :return: Manifest.
+    """
+    output_dir = _pth.Path(output_dir)
+    sections_dir = output_dir / output_file_name
+    sections_dir.mkdir(parents=True, exist_ok=True)
+
+    section_name_2_info = {}
+    for section_name, section in _get_sections(pints_info):
+        content = get_compact_json(section).encode("utf-8")
+        file_path = sections_dir / f"{section_name}.json"
+        _write_file(file_path, content)
+        _write_file(
+            file_path.with_name(f"{file_path.name}.gz"),
+            _gz.compress(content, compresslevel=9, mtime=0),
+        )
+        if _br is not None:
+            _write_file(
+                file_path.with_name(f"{file_path.name}.br"),
+                _br.compress(content, quality=11),
+            )
+
+        section_name_2_info[section_name] = {
+            "path": file_path.relative_to(output_dir).as_posix(),
+            "hash": _hl.sha256(content).hexdigest(),
+            "size": len(content),
+        }
+
+    if _br is None:
+        print(
+            'brotli is not installed, skipping the .br files, install the "ui-data" extra to write them'
+        )
+
+    # NOTE: The manifest is written last, so it never refers to sections which have not been written
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "total_pint_count": pints_info["total_pint_count"],
+        "sections": section_name_2_info,
+    }
+    _write_file(
+        output_dir / f"{output_file_name}.manifest.json",
+        get_compact_json(manifest).encode("utf-8"),
+    )
+
+    return manifest
+
+
+def read_pints_ui_data_section(
+    output_dir: _t.Union[str, _pth.Path], output_file_name: str, section_name: str
+) -> _t.Optional[_t.Any]:
+    """
+    Read a section of the pints information written by `write_pints_ui_data`.
+
+    :param output_dir: Output directory.
+    :param output_file_name: Output file name, without the extension.
+    :param section_name: Section name, e.g. "location_info".
+    :return: Section, or None if there is no manifest of the current version or it has no such section.
+    """
+    output_dir = _pth.Path(output_dir)
+    manifest_file_path = output_dir / f"{output_file_name}.manifest.json"
+    if not manifest_file_path.exists():
+        return None
+
+    with open(manifest_file_path, mode="r", encoding="utf-8") as file:
+        manifest = _json.load(file)
+
+    if manifest.get("version") != _MANIFEST_VERSION:
+        return None
+    section_info = manifest["sections"].get(section_name)
+    if section_info is None:
+        return None
+
+    with open(output_dir / section_info["path"], mode="r", encoding="utf-8") as file:
+        return _json.load(file)
+
+
+def get_compact_json(data: _t.Any) -> str:
+    """
+    Get data as JSON without any whitespace.
+
+    :param data: Data.
+    :return: JSON.
+    """
+    return _json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+def _get_sections(pints_info: dict[str, _t.Any]) -> _t.Iterator[tuple[str, _t.Any]]:
+    """
+    Get the sections of the pints information, splitting large sections into their parts, e.g. "date_info.time_series_entry_info".
+
+    :param pints_info: Pints information.
+    :return: Section names and sections.
+    """
+    for key, value in pints_info.items():
+        if key == "total_pint_count":
+            continue
+        if key in _SPLIT_SECTION_NAMES:
+            for sub_key, sub_value in value.items():
+                yield f"{key}.{sub_key}", sub_value
+        else:
+            yield key, value
+
+
+def _write_file(file_path: _pth.Path, content: bytes) -> None:
+    """
+    Write a file, unless it already has the content, so unchanged files keep their modification time for HTTP caching.
+
+    :param file_path: File path.
+    :param content: Content.
+    """
+    if file_path.exists() and file_path.read_bytes() == content:
+        return
+    file_path.write_bytes(content)
+
+
+# NOTE: Increment this whenever the manifest's form changes
+_MANIFEST_VERSION = 1
+# Sections which are written as one file per part, so each part can be fetched on its own
+_SPLIT_SECTION_NAMES = ("date_info",)
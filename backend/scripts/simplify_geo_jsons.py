@@ -0,0 +1,176 @@
+import argparse as _ap
+import json as _json
+import numpy as _np
+import pathlib as _pth
+import shapely as _sh
+import shapely.geometry as _shg
+import typing as _t
+
+#
+# NOTE: Boroughs share their borders, so simplifying each borough on its own leaves gaps and overlaps between neighbours.
+#       Instead, every border is split into arcs which are shared by at most two boroughs, the arcs are simplified together, and the boroughs
+#       are rebuilt from the simplified arcs, so neighbours still meet exactly.
+#
+
+
+def write_simplified_geo_jsons(
+    input_dir: _t.Union[str, _pth.Path, None] = None,
+    output_dir: _t.Union[str, _pth.Path, None] = None,
+    level_name_2_tolerance: _t.Optional[dict[str, float]] = None,
+    decimals: int = 5,
+) -> list[dict[str, _t.Any]]:
+    """
+    Write a simplified copy of every "*.geo.json" file in a directory for each level of detail, to "{output_dir}/{level_name}/".
+    Simplification preserves topology, including the borders shared between files, and coordinates are rounded to a number of decimals.
+
+    :param input_dir: GEO JSONs directory, defaults to None which uses "ui/data/geo-jsons"
+    :param output_dir: Output directory, defaults to None which uses "ui/data/geo-jsons-simplified"
+    :param level_name_2_tolerance: Mapping of level name to its simplification tolerance in degrees, defaults to None which uses
+                                   `_LEVEL_NAME_2_TOLERANCE`
+    :param decimals: Number of decimals coordinates are rounded to, defaults to 5, i.e. about a metre
+    :return: Report of the size and vertex count of each file at each level, see `print_report`.
+    """
+    input_dir = _pth.Path(input_dir or _UI_GEO_JSONS_DIR)
+    output_dir = _pth.Path(output_dir or _UI_SIMPLIFIED_GEO_JSONS_DIR)
+    level_name_2_tolerance = level_name_2_tolerance or _LEVEL_NAME_2_TOLERANCE
+
+    file_paths = sorted(input_dir.glob("*.geo.json"))
+    geo_dicts = [_json.loads(x.read_text(encoding="utf-8")) for x in file_paths]
+    geometries = _np.array([_shg.shape(x["geometry"]) for x in geo_dicts])
+
+    report = [
+        {
+            "level": "original",
+            "tolerance": None,
+            "file_name": x.name,
+            "size": x.stat().st_size,
+            "vertex_count": int(_sh.get_num_coordinates(y)),
+        }
+        for x, y in zip(file_paths, geometries)
+    ]
+
+    for level_name, tolerance in level_name_2_tolerance.items():
+        level_dir = output_dir / level_name
+        level_dir.mkdir(parents=True, exist_ok=True)
+
+        simplified_geometries = _get_simplified_geometries(
+            geometries, tolerance, decimals
+        )
+        for file_path, geo_dict, geometry in zip(
+            file_paths, geo_dicts, simplified_geometries
+        ):
+            content = _json.dumps(
+                {**geo_dict, "geometry": _shg.mapping(geometry)},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            (level_dir / file_path.name).write_bytes(content)
+            report.append(
+                {
+                    "level": level_name,
+                    "tolerance": tolerance,
+                    "file_name": file_path.name,
+                    "size": len(content),
+                    "vertex_count": int(_sh.get_num_coordinates(geometry)),
+                }
+            )
+
+    with open(output_dir / "report.json", mode="w", encoding="utf-8") as file:
+        _json.dump(report, file, indent=2)
+
+    return report
+
+
+def print_report(report: list[dict[str, _t.Any]]) -> None:
+    """
+    Print the total size and vertex count of each level, relative to the original files.
+
+    :param report: Report, see `write_simplified_geo_jsons`.
+    """
+    level_name_2_totals = {}
+    for row in report:
+        totals = level_name_2_totals.setdefault(row["level"], [0, 0])
+        totals[0] += row["size"]
+        totals[1] += row["vertex_count"]
+
+    original_size, original_vertex_count = level_name_2_totals["original"]
+    print(f"{'level':<12}{'bytes':>12}{'%':>8}{'vertices':>12}{'%':>8}")
+    for level_name, (size, vertex_count) in level_name_2_totals.items():
+        print(
+            f"{level_name:<12}{size:>12}{100 * size / original_size:>8.1f}"
+            f"{vertex_count:>12}{100 * vertex_count / original_vertex_count:>8.1f}"
+        )
+
+
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+def _get_simplified_geometries(
+    geometries: _np.ndarray, tolerance: float, decimals: int
+) -> list[_t.Any]:
+    """
+    Simplify geometries which share borders, so that neighbours still meet exactly.
+
+    :param geometries: Polygonal geometries.
+    :param tolerance: Simplification tolerance, in the geometries' units.
+    :param decimals: Number of decimals coordinates are rounded to.
+    :return: Simplified geometry of each geometry.
+    """
+    # Node the borders, so each arc ends wherever the boroughs sharing it change, then simplify every arc together so they cannot cross
+    arcs = _sh.line_merge(_sh.union_all(_sh.boundary(geometries)))
+    arcs = _sh.simplify(arcs, tolerance, preserve_topology=True)
+    arcs = _sh.set_precision(arcs, 10**-decimals)
+
+    # Each face of the simplified arcs belongs to the geometry it overlaps most
+    faces = _sh.get_parts(_sh.polygonize(_sh.get_parts(arcs)))
+    geometry_index_2_faces = [[] for _ in geometries]
+    tree = _sh.STRtree(geometries)
+    for face in faces:
+        indices = tree.query(face)
+        if not len(indices):
+            continue
+        areas = _sh.area(_sh.intersection(face, geometries[indices]))
+        if areas.max() > 0:
+            geometry_index_2_faces[indices[areas.argmax()]].append(face)
+
+    return [
+        _sh.transform(
+            _sh.union_all(x, grid_size=10**-decimals),
+            lambda y: _np.round(y, decimals),
+        )
+        for x in geometry_index_2_faces
+    ]
+
+
+_ROOT_DIR = _pth.Path(__file__).resolve().parents[2]
+_UI_GEO_JSONS_DIR = _ROOT_DIR / "ui" / "data" / "geo-jsons"
+_UI_SIMPLIFIED_GEO_JSONS_DIR = _ROOT_DIR / "ui" / "data" / "geo-jsons-simplified"
+# Tolerances in degrees, named after the lowest map zoom level each is fine enough for, e.g. 0.0005 degrees is about 35m, or a few pixels at zoom 11
+_LEVEL_NAME_2_TOLERANCE = {
+    "z10": 0.0005,
+    "z12": 0.0002,
+    "z14": 0.00005,
+}
+
+
+if __name__ == "__main__":
+    parser = _ap.ArgumentParser(
+        description="Write topology-preserving simplified copies of the borough GEO JSONs for the map."
+    )
+    parser.add_argument("--input-dir", help="GEO JSONs directory.")
+    parser.add_argument("--output-dir", help="Output directory.")
+    parser.add_argument(
+        "--decimals",
+        type=int,
+        default=5,
+        help="Number of decimals coordinates are rounded to.",
+    )
+    args = parser.parse_args()
+
+    print_report(
+        write_simplified_geo_jsons(
+            args.input_dir, args.output_dir, decimals=args.decimals
+        )
+    )
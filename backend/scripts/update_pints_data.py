@@ -1,33 +1,205 @@
+import argparse as _ap
+import hashlib as _hl
 import json as _json
+import pandas as _pd
 import pints_input_data_clean_up as _idc
 import pints_input_data_service as _ids
 import pints_data as _pi
+import pints_snapshot as _ps
+import pints_ui_data as _pui
 import pathlib as _pth
+import typing as _t
 
 
-def update_pints_data(output_file_name: str) -> None:
+def update_pints_data(
+    output_file_name: str,
+    incremental: bool = False,
+    snapshot_dir: _t.Union[str, _pth.Path, None] = None,
+) -> None:
+    """
+    Update the pints information file using the latest input data.
+    A checkpoint of the processed rows and their aggregates is written alongside the file. In incremental mode, rows appended since the checkpoint
+    are merged into its aggregates, and everything is only recomputed if a processed row has been edited or removed.
+
+    :param output_file_name: Output file name, without the extension.
+    :param incremental: Flag which determines whether only rows appended since the checkpoint are processed, defaults to False
+    :param snapshot_dir: Directory of a snapshot of the cleaned-up input data and pints information to write, see `pints_snapshot`, defaults to None
+                         which writes no snapshot
+    """
     # TODO Change from (incorrectly) directly writing to the "ui" package and use a symlink instead
-    output_file_path = _pth.Path(f"./ui/data/{output_file_name}.json")
-    with open(output_file_path, mode="r", encoding="utf-8") as file:
-        existing_pints_info = _json.load(file)
+    output_dir = _pth.Path("./ui/data")
+    checkpoint_file_path = output_dir / f"{output_file_name}.checkpoint.json"
+    existing_location_info = _pui.read_pints_ui_data_section(
+        output_dir, output_file_name, "location_info"
+    )
 
     # Cache already visited locations from the existing information to avoid unnecessary extra calls to the Google Maps API
     visited_locations_2_coordinates = {
-        k: v["coordinates"] for k, v in existing_pints_info["location_info"].items()
+        k: v["coordinates"] for k, v in (existing_location_info or {}).items()
     }
 
-    # Load and clean the data
-    input_pints_df = _ids.get_pints_input_data()
-    input_pints_df = _idc.clean_up_input_pints_data(input_pints_df)
+    # Load the data, and find the rows which have not been processed
+    raw_pints_df = _ids.get_pints_input_data()
+    checkpoint = _load_checkpoint(checkpoint_file_path) if incremental else None
+    if checkpoint is not None and not _is_processed(raw_pints_df, checkpoint):
+        print("Processed rows have been edited, recomputing everything...")
+        checkpoint = None
+
+    if checkpoint is None:
+        new_raw_pints_df = raw_pints_df
+    else:
+        new_raw_pints_df = raw_pints_df.iloc[checkpoint["row_count"] :]
+        if new_raw_pints_df.empty:
+            print("No new rows, nothing to update")
+            return
+        print(f"Processing {len(new_raw_pints_df)} new rows...")
+
+    # Clean and aggregate the new data, merging it into the checkpoint's aggregates
+    input_pints_df = _idc.clean_up_input_pints_data(new_raw_pints_df)
+    aggregates = _pi.compute_pints_aggregates(input_pints_df)
+    if checkpoint is not None:
+        aggregates = _pi.merge_pints_aggregates(checkpoint["aggregates"], aggregates)
+
+    # Create updated pints information and write it as one file per section, which the UI loads
+    pints_info = _pi.compute_pints_data_from_aggregates(
+        aggregates,
+        visited_locations_2_coordinates=visited_locations_2_coordinates,
+        compact=True,
+    )
+    _pui.write_pints_ui_data(output_dir, output_file_name, pints_info)
+
+    if snapshot_dir is not None:
+        _ps.write_pints_snapshot(
+            snapshot_dir,
+            _get_snapshot_input_pints_df(
+                snapshot_dir, raw_pints_df, input_pints_df, checkpoint
+            ),
+            pints_info,
+            row_count=len(raw_pints_df),
+        )
+
+    # NOTE: The checkpoint is written last, so an interrupted update is processed again
+    with open(checkpoint_file_path, mode="w", encoding="utf-8") as file:
+        _json.dump(
+            {
+                "version": _CHECKPOINT_VERSION,
+                "row_count": len(raw_pints_df),
+                "content_hash": _get_content_hash(raw_pints_df),
+                "aggregates": aggregates,
+            },
+            file,
+        )
+
 
-    # Create updated pints information and write to output file
-    pints_info = _pi.compute_pints_data(
-        input_pints_df, visited_locations_2_coordinates=visited_locations_2_coordinates
+# ==============================================================================
+# Private helpers
+# ==============================================================================
+
+
+def _load_checkpoint(checkpoint_file_path: _pth.Path) -> _t.Optional[dict[str, _t.Any]]:
+    """
+    Load a checkpoint.
+
+    :param checkpoint_file_path: Checkpoint file path.
+    :return: Checkpoint, or None if there is no checkpoint of the current version.
+    """
+    if not checkpoint_file_path.exists():
+        return None
+
+    with open(checkpoint_file_path, mode="r", encoding="utf-8") as file:
+        checkpoint = _json.load(file)
+
+    if checkpoint.get("version") != _CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+
+def _is_processed(raw_pints_df: _pd.DataFrame, checkpoint: dict[str, _t.Any]) -> bool:
+    """
+    Check whether the rows processed at the checkpoint are unchanged, i.e. any other rows have only been appended.
+
+    :param raw_pints_df: Raw pints input data frame.
+    :param checkpoint: Checkpoint.
+    :return: Flag which determines whether the processed rows are unchanged.
+    """
+    row_count = checkpoint["row_count"]
+    return (
+        len(raw_pints_df) >= row_count
+        and _get_content_hash(raw_pints_df.iloc[:row_count])
+        == checkpoint["content_hash"]
     )
-    with open(output_file_path, mode="w", encoding="utf-8") as file:
-        _json.dump(pints_info, file)
+
+
+def _get_snapshot_input_pints_df(
+    snapshot_dir: _t.Union[str, _pth.Path],
+    raw_pints_df: _pd.DataFrame,
+    new_input_pints_df: _pd.DataFrame,
+    checkpoint: _t.Optional[dict[str, _t.Any]],
+) -> _pd.DataFrame:
+    """
+    Get the cleaned-up input data of every row, reusing the existing snapshot's cleaned-up rows rather than cleaning them up again where possible.
+
+    :param snapshot_dir: Snapshot directory.
+    :param raw_pints_df: Raw pints input data frame.
+    :param new_input_pints_df: Cleaned-up input pints data frame of the rows appended since the checkpoint.
+    :param checkpoint: Checkpoint, or None if every row has been processed.
+    :return: Cleaned-up input pints data frame.
+    """
+    if checkpoint is None:
+        return new_input_pints_df
+
+    metadata = _ps.read_pints_snapshot_metadata(snapshot_dir)
+    if metadata is not None and metadata["row_count"] == checkpoint["row_count"]:
+        processed_input_pints_df = _ps.read_pints_snapshot_input(snapshot_dir)
+    else:
+        processed_input_pints_df = _idc.clean_up_input_pints_data(
+            raw_pints_df.iloc[: checkpoint["row_count"]]
+        )
+
+    input_pints_df = _pd.concat(
+        [processed_input_pints_df, new_input_pints_df], ignore_index=True
+    )
+
+    # Concatenating categoricals with different categories gives objects, so they are made categorical again
+    for column_name, dtype in new_input_pints_df.dtypes.items():
+        if isinstance(dtype, _pd.CategoricalDtype):
+            input_pints_df[column_name] = input_pints_df[column_name].astype("category")
+
+    return input_pints_df
+
+
+def _get_content_hash(raw_pints_df: _pd.DataFrame) -> str:
+    """
+    Get a hash of the columns and contents of the rows.
+
+    :param raw_pints_df: Raw pints input data frame.
+    :return: Hexadecimal hash.
+    """
+    content_hash = _hl.sha256(_json.dumps(list(raw_pints_df.columns)).encode())
+    content_hash.update(
+        _pd.util.hash_pandas_object(raw_pints_df, index=False).to_numpy().tobytes()
+    )
+    return content_hash.hexdigest()
+
+
+# NOTE: Increment this whenever the aggregates or the input data types change, so older checkpoints are recomputed
+_CHECKPOINT_VERSION = 3
 
 
 if __name__ == "__main__":
+    parser = _ap.ArgumentParser(description="Update the pints information file.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process rows appended since the last update.",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        help="Directory to write a memory-mappable snapshot of the cleaned-up input data and pints information to.",
+    )
+    args = parser.parse_args()
+
     output_file_name = "pints_info"
-    update_pints_data(output_file_name)
+    update_pints_data(
+        output_file_name, incremental=args.incremental, snapshot_dir=args.snapshot_dir
+    )
@@ -0,0 +1,53 @@
+import asyncio as _aio
+import datetime as _dt
+import logging as _lg
+import pytest as _pytest
+
+
+def test_stop_after_drain_task_failed_with_full_queue(
+    caplog: _pytest.LogCaptureFixture,
+) -> None:
+    """
+    Stopping a queue whose background task has failed, leaving the queue full, returns rather than waiting for room for the stop marker.
+    The task's error is logged, and the records it has not written are marked as failed.
+    """
+    import ingestion as _ing
+    import schemas as _sch
+
+    record_create = _sch.RecordCreate(
+        date=_dt.date(2025, 1, 3),
+        location="The Pub",
+        number=1.0,
+        friend_names=["Alice"],
+        comment=None,
+        pint_brand=None,
+        pint_cost=None,
+    )
+
+    async def run() -> list[str]:
+        ingestion_queue = _ing.RecordIngestionQueue(
+            repository_factory=None, stats_cache=None, max_size=2
+        )
+
+        async def write(_: list) -> None:
+            raise RuntimeError("Failed to write")
+
+        # NOTE: Writing is replaced on the instance, as errors writing records are otherwise caught and only fail those records
+        ingestion_queue._RecordIngestionQueue__write = write
+        ingestion_queue.start()
+        ingestion_queue.submit(record_create, "first")
+        await _aio.sleep(0)
+        ingestion_queue.submit(record_create, "second")
+        ingestion_queue.submit(record_create, "third")
+
+        await _aio.wait_for(ingestion_queue.stop(), timeout=5)
+        return [
+            ingestion_queue.get_status(x).status for x in ("first", "second", "third")
+        ]
+
+    with caplog.at_level(_lg.ERROR, logger="ingestion"):
+        statuses = _aio.run(run())
+
+    assert statuses == ["failed", "failed", "failed"]
+    assert "3 accepted records were not written" in caplog.text
+    assert "Failed to write" in caplog.text
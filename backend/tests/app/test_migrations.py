@@ -0,0 +1,121 @@
+import pathlib as _pth
+import sqlalchemy as _s
+
+
+def test_migrate_fills_summary_tables_of_existing_database(tmp_path: _pth.Path) -> None:
+    """
+    Migrating a database created before the summary tables existed fills them, and recomputes friend pint counts, from its pint records.
+    """
+    import database as _db
+    import migrations as _mig
+    import models  # noqa: F401, registers the tables on the metadata
+
+    engine = _s.create_engine(f"sqlite:///{tmp_path / 'existing.db'}")
+    with engine.begin() as conn:
+        for statement in _UNMIGRATED_SCHEMA_STATEMENTS:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(
+            """
+            INSERT INTO pint_record (id_, total_cost, comment, date, location, number, pint_brand, pint_cost) VALUES
+                (1, 10.0, NULL, '03/01/2025', 'The Pub', 2.0, 'Guinness', 5.0),
+                (2, NULL, NULL, '2025-01-04', 'The Pub', 1.0, NULL, NULL),
+                (3, 6.0, NULL, '2025-01-05', 'The Bar', 1.0, 'Guinness', 6.0)
+            """
+        )
+        # Friend pint counts which are out of date, as they could be before they were incremented in the database
+        conn.exec_driver_sql(
+            "INSERT INTO friend (name, total_pint_count) VALUES ('Alice', 1.0), ('Bob', 0.0)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO friend_pint_record (pint_record_id, friend_name) VALUES (1, 'Alice'), (2, 'Alice'), (3, 'Bob')"
+        )
+
+    with engine.begin() as conn:
+        _mig.migrate(conn, _db.Base.metadata)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA user_version").scalar_one() == len(
+            _mig._MIGRATIONS
+        )
+        assert conn.exec_driver_sql(
+            "SELECT DISTINCT date FROM pint_record ORDER BY date"
+        ).scalars().all() == ["2025-01-03", "2025-01-04", "2025-01-05"]
+        assert _get_rows(conn, "friend") == {("Alice", 3.0), ("Bob", 1.0)}
+        assert _get_rows(conn, "location_summary") == {
+            ("The Bar", 1, 1.0),
+            ("The Pub", 2, 3.0),
+        }
+        assert _get_rows(conn, "friend_location_summary") == {
+            ("Alice", "The Pub", 3.0),
+            ("Bob", "The Bar", 1.0),
+        }
+        assert _get_rows(conn, "brand_summary") == {("Guinness", 3.0)}
+
+    engine.dispose()
+
+
+def test_migrate_marks_new_database_as_migrated(tmp_path: _pth.Path) -> None:
+    """
+    A new database is created from the models, so no migration is applied to it.
+    """
+    import database as _db
+    import migrations as _mig
+    import models  # noqa: F401, registers the tables on the metadata
+
+    engine = _s.create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    with engine.begin() as conn:
+        _mig.migrate(conn, _db.Base.metadata)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA user_version").scalar_one() == len(
+            _mig._MIGRATIONS
+        )
+        assert _get_rows(conn, "location_summary") == set()
+
+    engine.dispose()
+
+
+def _get_rows(conn: _s.Connection, table_name: str) -> set[tuple]:
+    """
+    Get every row of a table.
+
+    :param conn: Database connection.
+    :param table_name: Table name.
+    :return: Rows.
+    """
+    return {tuple(x) for x in conn.exec_driver_sql(f"SELECT * FROM {table_name}")}
+
+
+# Schema of a database created before any migration, i.e. before the summary tables and indexes existed
+_UNMIGRATED_SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE friend (
+        name VARCHAR NOT NULL,
+        total_pint_count FLOAT,
+        PRIMARY KEY (name)
+    )
+    """,
+    "CREATE INDEX ix_friend_name ON friend (name)",
+    """
+    CREATE TABLE pint_record (
+        id_ INTEGER,
+        total_cost FLOAT,
+        comment VARCHAR,
+        date VARCHAR NOT NULL,
+        location VARCHAR NOT NULL,
+        number FLOAT NOT NULL,
+        pint_brand VARCHAR,
+        pint_cost FLOAT,
+        PRIMARY KEY (id_)
+    )
+    """,
+    """
+    CREATE TABLE friend_pint_record (
+        pint_record_id INTEGER NOT NULL,
+        friend_name VARCHAR NOT NULL,
+        PRIMARY KEY (pint_record_id, friend_name),
+        FOREIGN KEY(pint_record_id) REFERENCES pint_record (id_),
+        FOREIGN KEY(friend_name) REFERENCES friend (name)
+    )
+    """,
+)
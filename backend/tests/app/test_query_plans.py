@@ -0,0 +1,133 @@
+import asyncio as _aio
+import datetime as _dt
+import pytest as _pytest
+import re as _re
+import sqlalchemy as _s
+import typing as _t
+
+#
+# NOTE: The statements each repository method runs are captured as they are sent to SQLite, so the plans checked are of the exact queries
+#       the application runs, rather than of copies of them.
+#
+
+
+@_pytest.mark.usefixtures("empty_database")
+@_pytest.mark.parametrize(
+    ("get_rows", "index_name"),
+    [
+        _pytest.param(
+            lambda r, s: r.get_friend_stats(s.LeaderboardPage(limit=10), 3),
+            "ix_friend_total_pint_count",
+            id="friend-stats",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_location_stats(s.LeaderboardPage(limit=10)),
+            "ix_location_summary_number_of_pints",
+            id="location-stats",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_brand_stats(),
+            "ix_brand_summary_number_of_pints",
+            id="brand-stats",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_time_series(
+                "day", s.RecordFilter(date_from=_dt.date(2025, 1, 1))
+            ),
+            "ix_pint_record_date",
+            id="time-series",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_record_dicts(
+                s.RecordFilter(date_from=_dt.date(2025, 1, 1))
+            ),
+            "ix_pint_record_date",
+            id="records-date-from",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_record_dicts(
+                s.RecordFilter(date_to=_dt.date(2025, 1, 1))
+            ),
+            "ix_pint_record_date",
+            id="records-date-to",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_record_dicts(s.RecordFilter(location="The Pub")),
+            "ix_pint_record_location",
+            id="records-location",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_record_dicts(s.RecordFilter(pint_brand="Guinness")),
+            "ix_pint_record_pint_brand",
+            id="records-pint-brand",
+        ),
+        _pytest.param(
+            lambda r, s: r.get_record_dicts(s.RecordFilter(friend_name="Alice")),
+            "ix_friend_pint_record_friend_name",
+            id="records-friend-name",
+        ),
+    ],
+)
+def test_query_uses_index(
+    get_rows: _t.Callable[[_t.Any, _t.Any], _t.Awaitable[_t.Any]], index_name: str
+) -> None:
+    """
+    Stats and filtered records queries are answered using their index, rather than a full scan of the pint records.
+
+    :param get_rows: Coroutine function getting rows from a SQL repository, given the repository and the `schemas` module.
+    :param index_name: Name of the index the query must use.
+    """
+    plan_details = _aio.run(_get_plan_details(get_rows))
+
+    assert any(index_name in x for x in plan_details), plan_details
+    assert not any(_FULL_SCAN_PATTERN.match(x) for x in plan_details), plan_details
+
+
+async def _get_plan_details(
+    get_rows: _t.Callable[[_t.Any, _t.Any], _t.Awaitable[_t.Any]],
+) -> list[str]:
+    """
+    Get the query plan details of every query a repository method runs, in the migrated temporary database.
+
+    :param get_rows: Coroutine function getting rows from a SQL repository.
+    :return: Query plan details, one per step.
+    """
+    import database as _db
+    import main as _main
+    import repositories.sql as _rs
+    import schemas as _sch
+
+    statements_and_parameters = []
+
+    def capture(
+        conn: _t.Any,
+        cursor: _t.Any,
+        statement: str,
+        parameters: _t.Any,
+        context: _t.Any,
+        executemany: bool,
+    ) -> None:
+        statements_and_parameters.append((statement, parameters))
+
+    async with _db.lifespan(_main.app):
+        _s.event.listen(_db.Engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            async with _db.AsyncSessionLocal() as session:
+                await get_rows(_rs.SQLRepository(session=session), _sch)
+        finally:
+            _s.event.remove(_db.Engine.sync_engine, "before_cursor_execute", capture)
+
+        assert statements_and_parameters
+        plan_details = []
+        async with _db.Engine.connect() as conn:
+            for statement, parameters in statements_and_parameters:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+                plan_details.extend(x.detail for x in result)
+
+    return plan_details
+
+
+# A scan of the pint record table which uses no index, e.g. "SCAN pint_record" but not "SCAN pint_record USING INDEX ..."
+_FULL_SCAN_PATTERN = _re.compile(r"^SCAN pint_record(?! USING)")
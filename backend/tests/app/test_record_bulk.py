@@ -0,0 +1,197 @@
+import pytest as _pytest
+import typing as _t
+
+
+@_pytest.mark.usefixtures("empty_database")
+@_pytest.mark.parametrize("is_bulk", [False, True], ids=["one-by-one", "bulk"])
+def test_bulk_create_updates_tables_like_single_creates(
+    run_with_client: _t.Callable, is_bulk: bool
+) -> None:
+    """
+    Creating records in bulk, including records with duplicate friend names, writes the same friend pint counts, summaries and friend pint
+    records as creating them one by one.
+
+    :param is_bulk: Flag which determines whether the records are created in bulk.
+    """
+
+    async def use_client(client: _t.Any) -> dict[str, list[tuple]]:
+        if is_bulk:
+            response = await client.post("/api/records/bulk", json=_RECORDS)
+            assert response.status_code == 201, response.text
+            assert response.json() == {"number_of_records": len(_RECORDS)}
+        else:
+            for record in _RECORDS:
+                response = await client.post("/api/records/", json=record)
+                assert response.status_code == 201, response.text
+        return await _get_table_name_2_rows()
+
+    table_name_2_rows = run_with_client(use_client)
+
+    assert table_name_2_rows == {
+        "friend": [("Al", 3.5), ("Bo", 3.0), ("Cy", 1.5)],
+        "location_summary": [("The Bar", 1, 1.5), ("The Pub", 3, 3.5)],
+        "friend_location_summary": [
+            ("Al", "The Bar", 1.5),
+            ("Al", "The Pub", 2.0),
+            ("Bo", "The Pub", 3.0),
+            ("Cy", "The Bar", 1.5),
+        ],
+        "brand_summary": [("Guinness", 2.5), ("Hop", 1.0)],
+        "friend_pint_record": [(0, "Al"), (0, "Bo"), (1, "Bo"), (2, "Al"), (2, "Cy")],
+        "summary_mismatch_counts": [],
+    }
+
+
+@_pytest.mark.usefixtures("repository_name")
+def test_failing_bulk_create_rolls_back(
+    monkeypatch: _pytest.MonkeyPatch, run_with_client: _t.Callable
+) -> None:
+    """
+    A record failing to be written rolls back every record of the batch, including their friend pint counts and summaries, and leaves the
+    stats entity tag unchanged.
+    """
+    import repositories.memory as _rm
+    import repositories.sql as _rs
+
+    for repository_type in (_rs.SQLRepository, _rm.InMemoryRepository):
+        monkeypatch.setattr(
+            repository_type,
+            "create_friend_pint_records",
+            _get_failing(repository_type.create_friend_pint_records),
+        )
+
+    async def use_client(client: _t.Any) -> list[_t.Any]:
+        response = await client.post("/api/records/", json=_RECORDS[0])
+        assert response.status_code == 201, response.text
+        url_2_response = await _get_url_2_response(client)
+
+        with _pytest.raises(RuntimeError, match="Failed to write"):
+            await client.post(
+                "/api/records/bulk",
+                json=[*_RECORDS, _get_record("The Pub", 1.0, ["Fails"], "Hop")],
+            )
+
+        return [url_2_response, await _get_url_2_response(client)]
+
+    url_2_response, rolled_back_url_2_response = run_with_client(use_client)
+
+    assert rolled_back_url_2_response == url_2_response
+    assert len(url_2_response["/api/records/"]) == 1
+
+
+async def _get_table_name_2_rows() -> dict[str, list[tuple]]:
+    """
+    Get the rows of the friend and summary tables, and of the friend pint record table with pint record IDs counted from 0, in order.
+    Summary mismatch counts which are not zero, i.e. summaries which do not match the pint records, are included.
+
+    :return: Mapping of table name to rows.
+    """
+    import database as _db
+    import models as _m
+    import repositories.sql as _rs
+    import sqlalchemy as _s
+
+    table_name_2_rows = {}
+    async with _db.Engine.connect() as conn:
+        for model in (
+            _m.Friend,
+            _m.LocationSummary,
+            _m.FriendLocationSummary,
+            _m.BrandSummary,
+        ):
+            table = model.__table__
+            results = await conn.execute(
+                _s.select(table).order_by(*table.primary_key.columns)
+            )
+            table_name_2_rows[table.name] = [tuple(x) for x in results.all()]
+
+        first_id = _s.select(_s.func.min(_m.PintRecord.id_)).scalar_subquery()
+        results = await conn.execute(
+            _s.select(
+                _m.FriendPintRecord.pint_record_id - first_id,
+                _m.FriendPintRecord.friend_name,
+            ).order_by(
+                _m.FriendPintRecord.pint_record_id, _m.FriendPintRecord.friend_name
+            )
+        )
+        table_name_2_rows["friend_pint_record"] = [tuple(x) for x in results.all()]
+
+    async with _db.AsyncSessionLocal() as session:
+        mismatch_counts = await _rs.SQLRepository(session).get_summary_mismatch_counts()
+    table_name_2_rows["summary_mismatch_counts"] = [
+        (k, v) for k, v in mismatch_counts.items() if v
+    ]
+    return table_name_2_rows
+
+
+async def _get_url_2_response(client: _t.Any) -> dict[str, _t.Any]:
+    """
+    Get the records and stats, and the stats entity tag.
+
+    :param client: Client of the application.
+    :return: Mapping of URL to response content, and of "ETag" to the entity tag.
+    """
+    url_2_response: dict[str, _t.Any] = {}
+    for url in (
+        "/api/records/",
+        "/stats/friends/",
+        "/stats/location/",
+        "/stats/brands/",
+    ):
+        response = await client.get(url)
+        url_2_response[url] = response.json()
+        if "etag" in response.headers:
+            url_2_response["ETag"] = response.headers["etag"]
+    return url_2_response
+
+
+def _get_failing(
+    create_friend_pint_records: _t.Callable[..., _t.Awaitable[None]],
+) -> _t.Callable[..., _t.Awaitable[None]]:
+    """
+    Get a repository method creating friend pint records which fails for the friend "Fails", after the pint records and summaries are written.
+
+    :param create_friend_pint_records: Repository method creating friend pint records.
+    :return: Failing method.
+    """
+
+    async def failing(
+        self: _t.Any, friend_pint_record_dicts: list[dict[str, _t.Any]]
+    ) -> None:
+        if any(x["friend_name"] == "Fails" for x in friend_pint_record_dicts):
+            raise RuntimeError("Failed to write")
+        await create_friend_pint_records(self, friend_pint_record_dicts)
+
+    return failing
+
+
+def _get_record(
+    location: str, number: float, friend_names: list[str], pint_brand: str | None
+) -> dict[str, _t.Any]:
+    """
+    Get a record payload.
+
+    :param location: Location.
+    :param number: Number of pints.
+    :param friend_names: Friend names.
+    :param pint_brand: Pint brand.
+    :return: Record payload.
+    """
+    return {
+        "date": "2025-01-03",
+        "location": location,
+        "number": number,
+        "friend_names": friend_names,
+        "comment": None,
+        "pint_brand": pint_brand,
+        "pint_cost": 5.0,
+    }
+
+
+# Friend names are repeated within records, which must only be counted once per record
+_RECORDS = [
+    _get_record("The Pub", 2.0, ["Al", "Bo", "Al"], "Guinness"),
+    _get_record("The Pub", 1.0, ["Bo"], "Hop"),
+    _get_record("The Bar", 1.5, ["Cy", "Al", "Cy", "Al"], None),
+    _get_record("The Pub", 0.5, [], "Guinness"),
+]
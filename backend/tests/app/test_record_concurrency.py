@@ -0,0 +1,61 @@
+import asyncio as _aio
+import httpx as _hx
+import pytest as _pytest
+
+
+@_pytest.mark.usefixtures("empty_database")
+def test_parallel_creates_give_exact_totals() -> None:
+    """
+    Records created by parallel requests are all counted, as friend tallies and summaries are incremented inside the database.
+    """
+    import database as _db
+    import main as _main
+
+    number_of_requests = 20
+    record = {
+        "date": "2025-01-01",
+        "location": "The Pub",
+        "number": 1.5,
+        "friend_names": ["Alice", "Bob", "Alice"],
+        "comment": None,
+        "pint_brand": "Guinness",
+        "pint_cost": 5.0,
+    }
+
+    async def run() -> dict[str, dict]:
+        async with _db.lifespan(_main.app):
+            transport = _hx.ASGITransport(app=_main.app)
+            async with _hx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                responses = await _aio.gather(
+                    *[
+                        client.post("/api/records/", json=record)
+                        for _ in range(number_of_requests)
+                    ]
+                )
+                assert [x.status_code for x in responses] == [201] * number_of_requests
+
+                return {
+                    x: (await client.get(f"/stats/{x}/")).json()
+                    for x in ("friends", "location", "brands")
+                }
+
+    url_name_2_stats = _aio.run(run())
+
+    number_of_pints = 1.5 * number_of_requests
+    friends_info = url_name_2_stats["friends"]["friends_info"]
+    assert {k: v["pint_count"] for k, v in friends_info.items()} == {
+        "Alice": number_of_pints,
+        "Bob": number_of_pints,
+    }
+    assert friends_info["Alice"]["pub_2_frequency"] == {"The Pub": number_of_pints}
+    assert url_name_2_stats["location"]["location_info"]["The Pub"] == {
+        "number_of_visits": number_of_requests,
+        "number_of_pints": number_of_pints,
+        "number_of_pints_rank": 1,
+    }
+    assert url_name_2_stats["brands"]["brand_info"]["Guinness"] == {
+        "number_of_pints": number_of_pints,
+        "number_of_pints_rank": 1,
+    }
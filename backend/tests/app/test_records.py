@@ -0,0 +1,210 @@
+import json as _json
+import pytest as _pytest
+import typing as _t
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize("limit", [1, 3, 4, 7, 10])
+def test_pages_continue_without_gaps(run_with_client: _t.Callable, limit: int) -> None:
+    """
+    Following `X-Next-Cursor` from page to page gives every record once, in order, and the header is only present on full pages.
+
+    :param limit: Maximum number of records in each page.
+    """
+
+    async def use_client(client: _t.Any) -> list[tuple[list[dict], str | None]]:
+        await _create_records(client)
+        pages = []
+        params = {"limit": limit}
+        while True:
+            response = await client.get("/api/records/", params=params)
+            assert response.status_code == 200, response.text
+            next_cursor = response.headers.get("x-next-cursor")
+            pages.append((response.json(), next_cursor))
+            if next_cursor is None:
+                return pages
+            params = {"limit": limit, "after_id": next_cursor}
+
+    pages = run_with_client(use_client)
+
+    assert [x for page, _ in pages for x in page] == _EXPECTED_RECORDS
+    for page, next_cursor in pages:
+        assert len(page) <= limit
+        assert (next_cursor is not None) == (len(page) == limit)
+    assert len(pages) == len(_RECORDS) // limit + 1
+
+
+@_pytest.mark.usefixtures("repository_name")
+def test_unpaged_records_have_no_cursor(run_with_client: _t.Callable) -> None:
+    """
+    Records requested without a limit are all returned, without `X-Next-Cursor`, and paging after the last ID gives none.
+    """
+
+    async def use_client(client: _t.Any) -> list[_t.Any]:
+        await _create_records(client)
+        return [
+            await client.get("/api/records/"),
+            await client.get(
+                "/api/records/", params={"after_id": len(_RECORDS), "limit": 2}
+            ),
+        ]
+
+    response, last_response = run_with_client(use_client)
+
+    assert response.json() == _EXPECTED_RECORDS
+    assert "x-next-cursor" not in response.headers
+    assert last_response.json() == []
+    assert "x-next-cursor" not in last_response.headers
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize(
+    ("params", "expected_indices"),
+    [
+        _pytest.param({"date_from": "2025-01-06"}, [2, 3, 4, 5], id="date-from"),
+        _pytest.param({"date_to": "2025-01-06"}, [0, 1, 2, 6], id="date-to"),
+        _pytest.param(
+            {"date_from": "2025-01-06", "date_to": "2025-01-12"},
+            [2, 3],
+            id="date-range",
+        ),
+        _pytest.param({"location": "The Bar"}, [1, 4], id="location"),
+        _pytest.param({"friend_name": "Cy"}, [2, 6], id="friend"),
+        _pytest.param({"pint_brand": "Guinness"}, [0, 3], id="brand"),
+        _pytest.param(
+            {"friend_name": "Bo", "location": "The Pub"}, [0, 2], id="friend-location"
+        ),
+        _pytest.param(
+            {"friend_name": "Ed", "date_from": "2025-01-06", "limit": 1},
+            [4],
+            id="friend-date-from-page",
+        ),
+        _pytest.param({"location": "Nowhere"}, [], id="unknown-location"),
+        _pytest.param({"friend_name": "Nobody"}, [], id="unknown-friend"),
+        _pytest.param({"pint_brand": "Nothing"}, [], id="unknown-brand"),
+    ],
+)
+def test_filters(
+    run_with_client: _t.Callable, params: dict[str, _t.Any], expected_indices: list[int]
+) -> None:
+    """
+    Records are filtered by date range, location, friend and brand, in any combination.
+
+    :param params: Query parameters.
+    :param expected_indices: Expected indices of the records.
+    """
+
+    async def use_client(client: _t.Any) -> list[dict]:
+        await _create_records(client)
+        response = await client.get("/api/records/", params=params)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    record_dicts = run_with_client(use_client)
+
+    assert record_dicts == [_EXPECTED_RECORDS[x] for x in expected_indices]
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize(
+    "params",
+    [
+        _pytest.param({}, id="all"),
+        _pytest.param({"friend_name": "Bo"}, id="friend"),
+        _pytest.param({"after_id": 2, "limit": 3}, id="page"),
+        _pytest.param({"location": "Nowhere"}, id="empty"),
+    ],
+)
+def test_ndjson_matches_json(
+    run_with_client: _t.Callable, params: dict[str, _t.Any]
+) -> None:
+    """
+    The "ndjson" format has one JSON object per line, the same records as the JSON body.
+
+    :param params: Query parameters.
+    """
+
+    async def use_client(client: _t.Any) -> list[_t.Any]:
+        await _create_records(client)
+        return [
+            await client.get("/api/records/", params=params),
+            await client.get("/api/records/", params={**params, "format": "ndjson"}),
+        ]
+
+    response, ndjson_response = run_with_client(use_client)
+
+    assert ndjson_response.status_code == 200
+    assert ndjson_response.headers["content-type"] == "application/x-ndjson"
+    lines = ndjson_response.text.splitlines()
+    assert ndjson_response.text == "".join(f"{x}\n" for x in lines)
+    record_dicts = [_json.loads(x) for x in lines]
+    assert all(isinstance(x, dict) for x in record_dicts)
+    assert record_dicts == response.json()
+
+
+async def _create_records(client: _t.Any) -> None:
+    """
+    Create the records, the first one by one and the rest in bulk.
+
+    :param client: Client of the application.
+    """
+    response = await client.post("/api/records/", json=_RECORDS[0])
+    assert response.status_code == 201, response.text
+    response = await client.post("/api/records/bulk", json=_RECORDS[1:])
+    assert response.status_code == 201, response.text
+
+
+def _get_record(
+    date: str,
+    location: str,
+    friend_names: list[str],
+    pint_brand: str | None,
+    pint_cost: float | None = 5.0,
+) -> dict[str, _t.Any]:
+    """
+    Get a record payload.
+
+    :param date: Date.
+    :param location: Location.
+    :param friend_names: Friend names.
+    :param pint_brand: Pint brand.
+    :param pint_cost: Pint cost, defaults to 5.0
+    :return: Record payload.
+    """
+    return {
+        "date": date,
+        "location": location,
+        "number": 2.0,
+        "friend_names": friend_names,
+        "comment": None,
+        "pint_brand": pint_brand,
+        "pint_cost": pint_cost,
+    }
+
+
+def _get_expected_record(record: dict[str, _t.Any]) -> dict[str, _t.Any]:
+    """
+    Get the response of a record, with its distinct friend names in alphabetical order and its total cost.
+
+    :param record: Record payload.
+    :return: Record response.
+    """
+    pint_cost = record["pint_cost"]
+    return {
+        **record,
+        "friend_names": sorted(set(record["friend_names"])),
+        "total_cost": record["number"] * pint_cost if pint_cost is not None else None,
+    }
+
+
+# Records are created in an order other than chronological, as they are returned in order of creation
+_RECORDS = [
+    _get_record("2025-01-03", "The Pub", ["Bo", "Al"], "Guinness"),
+    _get_record("2025-01-04", "The Bar", ["Ed"], None, None),
+    _get_record("2025-01-06", "The Pub", ["Cy", "Bo", "Cy"], "Hop"),
+    _get_record("2025-01-12", "The Inn", [], "Guinness"),
+    _get_record("2025-02-01", "The Bar", ["Ed", "Al"], "IPA"),
+    _get_record("2025-02-14", "The Arms", ["Ed"], "Hop"),
+    _get_record("2025-01-02", "The Inn", ["Cy"], "Stout"),
+]
+_EXPECTED_RECORDS = [_get_expected_record(x) for x in _RECORDS]
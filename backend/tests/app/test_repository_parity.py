@@ -0,0 +1,219 @@
+import dataclasses as _dc
+import json as _json
+import pytest as _pytest
+import typing as _t
+
+#
+# NOTE: The SQL and in-memory repositories must be interchangeable, so the same writes are sent through each and every read endpoint
+#       is compared, including the order of every list and mapping.
+#
+
+
+@_pytest.mark.usefixtures("empty_database")
+def test_repositories_give_same_responses(
+    monkeypatch: _pytest.MonkeyPatch, run_with_client: _t.Callable
+) -> None:
+    """
+    The same writes give the same responses from every read endpoint of either repository.
+    """
+
+    async def use_client(client: _t.Any) -> dict[str, _t.Any]:
+        await _create_records(client)
+        return await _get_responses(client)
+
+    # NOTE: The in-memory repository goes first, as it never writes to the database the SQL repository then starts from
+    _use_memory_repository(monkeypatch)
+    memory_url_2_response = run_with_client(use_client)
+    monkeypatch.undo()
+    _bump_stats_cache()
+    sql_url_2_response = run_with_client(use_client)
+
+    assert sql_url_2_response["/api/records/"]
+    for url, sql_response in sql_url_2_response.items():
+        assert memory_url_2_response[url] == sql_response, url
+
+
+@_pytest.mark.usefixtures("empty_database")
+def test_memory_repository_is_loaded_from_database(
+    monkeypatch: _pytest.MonkeyPatch, run_with_client: _t.Callable
+) -> None:
+    """
+    The in-memory repository starts with the records committed to the database, and continues their IDs.
+    """
+
+    async def create_records(client: _t.Any) -> dict[str, _t.Any]:
+        await _create_records(client)
+        return await _get_responses(client)
+
+    async def create_record(client: _t.Any) -> None:
+        response = await client.post("/api/records/", json=_RECORDS[-1])
+        assert response.status_code == 201, response.text
+
+    sql_url_2_response = run_with_client(create_records)
+    _use_memory_repository(monkeypatch)
+    memory_url_2_response = run_with_client(_get_responses)
+
+    for url, sql_response in sql_url_2_response.items():
+        assert memory_url_2_response[url] == sql_response, url
+
+    # The store is only loaded once, so records created since are kept when the application starts again, after those loaded
+    run_with_client(create_record)
+    record_dicts = run_with_client(
+        lambda x: _get_json(x, f"/api/records/?after_id={len(_RECORDS)}")
+    )
+    assert [x["location"] for x in record_dicts] == [_RECORDS[-1]["location"]]
+
+
+def _use_memory_repository(monkeypatch: _pytest.MonkeyPatch) -> None:
+    """
+    Use the in-memory repository, with a new store.
+
+    :param monkeypatch: Monkey patch.
+    """
+    import repositories.memory as _rm
+    import settings as _st
+
+    monkeypatch.setattr(_st, "SETTINGS", _dc.replace(_st.SETTINGS, repository="memory"))
+    monkeypatch.setattr(_rm, "STORE", _rm.ColumnStore())
+    _bump_stats_cache()
+
+
+def _bump_stats_cache() -> None:
+    """
+    Drop the stats cached from the other repository.
+    """
+    import cache as _c
+
+    _c.STATS_CACHE.bump()
+
+
+async def _create_records(client: _t.Any) -> None:
+    """
+    Create records, one by one and in bulk, and the geos of their locations.
+
+    :param client: Client of the application.
+    """
+    for record in _RECORDS[:2]:
+        response = await client.post("/api/records/", json=record)
+        assert response.status_code == 201, response.text
+    response = await client.post("/api/records/bulk", json=_RECORDS[2:])
+    assert response.status_code == 201, response.text
+    response = await client.put("/api/locations/geo", json=_LOCATION_GEOS)
+    assert response.status_code == 200, response.text
+
+
+async def _get_responses(client: _t.Any) -> dict[str, _t.Any]:
+    """
+    Get the response of every read endpoint.
+
+    :param client: Client of the application.
+    :return: Mapping of URL to response content, parsed from JSON, or from each line of NDJSON.
+    """
+    url_2_response = {}
+    for url in _READ_URLS:
+        response = await client.get(url)
+        assert response.status_code == 200, (url, response.text)
+        if "format=ndjson" in url:
+            url_2_response[url] = [_json.loads(x) for x in response.text.splitlines()]
+        else:
+            url_2_response[url] = response.json()
+        url_2_response[f"{url} X-Next-Cursor"] = response.headers.get("x-next-cursor")
+
+    return url_2_response
+
+
+async def _get_json(client: _t.Any, url: str) -> _t.Any:
+    """
+    Get the JSON response of an endpoint.
+
+    :param client: Client of the application.
+    :param url: URL.
+    :return: Response content.
+    """
+    return (await client.get(url)).json()
+
+
+def _get_record(
+    date: str,
+    location: str,
+    number: float,
+    friend_names: list[str],
+    pint_brand: str | None,
+    pint_cost: float | None = 5.0,
+    comment: str | None = None,
+) -> dict[str, _t.Any]:
+    """
+    Get a record payload.
+
+    :param date: Date.
+    :param location: Location.
+    :param number: Number of pints.
+    :param friend_names: Friend names.
+    :param pint_brand: Pint brand.
+    :param pint_cost: Pint cost, defaults to 5.0
+    :param comment: Comment, defaults to None
+    :return: Record payload.
+    """
+    return {
+        "date": date,
+        "location": location,
+        "number": number,
+        "friend_names": friend_names,
+        "comment": comment,
+        "pint_brand": pint_brand,
+        "pint_cost": pint_cost,
+    }
+
+
+# Friend names are deliberately not in alphabetical order, and repeated within a record
+_RECORDS = [
+    _get_record("2025-01-03", "The Pub", 2.0, ["Bo", "Al", "Ed"], "Guinness"),
+    _get_record("2025-01-03", "The Bar", 1.5, ["Ed", "Al"], None, None, "Quiet"),
+    _get_record("2025-01-06", "The Pub", 1.0, ["Cy", "Bo", "Cy"], "Hop"),
+    _get_record("2025-01-12", "The Inn", 3.0, ["Al"], "Guinness", 6.5),
+    _get_record("2025-02-01", "The Bar", 0.5, ["Bo", "Ed"], "IPA"),
+    _get_record("2025-02-14", "The Arms", 2.5, ["Ed"], "Hop", None),
+]
+_LOCATION_GEOS = [
+    {
+        "location": "The Pub",
+        "longitude": -0.06,
+        "latitude": 51.55,
+        "borough": "Hackney",
+    },
+    {
+        "location": "The Inn",
+        "longitude": -0.1,
+        "latitude": 51.54,
+        "borough": "Islington",
+    },
+    {
+        "location": "The Bar",
+        "longitude": -0.07,
+        "latitude": 51.54,
+        "borough": "Hackney",
+    },
+    {"location": "The Arms", "longitude": None, "latitude": None, "borough": None},
+]
+_READ_URLS = [
+    "/stats/friends/",
+    "/stats/friends/?limit=2&offset=1&max_pubs_per_friend=1",
+    "/stats/location/",
+    "/stats/location/?min_pints=2",
+    "/stats/brands/",
+    "/stats/boroughs/",
+    "/stats/summary/",
+    "/stats/summary/?limit=2&max_pubs_per_friend=0",
+    "/stats/timeseries/?bucket=day",
+    "/stats/timeseries/?bucket=week",
+    "/stats/timeseries/?bucket=month",
+    "/stats/timeseries/?bucket=day&date_from=2025-01-06&friend_name=Bo",
+    "/stats/timeseries/?bucket=day&max_points=3",
+    "/api/records/",
+    "/api/records/?limit=2&after_id=1",
+    "/api/records/?date_from=2025-01-06&date_to=2025-02-01",
+    "/api/records/?location=The%20Bar",
+    "/api/records/?friend_name=Cy",
+    "/api/records/?pint_brand=Guinness",
+    "/api/records/?format=ndjson",
+]
@@ -0,0 +1,171 @@
+import pytest as _pytest
+import typing as _t
+
+#
+# NOTE: Every test runs against both repositories, with stats caching turned off, so a request which does not call the repository was
+#       only answered from the entity tag.
+#
+
+
+@_pytest.fixture
+def method_name_2_count(
+    monkeypatch: _pytest.MonkeyPatch, repository_name: str
+) -> dict[str, int]:
+    """
+    Count the calls of each stats method of the repository in use, with stats caching turned off.
+
+    :param monkeypatch: Monkey patch.
+    :param repository_name: Name of the repository in use.
+    :return: Mapping of method name to number of calls, updated as the methods are called.
+    """
+    import cache as _c
+    import repositories.memory as _rm
+    import repositories.sql as _rs
+
+    async def get_or_compute(
+        self: _c.StatsCache, key: str, compute: _t.Callable[[], _t.Awaitable]
+    ) -> _t.Any:
+        return await compute()
+
+    monkeypatch.setattr(_c.StatsCache, "get_or_compute", get_or_compute)
+
+    repository_type = {"sql": _rs.SQLRepository, "memory": _rm.InMemoryRepository}[
+        repository_name
+    ]
+    method_name_2_count = {x: 0 for x in _STATS_METHOD_NAMES}
+    for method_name in _STATS_METHOD_NAMES:
+        monkeypatch.setattr(
+            repository_type,
+            method_name,
+            _get_counted(getattr(repository_type, method_name), method_name_2_count),
+        )
+    return method_name_2_count
+
+
+@_pytest.mark.parametrize(
+    "url",
+    [
+        "/stats/friends/",
+        "/stats/location/",
+        "/stats/brands/",
+        "/stats/boroughs/",
+        "/stats/summary/",
+        "/stats/timeseries/",
+    ],
+)
+def test_matching_etag_is_not_modified(
+    run_with_client: _t.Callable, method_name_2_count: dict[str, int], url: str
+) -> None:
+    """
+    Stats responses carry an entity tag, and a request with a matching `If-None-Match` gets a 304 without calling the repository.
+
+    :param url: Stats URL.
+    """
+
+    async def use_client(client: _t.Any) -> list[_t.Any]:
+        await client.post("/api/records/", json=_RECORD)
+        response = await client.get(url)
+        number_of_calls = sum(method_name_2_count.values())
+        etag = response.headers["etag"]
+        return [
+            response,
+            number_of_calls,
+            await client.get(url, headers={"If-None-Match": etag}),
+            await client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}),
+            sum(method_name_2_count.values()),
+        ]
+
+    response, number_of_calls, *not_modified_responses, final_number_of_calls = (
+        run_with_client(use_client)
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+    assert number_of_calls > 0
+    for not_modified_response in not_modified_responses:
+        assert not_modified_response.status_code == 304
+        assert not_modified_response.content == b""
+        assert not_modified_response.headers["etag"] == response.headers["etag"]
+    assert final_number_of_calls == number_of_calls
+
+
+@_pytest.mark.parametrize("write_name", ["record", "bulk", "location_geos"])
+def test_write_changes_etag(
+    run_with_client: _t.Callable, method_name_2_count: dict[str, int], write_name: str
+) -> None:
+    """
+    Creating a record, creating records in bulk or updating location geos changes the entity tag, so the stale one gets a 200.
+
+    :param write_name: Name of the write.
+    """
+
+    async def use_client(client: _t.Any) -> list[_t.Any]:
+        await client.post("/api/records/", json=_RECORD)
+        stale_etag = (await client.get("/stats/brands/")).headers["etag"]
+
+        if write_name == "record":
+            response = await client.post("/api/records/", json=_RECORD)
+        elif write_name == "bulk":
+            response = await client.post("/api/records/bulk", json=[_RECORD] * 2)
+        else:
+            response = await client.put("/api/locations/geo", json=_LOCATION_GEOS)
+        assert response.status_code in (200, 201), response.text
+
+        response = await client.get(
+            "/stats/brands/", headers={"If-None-Match": stale_etag}
+        )
+        etag = response.headers["etag"]
+        return [
+            stale_etag,
+            response,
+            await client.get("/stats/brands/", headers={"If-None-Match": etag}),
+        ]
+
+    stale_etag, response, not_modified_response = run_with_client(use_client)
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != stale_etag
+    if write_name != "location_geos":
+        assert response.json()["brand_info"]["Guinness"]["number_of_pints"] > 2.0
+    assert not_modified_response.status_code == 304
+    assert method_name_2_count["get_brand_stats"] == 2
+
+
+def _get_counted(
+    method: _t.Callable[..., _t.Awaitable], method_name_2_count: dict[str, int]
+) -> _t.Callable[..., _t.Awaitable]:
+    """
+    Get a repository method which counts its calls.
+
+    :param method: Repository method.
+    :param method_name_2_count: Mapping of method name to number of calls.
+    :return: Counted method.
+    """
+
+    async def counted(*args: _t.Any, **kwargs: _t.Any) -> _t.Any:
+        method_name_2_count[method.__name__] += 1
+        return await method(*args, **kwargs)
+
+    return counted
+
+
+_STATS_METHOD_NAMES = [
+    "get_friend_stats",
+    "get_location_stats",
+    "get_brand_stats",
+    "get_borough_stats",
+    "get_time_series",
+]
+_RECORD = {
+    "date": "2025-01-03",
+    "location": "The Pub",
+    "number": 2.0,
+    "friend_names": ["Al", "Bo"],
+    "comment": None,
+    "pint_brand": "Guinness",
+    "pint_cost": 5.0,
+}
+_LOCATION_GEOS = [
+    {"location": "The Pub", "longitude": -0.06, "latitude": 51.55, "borough": "Hackney"}
+]
@@ -0,0 +1,352 @@
+import contextlib as _cl
+import pytest as _pytest
+import typing as _t
+
+#
+# NOTE: Every test runs against both repositories, which must give the same leaderboards, including the ranks and order of ties.
+#
+
+
+@_pytest.mark.usefixtures("repository_name")
+def test_tied_stats_share_rank(run_with_client: _t.Callable) -> None:
+    """
+    Friends, locations, brands and boroughs with the same number of pints share the lowest rank, and are ordered by name.
+    """
+
+    async def use_client(client: _t.Any) -> dict[str, dict]:
+        await _create_records(client)
+        return {
+            x: (await client.get(f"/stats/{x}/")).json()
+            for x in ("friends", "location", "brands", "boroughs")
+        }
+
+    url_name_2_stats = run_with_client(use_client)
+
+    friends_info = url_name_2_stats["friends"]["friends_info"]
+    assert [(k, v["pint_count_rank"]) for k, v in friends_info.items()] == [
+        ("Al", 1),
+        ("Bo", 1),
+        ("Ed", 1),
+        ("Cy", 4),
+    ]
+    location_info = url_name_2_stats["location"]["location_info"]
+    assert [(k, v["number_of_pints_rank"]) for k, v in location_info.items()] == [
+        ("The Pub", 1),
+        ("The Bar", 2),
+        ("The Inn", 2),
+    ]
+    brand_info = url_name_2_stats["brands"]["brand_info"]
+    assert [(k, v["number_of_pints_rank"]) for k, v in brand_info.items()] == [
+        ("Guinness", 1),
+        ("Hop", 2),
+        ("IPA", 2),
+    ]
+    borough_info = url_name_2_stats["boroughs"]["borough_info"]
+    assert [(k, v["number_of_pints_rank"]) for k, v in borough_info.items()] == [
+        ("Hackney", 1),
+        ("Camden", 2),
+        ("Islington", 2),
+    ]
+
+
+@_pytest.mark.usefixtures("repository_name")
+def test_equal_stats_all_rank_first(run_with_client: _t.Callable) -> None:
+    """
+    Brands and boroughs which all have the same number of pints all have rank 1, as friends and locations do.
+    """
+
+    async def use_client(client: _t.Any) -> dict[str, dict]:
+        await client.post("/api/records/bulk", json=_RECORDS[:3])
+        await client.put("/api/locations/geo", json=_LOCATION_GEOS[1:])
+        return {
+            x: (await client.get(f"/stats/{x}/")).json()
+            for x in ("friends", "location", "brands", "boroughs")
+        }
+
+    url_name_2_stats = run_with_client(use_client)
+
+    assert {
+        x["pint_count_rank"]
+        for x in url_name_2_stats["friends"]["friends_info"].values()
+    } == {1}
+    for url_name, info_name in (
+        ("location", "location_info"),
+        ("brands", "brand_info"),
+        ("boroughs", "borough_info"),
+    ):
+        assert {
+            x["number_of_pints_rank"]
+            for x in url_name_2_stats[url_name][info_name].values()
+        } == {1}, url_name
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize(
+    ("url", "expected_name_2_rank"),
+    [
+        _pytest.param(
+            "/stats/friends/?limit=2&offset=1",
+            {"Bo": 1, "Ed": 1},
+            id="friends-limit-offset",
+        ),
+        _pytest.param(
+            "/stats/friends/?min_pints=2",
+            {"Al": 1, "Bo": 1, "Ed": 1},
+            id="friends-min-pints",
+        ),
+        _pytest.param(
+            "/stats/friends/?offset=3", {"Cy": 4}, id="friends-offset-past-ties"
+        ),
+        _pytest.param(
+            "/stats/location/?limit=1&offset=1",
+            {"The Bar": 2},
+            id="location-limit-offset",
+        ),
+        _pytest.param(
+            "/stats/location/?min_pints=2.5",
+            {"The Pub": 1},
+            id="location-min-pints",
+        ),
+    ],
+)
+def test_leaderboard_page_keeps_ranks(
+    run_with_client: _t.Callable, url: str, expected_name_2_rank: dict[str, int]
+) -> None:
+    """
+    Pages of a leaderboard keep the ranks of the full leaderboard.
+
+    :param url: Leaderboard URL.
+    :param expected_name_2_rank: Expected rank of each friend or location of the page, in order.
+    """
+
+    async def use_client(client: _t.Any) -> dict:
+        await _create_records(client)
+        return (await client.get(url)).json()
+
+    stats = run_with_client(use_client)
+
+    name_2_stats = stats.get("friends_info") or stats["location_info"]
+    assert {
+        k: v.get("pint_count_rank", v.get("number_of_pints_rank"))
+        for k, v in name_2_stats.items()
+    } == expected_name_2_rank
+    assert list(name_2_stats) == list(expected_name_2_rank)
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize(
+    ("max_pubs_per_friend", "expected_pub_2_frequency"),
+    [
+        _pytest.param(None, {"The Bar": 2.0, "The Pub": 2.0}, id="all"),
+        _pytest.param(1, {"The Bar": 2.0}, id="capped"),
+        _pytest.param(0, {}, id="none"),
+    ],
+)
+def test_max_pubs_per_friend(
+    run_with_client: _t.Callable,
+    max_pubs_per_friend: int | None,
+    expected_pub_2_frequency: dict[str, float],
+) -> None:
+    """
+    Each friend's pubs are capped to the pubs with the most pints, with ties ordered by pub.
+
+    :param max_pubs_per_friend: Maximum number of pubs per friend.
+    :param expected_pub_2_frequency: Expected pints per pub of the first friend.
+    """
+
+    async def use_client(client: _t.Any) -> dict:
+        await _create_records(client)
+        params = {"limit": 1}
+        if max_pubs_per_friend is not None:
+            params["max_pubs_per_friend"] = max_pubs_per_friend
+        return (await client.get("/stats/friends/", params=params)).json()
+
+    friends_info = run_with_client(use_client)["friends_info"]
+
+    assert list(friends_info) == ["Al"]
+    assert friends_info["Al"]["pint_count"] == 4.0
+    assert friends_info["Al"]["pub_2_frequency"] == expected_pub_2_frequency
+    assert list(friends_info["Al"]["pub_2_frequency"]) == list(expected_pub_2_frequency)
+
+
+@_pytest.mark.parametrize(
+    "params",
+    [
+        _pytest.param({}, id="all"),
+        _pytest.param({"limit": 2, "offset": 1}, id="limit-offset"),
+        _pytest.param({"min_pints": 3}, id="min-pints"),
+        _pytest.param({"max_pubs_per_friend": 1}, id="max-pubs-per-friend"),
+    ],
+)
+def test_summary_matches_stats_with_own_repositories(
+    monkeypatch: _pytest.MonkeyPatch,
+    repository_name: str,
+    run_with_client: _t.Callable,
+    params: dict[str, _t.Any],
+) -> None:
+    """
+    The summary has the same friends, location, brand and borough stats as their own endpoints, each computed with its own repository, and
+    so its own session, opened by the repository factory.
+
+    :param repository_name: Name of the repository in use.
+    :param params: Query parameters.
+    """
+    import cache as _c
+    import dependencies as _dp
+    import main as _main
+    import repositories.memory as _rm
+    import repositories.sql as _rs
+
+    # NOTE: Without caching, the summary and each endpoint compute their stats rather than reading those of the other
+    async def get_or_compute(
+        self: _c.StatsCache, key: str, compute: _t.Callable[[], _t.Awaitable]
+    ) -> _t.Any:
+        return await compute()
+
+    monkeypatch.setattr(_c.StatsCache, "get_or_compute", get_or_compute)
+
+    repository_type = {"sql": _rs.SQLRepository, "memory": _rm.InMemoryRepository}[
+        repository_name
+    ]
+    method_name_2_repositories: dict[str, list[_t.Any]] = {}
+    for method_name in _STATS_METHOD_NAMES:
+        monkeypatch.setattr(
+            repository_type,
+            method_name,
+            _get_recorded(
+                getattr(repository_type, method_name), method_name_2_repositories
+            ),
+        )
+
+    factory_repositories = []
+
+    @_cl.asynccontextmanager
+    async def open_repository() -> _t.AsyncIterator[_t.Any]:
+        async with _dp.open_repository() as repository:
+            factory_repositories.append(repository)
+            yield repository
+
+    monkeypatch.setitem(
+        _main.app.dependency_overrides,
+        _dp.get_repository_factory,
+        lambda: open_repository,
+    )
+
+    async def use_client(client: _t.Any) -> list[dict]:
+        await _create_records(client)
+        response = await client.get("/stats/summary/", params=params)
+        assert response.status_code == 200, response.text
+        return [
+            response.json(),
+            (await client.get("/stats/friends/", params=params)).json(),
+            (
+                await client.get(
+                    "/stats/location/",
+                    params={
+                        k: v for k, v in params.items() if k != "max_pubs_per_friend"
+                    },
+                )
+            ).json(),
+            (await client.get("/stats/brands/")).json(),
+            (await client.get("/stats/boroughs/")).json(),
+        ]
+
+    summary, *url_name_stats_list = run_with_client(use_client)
+
+    assert summary == {k: v for x in url_name_stats_list for k, v in x.items()}
+    assert list(summary["friends_info"]) == list(url_name_stats_list[0]["friends_info"])
+
+    # The summary's stats were each computed first, with a different repository opened by the factory
+    summary_repositories = [x[0] for x in method_name_2_repositories.values()]
+    assert len(factory_repositories) == len(_STATS_METHOD_NAMES)
+    assert {id(x) for x in summary_repositories} == {
+        id(x) for x in factory_repositories
+    }
+    if repository_name == "sql":
+        assert len({id(x._SQLRepository__session) for x in factory_repositories}) == (
+            len(_STATS_METHOD_NAMES)
+        )
+
+
+async def _create_records(client: _t.Any) -> None:
+    """
+    Create the records and the boroughs of their locations.
+
+    :param client: Client of the application.
+    """
+    response = await client.post("/api/records/bulk", json=_RECORDS)
+    assert response.status_code == 201, response.text
+    response = await client.put("/api/locations/geo", json=_LOCATION_GEOS)
+    assert response.status_code == 200, response.text
+
+
+def _get_recorded(
+    method: _t.Callable[..., _t.Awaitable],
+    method_name_2_repositories: dict[str, list[_t.Any]],
+) -> _t.Callable[..., _t.Awaitable]:
+    """
+    Get a repository method which records the repositories it is called on.
+
+    :param method: Repository method.
+    :param method_name_2_repositories: Mapping of method name to the repositories it has been called on, in order.
+    :return: Recorded method.
+    """
+
+    async def recorded(self: _t.Any, *args: _t.Any, **kwargs: _t.Any) -> _t.Any:
+        method_name_2_repositories.setdefault(method.__name__, []).append(self)
+        return await method(self, *args, **kwargs)
+
+    return recorded
+
+
+def _get_record(
+    location: str, number: float, friend_names: list[str], pint_brand: str
+) -> dict[str, _t.Any]:
+    """
+    Get a record payload.
+
+    :param location: Location.
+    :param number: Number of pints.
+    :param friend_names: Friend names.
+    :param pint_brand: Pint brand.
+    :return: Record payload.
+    """
+    return {
+        "date": "2025-01-03",
+        "location": location,
+        "number": number,
+        "friend_names": friend_names,
+        "comment": None,
+        "pint_brand": pint_brand,
+        "pint_cost": 5.0,
+    }
+
+
+# Friends Al, Bo and Ed have 4 pints each and Cy has 1, The Pub has 3 pints and the other locations 2, as do their brands and boroughs
+_RECORDS = [
+    _get_record("The Inn", 2.0, ["Bo", "Ed"], "IPA"),
+    _get_record("The Bar", 2.0, ["Ed", "Al"], "Hop"),
+    _get_record("The Pub", 2.0, ["Al", "Bo"], "Guinness"),
+    _get_record("The Pub", 1.0, ["Cy"], "Guinness"),
+]
+_LOCATION_GEOS = [
+    {
+        "location": "The Pub",
+        "longitude": -0.06,
+        "latitude": 51.55,
+        "borough": "Hackney",
+    },
+    {
+        "location": "The Inn",
+        "longitude": -0.1,
+        "latitude": 51.54,
+        "borough": "Islington",
+    },
+    {"location": "The Bar", "longitude": -0.14, "latitude": 51.54, "borough": "Camden"},
+]
+_STATS_METHOD_NAMES = [
+    "get_friend_stats",
+    "get_location_stats",
+    "get_brand_stats",
+    "get_borough_stats",
+]
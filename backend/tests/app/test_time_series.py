@@ -0,0 +1,251 @@
+import numpy as _np
+import pytest as _pytest
+import typing as _t
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize(
+    ("bucket", "expected_points"),
+    [
+        _pytest.param(
+            "day",
+            [
+                ("2025-01-05", 1, 1.0, 1.0),
+                ("2025-01-06", 1, 2.0, 3.0),
+                ("2025-01-12", 1, 3.0, 6.0),
+                ("2025-01-13", 2, 5.0, 11.0),
+                ("2025-02-02", 1, 0.5, 11.5),
+            ],
+            id="day",
+        ),
+        _pytest.param(
+            "week",
+            [
+                ("2024-12-30", 1, 1.0, 1.0),
+                ("2025-01-06", 2, 5.0, 6.0),
+                ("2025-01-13", 2, 5.0, 11.0),
+                ("2025-01-27", 1, 0.5, 11.5),
+            ],
+            id="week",
+        ),
+        _pytest.param(
+            "month",
+            [("2025-01-01", 5, 11.0, 11.0), ("2025-02-01", 1, 0.5, 11.5)],
+            id="month",
+        ),
+    ],
+)
+def test_time_series_buckets(
+    run_with_client: _t.Callable,
+    bucket: str,
+    expected_points: list[tuple[str, int, float, float]],
+) -> None:
+    """
+    Records are bucketed by day, by the week starting on the Monday on or before them, and by month, in chronological order.
+
+    :param bucket: Date bucket.
+    :param expected_points: Expected date, visits, pints and cumulative pints of each point.
+    """
+    (points,) = _get_points(run_with_client, {"bucket": bucket})
+
+    assert points == expected_points
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize(
+    ("params", "expected_points"),
+    [
+        _pytest.param(
+            {"bucket": "day", "date_from": "2025-01-12", "date_to": "2025-01-13"},
+            [("2025-01-12", 1, 3.0, 3.0), ("2025-01-13", 2, 5.0, 8.0)],
+            id="date-range",
+        ),
+        _pytest.param(
+            {"bucket": "week", "date_from": "2025-01-07"},
+            [
+                ("2025-01-06", 1, 3.0, 3.0),
+                ("2025-01-13", 2, 5.0, 8.0),
+                ("2025-01-27", 1, 0.5, 8.5),
+            ],
+            id="week-from-mid-week",
+        ),
+        _pytest.param(
+            {"bucket": "day", "friend_name": "Bo"},
+            [
+                ("2025-01-06", 1, 2.0, 2.0),
+                ("2025-01-13", 1, 4.0, 6.0),
+                ("2025-02-02", 1, 0.5, 6.5),
+            ],
+            id="friend",
+        ),
+        _pytest.param(
+            {"bucket": "month", "date_from": "2025-01-06", "friend_name": "Al"},
+            [("2025-01-01", 2, 4.0, 4.0)],
+            id="friend-date-from",
+        ),
+        _pytest.param(
+            {"bucket": "day", "friend_name": "Nobody"}, [], id="unknown-friend"
+        ),
+    ],
+)
+def test_time_series_filters(
+    run_with_client: _t.Callable,
+    params: dict[str, str],
+    expected_points: list[tuple[str, int, float, float]],
+) -> None:
+    """
+    Filtered time series only count the matching records, and the running total starts from the first date of the range.
+
+    :param params: Query parameters.
+    :param expected_points: Expected date, visits, pints and cumulative pints of each point.
+    """
+    (points,) = _get_points(run_with_client, params)
+
+    assert points == expected_points
+
+
+@_pytest.mark.usefixtures("repository_name")
+@_pytest.mark.parametrize("max_points", [3, 4, 5, 10])
+def test_time_series_max_points(run_with_client: _t.Callable, max_points: int) -> None:
+    """
+    Downsampled time series keep the first and last points, and the running totals of the full time series.
+
+    :param max_points: Maximum number of points.
+    """
+    all_points, points = _get_points(
+        run_with_client, {"bucket": "day"}, {"bucket": "day", "max_points": max_points}
+    )
+
+    assert len(points) == min(max_points, len(all_points))
+    assert points[0] == all_points[0]
+    assert points[-1] == all_points[-1]
+    assert set(points) <= set(all_points)
+    assert points == sorted(points)
+
+
+@_pytest.mark.parametrize(
+    ("point_count", "max_points"),
+    [(4, 3), (5, 3), (10, 3), (10, 4), (100, 7), (101, 100), (1000, 50)],
+)
+def test_lttb_indices_are_bounded_and_ascending(
+    point_count: int, max_points: int
+) -> None:
+    """
+    Downsampling keeps exactly the maximum number of points, including the first and last, with their indices in ascending order.
+
+    :param point_count: Number of points.
+    :param max_points: Maximum number of points.
+    """
+    import services.stats as _st
+
+    random_state = _np.random.default_rng(point_count)
+    y_values = random_state.random(point_count)
+
+    indices = _st._get_lttb_indices(
+        _np.arange(point_count, dtype=_np.float64), y_values, max_points
+    )
+
+    assert len(indices) == max_points
+    assert indices[0] == 0
+    assert indices[-1] == point_count - 1
+    assert (_np.diff(indices) > 0).all()
+
+
+@_pytest.mark.parametrize("point_count", [0, 1, 2, 3, 5])
+def test_lttb_indices_keep_short_series(point_count: int) -> None:
+    """
+    Series with no more than the maximum number of points are kept whole.
+
+    :param point_count: Number of points.
+    """
+    import services.stats as _st
+
+    indices = _st._get_lttb_indices(
+        _np.arange(point_count, dtype=_np.float64), _np.ones(point_count), 5
+    )
+
+    assert indices.tolist() == list(range(point_count))
+
+
+def test_lttb_indices_keep_peak() -> None:
+    """
+    The point forming the largest triangle, such as a peak, is kept over its flat neighbours.
+    """
+    import services.stats as _st
+
+    y_values = _np.zeros(9)
+    y_values[6] = 10.0
+
+    indices = _st._get_lttb_indices(_np.arange(9, dtype=_np.float64), y_values, 3)
+
+    assert indices.tolist() == [0, 6, 8]
+
+
+def _get_points(
+    run_with_client: _t.Callable, *params_list: dict[str, _t.Any]
+) -> list[list[tuple[str, int, float, float]]]:
+    """
+    Create the records, then get time series.
+
+    :param run_with_client: Function running a coroutine function with a client of the application.
+    :param params_list: Query parameters of each time series.
+    :return: Date, visits, pints and cumulative pints of each point, for each time series.
+    """
+
+    async def use_client(client: _t.Any) -> list[dict]:
+        response = await client.post("/api/records/bulk", json=_RECORDS)
+        assert response.status_code == 201, response.text
+        time_series_list = []
+        for params in params_list:
+            response = await client.get("/stats/timeseries/", params=params)
+            assert response.status_code == 200, response.text
+            time_series_list.append(response.json())
+        return time_series_list
+
+    time_series_list = run_with_client(use_client)
+
+    for params, time_series in zip(params_list, time_series_list):
+        assert time_series["bucket"] == params["bucket"]
+    return [
+        [
+            (
+                x["date"],
+                x["number_of_visits"],
+                x["number_of_pints"],
+                x["cumulative_number_of_pints"],
+            )
+            for x in time_series["points"]
+        ]
+        for time_series in time_series_list
+    ]
+
+
+def _get_record(date: str, number: float, friend_names: list[str]) -> dict[str, _t.Any]:
+    """
+    Get a record payload.
+
+    :param date: Date.
+    :param number: Number of pints.
+    :param friend_names: Friend names.
+    :return: Record payload.
+    """
+    return {
+        "date": date,
+        "location": "The Pub",
+        "number": number,
+        "friend_names": friend_names,
+        "comment": None,
+        "pint_brand": None,
+        "pint_cost": None,
+    }
+
+
+# Sundays and Mondays either side of week boundaries, in an order other than chronological
+_RECORDS = [
+    _get_record("2025-01-13", 4.0, ["Bo"]),
+    _get_record("2025-01-05", 1.0, ["Al"]),
+    _get_record("2025-01-12", 3.0, ["Al"]),
+    _get_record("2025-01-06", 2.0, ["Bo", "Cy"]),
+    _get_record("2025-02-02", 0.5, ["Bo"]),
+    _get_record("2025-01-13", 1.0, ["Al", "Cy"]),
+]
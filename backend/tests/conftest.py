@@ -0,0 +1,92 @@
+import asyncio as _aio
+import dataclasses as _dc
+import os as _os
+import pathlib as _pth
+import pytest as _pytest
+import sys as _sys
+import tempfile as _tf
+import typing as _t
+
+#
+# NOTE: The settings and engine are created when the application is imported, so the temporary database the tests use is configured before
+#       any application module is imported.
+#
+
+_BACKEND_DIR = _pth.Path(__file__).resolve().parents[1]
+_DATABASE_DIR = _tf.TemporaryDirectory()
+
+_os.environ["PINTS_REPOSITORY"] = "sql"
+_os.environ["PINTS_DATABASE_URL"] = (
+    f"sqlite+aiosqlite:///{_pth.Path(_DATABASE_DIR.name) / 'test.db'}"
+)
+_os.environ.pop("PINTS_WRITE_BEHIND", None)
+_sys.path[:0] = [str(_BACKEND_DIR / "app"), str(_BACKEND_DIR / "scripts")]
+
+# Coroutine function using a client of the application, see `run_with_client`
+_UseClient = _t.Callable[[_t.Any], _t.Awaitable[_t.Any]]
+
+
+@_pytest.fixture
+def empty_database() -> None:
+    """
+    Migrate the temporary database and delete every row, so a test starts from an empty database.
+    """
+    import cache as _c
+    import database as _db
+    import main as _main
+
+    async def clear() -> None:
+        async with _db.lifespan(_main.app):
+            async with _db.Engine.begin() as conn:
+                for table in reversed(_db.Base.metadata.sorted_tables):
+                    await conn.execute(table.delete())
+
+    _aio.run(clear())
+    _c.STATS_CACHE.bump()
+
+
+@_pytest.fixture(params=["sql", "memory"])
+def repository_name(
+    request: _pytest.FixtureRequest, monkeypatch: _pytest.MonkeyPatch
+) -> str:
+    """
+    Run a test against each repository, starting from an empty temporary database, which the in-memory store is loaded from.
+
+    :return: Repository name, see `settings.Settings.repository`.
+    """
+    import repositories.memory as _rm
+    import settings as _st
+
+    request.getfixturevalue("empty_database")
+    if request.param == "memory":
+        monkeypatch.setattr(
+            _st, "SETTINGS", _dc.replace(_st.SETTINGS, repository="memory")
+        )
+        monkeypatch.setattr(_rm, "STORE", _rm.ColumnStore())
+
+    return request.param
+
+
+@_pytest.fixture
+def run_with_client() -> _t.Callable[[_UseClient], _t.Any]:
+    """
+    Get a function running a coroutine function with a client of the application, within its lifespan.
+
+    :return: Function taking a coroutine function of an `httpx.AsyncClient`, and returning its result.
+    """
+    import database as _db
+    import httpx as _hx
+    import main as _main
+
+    def run(use_client: _UseClient) -> _t.Any:
+        async def run_async() -> _t.Any:
+            async with _db.lifespan(_main.app):
+                transport = _hx.ASGITransport(app=_main.app)
+                async with _hx.AsyncClient(
+                    transport=transport, base_url="http://test"
+                ) as client:
+                    return await use_client(client)
+
+        return _aio.run(run_async())
+
+    return run
@@ -0,0 +1,150 @@
+import collections as _coll
+import http.server as _hs
+import json as _json
+import pathlib as _pth
+import pytest as _pytest
+import threading as _th
+import time as _tm
+import typing as _t
+import urllib.parse as _up
+
+
+class _StubGeocodingHandler(_hs.BaseHTTPRequestHandler):
+    """
+    Stub of the Google Geocoding API, which answers by address: "Found ..." addresses are found, "Empty ..." addresses get an "OK" response
+    without results, and any other address gets no results.
+    """
+
+    def do_GET(self) -> None:
+        address = _up.parse_qs(_up.urlparse(self.path).query)["address"][0]
+        self.server.address_2_request_count[address] += 1
+        self.server.request_times.append(_tm.monotonic())
+
+        if address.startswith("Found"):
+            data = {
+                "status": "OK",
+                "results": [{"geometry": {"location": {"lng": -0.1, "lat": 51.5}}}],
+            }
+        elif address.startswith("Empty"):
+            data = {"status": "OK", "results": []}
+        else:
+            data = {"status": "ZERO_RESULTS", "results": []}
+
+        content = _json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *_: _t.Any) -> None:
+        pass
+
+
+@_pytest.fixture
+def stub_server() -> _t.Iterator[_hs.ThreadingHTTPServer]:
+    """
+    Serve the stub Geocoding API on a free local port.
+
+    :return: Server, which counts the requests made for each address and records when each request was made.
+    """
+    server = _hs.ThreadingHTTPServer(("127.0.0.1", 0), _StubGeocodingHandler)
+    server.address_2_request_count = _coll.Counter()
+    server.request_times = []
+    thread = _th.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cached_addresses_are_not_looked_up_again(
+    stub_server: _hs.ThreadingHTTPServer, tmp_path: _pth.Path
+) -> None:
+    """
+    Found addresses are cached on disk, including across geocoder instances.
+    """
+    import geocoder as _gc
+
+    cache_path = tmp_path / "cache.db"
+    for _ in range(2):
+        with _gc.Geocoder(cache_path, url=_get_url(stub_server)) as geocoder:
+            assert geocoder.geocode(["Found pub", "Found pub"]) == {
+                "Found pub": (-0.1, 51.5)
+            }
+
+    assert stub_server.address_2_request_count == {"Found pub": 1}
+
+
+def test_negative_results_expire(
+    stub_server: _hs.ThreadingHTTPServer, tmp_path: _pth.Path
+) -> None:
+    """
+    Addresses which cannot be found are cached, until their negative result expires.
+    """
+    import geocoder as _gc
+
+    cache_path = tmp_path / "cache.db"
+    url = _get_url(stub_server)
+    with _gc.Geocoder(cache_path, url=url, negative_ttl_seconds=3600) as geocoder:
+        assert geocoder.geocode(["Missing pub"]) == {"Missing pub": None}
+        assert geocoder.geocode(["Missing pub"]) == {"Missing pub": None}
+    assert stub_server.address_2_request_count == {"Missing pub": 1}
+
+    with _gc.Geocoder(cache_path, url=url, negative_ttl_seconds=0) as geocoder:
+        assert geocoder.geocode(["Missing pub"]) == {"Missing pub": None}
+    assert stub_server.address_2_request_count == {"Missing pub": 2}
+
+
+def test_ok_response_without_results_is_not_found(
+    stub_server: _hs.ThreadingHTTPServer, tmp_path: _pth.Path
+) -> None:
+    """
+    An "OK" response without results is a negative result, and does not stop the other addresses of the batch being geocoded.
+    """
+    import geocoder as _gc
+
+    with _gc.Geocoder(tmp_path / "cache.db", url=_get_url(stub_server)) as geocoder:
+        assert geocoder.geocode(["Empty pub", "Found pub"]) == {
+            "Empty pub": None,
+            "Found pub": (-0.1, 51.5),
+        }
+        assert geocoder.geocode(["Empty pub"]) == {"Empty pub": None}
+
+    assert stub_server.address_2_request_count == {"Empty pub": 1, "Found pub": 1}
+
+
+def test_requests_are_rate_limited(
+    stub_server: _hs.ThreadingHTTPServer, tmp_path: _pth.Path
+) -> None:
+    """
+    Concurrent look-ups share the rate limit, which allows a burst of as many requests as the rate, then the sustained rate.
+    """
+    import geocoder as _gc
+
+    requests_per_second = 20.0
+    addresses = [f"Found pub {x}" for x in range(30)]
+    with _gc.Geocoder(
+        tmp_path / "cache.db",
+        url=_get_url(stub_server),
+        max_workers=8,
+        requests_per_second=requests_per_second,
+    ) as geocoder:
+        address_2_coordinates = geocoder.geocode(addresses)
+
+    assert len(address_2_coordinates) == len(addresses)
+    request_times = sorted(stub_server.request_times)
+    # The 10 requests after the burst of 20 take at least half a second
+    assert request_times[-1] - request_times[0] >= (
+        (len(addresses) - requests_per_second) / requests_per_second * 0.9
+    )
+
+
+def _get_url(server: _hs.ThreadingHTTPServer) -> str:
+    """
+    Get the URL of a stub server.
+
+    :param server: Server.
+    :return: URL.
+    """
+    return f"http://127.0.0.1:{server.server_address[1]}/geocode/json"
@@ -0,0 +1,45 @@
+import io as _io
+import pandas as _pd
+
+
+def test_clean_up_input_pints_data_renames_friends() -> None:
+    """
+    Friends of each entry are split, stripped and renamed, and entries without friends get an empty list.
+    """
+    import pints_input_data_clean_up as _idc
+
+    df = _idc.clean_up_input_pints_data(
+        _pd.read_csv(
+            _io.StringIO(
+                _CSV_HEADER
+                + '03/01/2025,The Pub,1,Guinness,£5.00,,"Roisin, Stan,"\n'
+                + "04/01/2025,The Pub,1,Guinness,£5.00,,\n"
+            )
+        )
+    )
+
+    assert df["company_list"].tolist() == [["Róisín", "Stanley"], []]
+
+
+def test_clean_up_input_pints_data_without_any_company() -> None:
+    """
+    A "Company" column where every entry is missing, which is read from a CSV file as floats, gives empty friend lists.
+    """
+    import pints_input_data_clean_up as _idc
+
+    input_data_df = _pd.read_csv(
+        _io.StringIO(
+            _CSV_HEADER
+            + "03/01/2025,The Pub,1,Guinness,£5.00,,\n"
+            + "04/01/2025,The Bar,2,,£6.00,£12.00,\n"
+        )
+    )
+    assert input_data_df["Company"].dtype == float
+
+    df = _idc.clean_up_input_pints_data(input_data_df)
+
+    assert df["company_list"].tolist() == [[], []]
+    assert df["Spend"].isna().tolist() == [True, False]
+
+
+_CSV_HEADER = "Date,Location,Number,Pint,Cost (per pint),Spend,Company\n"
@@ -0,0 +1,171 @@
+import pandas as _pd
+import pathlib as _pth
+import pytest as _pytest
+import re as _re
+import typing as _t
+
+
+class _FakeSheetsService:
+    """
+    Fake of the Google Sheets API service, which serves rows of whole-row ranges the way the API does: trailing blank rows of a range and
+    trailing blank cells of a row are omitted.
+    """
+
+    def __init__(self, rows: list[list[str]]) -> None:
+        """
+        Initialise fake service.
+
+        :param rows: Rows of the spreadsheet, starting with the header row. Blank rows are empty lists.
+        """
+        self.rows = rows
+        self.ranges: list[str] = []
+
+    def spreadsheets(self) -> "_FakeSheetsService":
+        return self
+
+    def values(self) -> "_FakeSheetsService":
+        return self
+
+    def get(self, spreadsheetId: _t.Optional[str], range: str) -> "_FakeRequest":
+        self.ranges.append(range)
+        start_row, end_row = map(int, _re.fullmatch(r"(\d+):(\d+)", range).groups())
+        rows = [_get_trimmed(x) for x in self.rows[start_row - 1 : end_row]]
+        while rows and not rows[-1]:
+            rows.pop()
+        return _FakeRequest({"values": rows} if rows else {})
+
+
+class _FakeRequest:
+    """
+    Fake of a Google Sheets API request.
+    """
+
+    def __init__(self, response: dict[str, _t.Any]) -> None:
+        self.response = response
+
+    def execute(self) -> dict[str, _t.Any]:
+        return self.response
+
+
+def test_iter_pints_input_data_yields_parsed_chunks() -> None:
+    """
+    Rows are read in chunks, which are yielded with their data types parsed.
+    """
+    import pints_input_data_service as _ids
+
+    service = _FakeSheetsService([_HEADER_ROW, *_get_data_rows(1, 5)])
+
+    chunks = list(_ids.iter_pints_input_data(chunk_size=2, service=service))
+
+    assert [len(x) for x in chunks] == [2, 2, 1]
+    for chunk in chunks:
+        assert list(chunk.columns) == _HEADER_ROW
+        assert chunk["Date"].dtype == "datetime64[ns]"
+        for column_name in ("Number", "Cost (per pint)", "Spend"):
+            assert chunk[column_name].dtype == float
+    df = _pd.concat(chunks, ignore_index=True)
+    assert df["Date"].dt.day.tolist() == [1, 2, 3, 4, 5]
+    assert df["Cost (per pint)"].tolist() == [1234.5] * 5
+    assert df["Spend"].isna().all()
+    assert service.ranges == ["1:1", "2:3", "4:5", "6:7", "8:9"]
+
+
+def test_iter_pints_input_data_reads_rows_after_blank_gap() -> None:
+    """
+    Rows after a gap of blank rows are read, even if the gap ends a chunk so the API returns a short chunk.
+    """
+    import pints_input_data_service as _ids
+
+    service = _FakeSheetsService(
+        [_HEADER_ROW, *_get_data_rows(1, 2), [], [], *_get_data_rows(3, 4)]
+    )
+
+    df = _pd.concat(
+        _ids.iter_pints_input_data(chunk_size=3, service=service), ignore_index=True
+    )
+
+    # The gap's last blank row is at the start of a chunk, so it is kept, while the one ending the previous chunk is omitted by the API
+    assert df["Date"].dt.day.tolist()[:2] == [1, 2]
+    assert df["Date"].iloc[2:3].isna().all()
+    assert df["Date"].dropna().dt.day.tolist() == [1, 2, 3, 4]
+    assert df.loc[df["Date"].isna(), "Location"].isna().all()
+
+
+def test_get_pints_input_data_of_empty_spreadsheet_keeps_columns() -> None:
+    """
+    A spreadsheet with only a header row gives an empty data frame with its columns.
+    """
+    import pints_input_data_service as _ids
+
+    df = _ids.get_pints_input_data(service=_FakeSheetsService([_HEADER_ROW]))
+
+    assert df.empty
+    assert list(df.columns) == _HEADER_ROW
+
+
+def test_get_pints_input_data_writes_csv_snapshot(tmp_path: _pth.Path) -> None:
+    """
+    The CSV snapshot contains every row.
+    """
+    import pints_input_data_service as _ids
+
+    file_path = tmp_path / "Pints_raw_data.csv"
+
+    df = _ids.get_pints_input_data(
+        True,
+        file_path=file_path,
+        chunk_size=2,
+        service=_FakeSheetsService([_HEADER_ROW, *_get_data_rows(1, 3)]),
+    )
+
+    snapshot_df = _pd.read_csv(file_path)
+    assert list(snapshot_df.columns) == _HEADER_ROW
+    assert snapshot_df["Number"].tolist() == df["Number"].tolist()
+
+
+def test_iter_pints_input_data_rejects_invalid_chunk_size() -> None:
+    """
+    Chunks must have at least one row.
+    """
+    import pints_input_data_service as _ids
+
+    with _pytest.raises(ValueError):
+        next(_ids.iter_pints_input_data(chunk_size=0, service=_FakeSheetsService([])))
+
+
+def _get_data_rows(first_day: int, last_day: int) -> list[list[str]]:
+    """
+    Get spreadsheet rows of data, one per day of January 2025, with a blank "Spend" cell.
+
+    :param first_day: First day.
+    :param last_day: Last day, inclusive.
+    :return: Rows.
+    """
+    return [
+        [f"{x:02d}/01/2025", "The Pub", "1", "Guinness", "£1,234.50", "", "Alice, Bob"]
+        for x in range(first_day, last_day + 1)
+    ]
+
+
+def _get_trimmed(row: list[str]) -> list[str]:
+    """
+    Get a row without its trailing blank cells.
+
+    :param row: Row.
+    :return: Trimmed row.
+    """
+    row = list(row)
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+_HEADER_ROW = [
+    "Date",
+    "Location",
+    "Number",
+    "Pint",
+    "Cost (per pint)",
+    "Spend",
+    "Company",
+]
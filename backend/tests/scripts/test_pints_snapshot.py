@@ -0,0 +1,32 @@
+import pathlib as _pth
+import pytest as _pytest
+import typing as _t
+
+
+@_pytest.mark.parametrize(
+    "use_snapshot",
+    [
+        _pytest.param(
+            lambda s, d: s.write_pints_snapshot(d, None, {}, row_count=0), id="write"
+        ),
+        _pytest.param(lambda s, d: s.read_pints_snapshot(d), id="read"),
+        _pytest.param(lambda s, d: s.read_pints_snapshot_input(d), id="read-input"),
+    ],
+)
+def test_snapshot_without_pyarrow_raises_import_error(
+    monkeypatch: _pytest.MonkeyPatch,
+    tmp_path: _pth.Path,
+    use_snapshot: _t.Callable[[_t.Any, _pth.Path], _t.Any],
+) -> None:
+    """
+    Writing or reading a snapshot without pyarrow installed raises the same ImportError, before touching any file.
+
+    :param use_snapshot: Function writing or reading a snapshot, given the `pints_snapshot` module and the snapshot directory.
+    """
+    import pints_snapshot as _ps
+
+    monkeypatch.setattr(_ps, "_pa", None)
+
+    with _pytest.raises(ImportError, match="pyarrow"):
+        use_snapshot(_ps, tmp_path / "snapshot")
+    assert not (tmp_path / "snapshot").exists()
@@ -0,0 +1,62 @@
+import json as _json
+import pathlib as _pth
+
+
+def test_read_pints_ui_data_section_reads_written_section(tmp_path: _pth.Path) -> None:
+    """
+    Sections written for the UI, including parts of split sections, are read back as they were.
+    """
+    import pints_ui_data as _pui
+
+    manifest = _pui.write_pints_ui_data(tmp_path, "pints_info", _PINTS_INFO)
+
+    assert manifest["total_pint_count"] == 3.5
+    assert (
+        _pui.read_pints_ui_data_section(tmp_path, "pints_info", "location_info")
+        == _PINTS_INFO["location_info"]
+    )
+    assert (
+        _pui.read_pints_ui_data_section(
+            tmp_path, "pints_info", "date_info.pints_per_day_of_the_week"
+        )
+        == _PINTS_INFO["date_info"]["pints_per_day_of_the_week"]
+    )
+    assert _pui.read_pints_ui_data_section(tmp_path, "pints_info", "date_info") is None
+
+
+def test_read_pints_ui_data_section_without_manifest(tmp_path: _pth.Path) -> None:
+    """
+    Nothing is read if nothing has been written, or it was written by an older version.
+    """
+    import pints_ui_data as _pui
+
+    assert (
+        _pui.read_pints_ui_data_section(tmp_path, "pints_info", "location_info") is None
+    )
+
+    _pui.write_pints_ui_data(tmp_path, "pints_info", _PINTS_INFO)
+    manifest_file_path = tmp_path / "pints_info.manifest.json"
+    manifest = _json.loads(manifest_file_path.read_text(encoding="utf-8"))
+    manifest_file_path.write_text(
+        _json.dumps({**manifest, "version": 0}), encoding="utf-8"
+    )
+
+    assert (
+        _pui.read_pints_ui_data_section(tmp_path, "pints_info", "location_info") is None
+    )
+
+
+_PINTS_INFO = {
+    "total_pint_count": 3.5,
+    "location_info": {
+        "The Pub": {
+            "number_of_visits": 2,
+            "number_of_pints": 3.5,
+            "number_of_pints_rank": 1,
+            "coordinates": [-0.07, 51.54],
+        }
+    },
+    "date_info": {
+        "pints_per_day_of_the_week": [{"day": "Friday", "number_of_pints": 3.5}]
+    },
+}
@@ -0,0 +1,222 @@
+import io as _io
+import json as _json
+import pandas as _pd
+import pathlib as _pth
+import pytest as _pytest
+import random as _rd
+import typing as _t
+
+
+@_pytest.fixture(autouse=True)
+def geocoder_cache_path(monkeypatch: _pytest.MonkeyPatch, tmp_path: _pth.Path) -> None:
+    """
+    Keep the geocoder's cache in the temporary directory. Every location has known coordinates, so nothing is looked up.
+    """
+    monkeypatch.setenv("GEOCODER_CACHE_PATH", str(tmp_path / "geocode.sqlite"))
+
+
+@_pytest.mark.parametrize(
+    "cuts",
+    [
+        _pytest.param([100], id="one-cut"),
+        _pytest.param([50, 200, 201, 400], id="many-cuts"),
+        _pytest.param([-1], id="before-last-row"),
+    ],
+)
+def test_merged_aggregates_equal_full_recompute(cuts: list[int]) -> None:
+    """
+    Aggregates of consecutive chunks, merged after a round trip through a JSON checkpoint, give the same pints information as aggregating
+    every row at once.
+
+    :param cuts: Rows at which the input data is split, where negative rows count back from the end.
+    """
+    import pints_data as _pi
+    import pints_input_data_clean_up as _idc
+
+    raw_pints_df = _get_raw_pints_df(_ROW_COUNT)
+    cuts = [x % len(raw_pints_df) for x in cuts]
+
+    aggregates = None
+    for start, end in zip([0, *cuts], [*cuts, len(raw_pints_df)]):
+        chunk_aggregates = _pi.compute_pints_aggregates(
+            _idc.clean_up_input_pints_data(raw_pints_df.iloc[start:end])
+        )
+        aggregates = (
+            chunk_aggregates
+            if aggregates is None
+            else _pi.merge_pints_aggregates(
+                _json.loads(_json.dumps(aggregates)), chunk_aggregates
+            )
+        )
+
+    full_aggregates = _pi.compute_pints_aggregates(
+        _idc.clean_up_input_pints_data(raw_pints_df)
+    )
+    for compact in (False, True):
+        assert _get_pints_info(aggregates, compact) == _get_pints_info(
+            full_aggregates, compact
+        )
+
+
+@_pytest.mark.parametrize(
+    ("edit", "expected_is_processed"),
+    [
+        _pytest.param(lambda x: x, True, id="unchanged"),
+        _pytest.param(
+            lambda x: _pd.concat([x, _get_raw_pints_df(3)], ignore_index=True),
+            True,
+            id="appended",
+        ),
+        _pytest.param(lambda x: x.assign(Number=x["Number"] + 1), False, id="edited"),
+        _pytest.param(lambda x: x.iloc[1:], False, id="removed"),
+        _pytest.param(lambda x: x.iloc[:-1], False, id="truncated"),
+    ],
+)
+def test_is_processed(
+    edit: _t.Callable[[_pd.DataFrame], _pd.DataFrame], expected_is_processed: bool
+) -> None:
+    """
+    Processed rows are unchanged if other rows have only been appended.
+
+    :param edit: Function editing the raw pints input data.
+    :param expected_is_processed: Expected flag.
+    """
+    import update_pints_data as _upd
+
+    raw_pints_df = _get_raw_pints_df(10)
+    checkpoint = {
+        "row_count": len(raw_pints_df),
+        "content_hash": _upd._get_content_hash(raw_pints_df),
+    }
+
+    assert _upd._is_processed(edit(raw_pints_df), checkpoint) == expected_is_processed
+
+
+@_pytest.mark.parametrize("is_edited", [False, True])
+def test_incremental_update_equals_full_update(
+    monkeypatch: _pytest.MonkeyPatch,
+    tmp_path: _pth.Path,
+    capsys: _pytest.CaptureFixture,
+    is_edited: bool,
+) -> None:
+    """
+    An incremental update only processes appended rows, unless a processed row has been edited, when everything is recomputed. Either way it
+    writes the same pints information as a full update.
+
+    :param is_edited: Flag which determines whether a processed row is edited before appending rows.
+    """
+    import pints_input_data_service as _ids
+    import update_pints_data as _upd
+
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / "ui" / "data"
+    output_dir.mkdir(parents=True)
+    _write_location_info(output_dir, "pints_info")
+    _write_location_info(output_dir, "full_pints_info")
+
+    raw_pints_df = _get_raw_pints_df(_ROW_COUNT)
+    monkeypatch.setattr(
+        _ids, "get_pints_input_data", lambda: raw_pints_df.iloc[:300].copy()
+    )
+    _upd.update_pints_data("pints_info", incremental=True)
+    capsys.readouterr()
+
+    if is_edited:
+        raw_pints_df.loc[10, "Number"] = 9
+    monkeypatch.setattr(_ids, "get_pints_input_data", lambda: raw_pints_df.copy())
+    _upd.update_pints_data("pints_info", incremental=True)
+    output = capsys.readouterr().out
+    _upd.update_pints_data("full_pints_info")
+
+    if is_edited:
+        assert "recomputing everything" in output
+    else:
+        assert f"Processing {_ROW_COUNT - 300} new rows" in output
+    # Every section is compared by the hash of its content
+    manifest, full_manifest = [
+        _read_json(output_dir / f"{x}.manifest.json")
+        for x in ("pints_info", "full_pints_info")
+    ]
+    assert manifest["total_pint_count"] == full_manifest["total_pint_count"]
+    assert {k: v["hash"] for k, v in manifest["sections"].items()} == {
+        k: v["hash"] for k, v in full_manifest["sections"].items()
+    }
+    assert _read_json(output_dir / "pints_info.checkpoint.json") == _read_json(
+        output_dir / "full_pints_info.checkpoint.json"
+    )
+
+
+def _get_raw_pints_df(row_count: int) -> _pd.DataFrame:
+    """
+    Get raw pints input data, as read from a CSV export of the spreadsheet, with the same rows for the same row count.
+
+    :param row_count: Number of rows.
+    :return: Raw pints input data frame.
+    """
+    random = _rd.Random(row_count)
+    lines = [
+        f"{random.randint(1, 28):02d}/{random.randint(1, 12):02d}/{random.choice([2024, 2025])},"
+        f"{random.choice(_LOCATIONS)},"
+        f"{random.choice([0.5, 1, 2, 3])},"
+        f"{random.choice(_PINTS)},"
+        f"£{random.choice([4.5, 5, 6.25]):.2f},,"
+        f'"{", ".join(random.sample(_FRIEND_NAMES, random.randint(0, 3)))}"\n'
+        for _ in range(row_count)
+    ]
+    return _pd.read_csv(_io.StringIO(_CSV_HEADER + "".join(lines)))
+
+
+def _get_pints_info(aggregates: dict[str, _t.Any], compact: bool) -> dict[str, _t.Any]:
+    """
+    Get pints information from aggregates, with known coordinates for every location.
+
+    :param aggregates: Aggregates.
+    :param compact: Flag which determines whether the time series of entries is in the compact form.
+    :return: Pints information.
+    """
+    import pints_data as _pi
+
+    return _pi.compute_pints_data_from_aggregates(
+        aggregates,
+        visited_locations_2_coordinates=_LOCATION_2_COORDINATES,
+        compact=compact,
+    )
+
+
+def _write_location_info(output_dir: _pth.Path, output_file_name: str) -> None:
+    """
+    Write location information with known coordinates for every location, as a previous update would have.
+
+    :param output_dir: Output directory.
+    :param output_file_name: Output file name, without the extension.
+    """
+    import pints_ui_data as _pui
+
+    _pui.write_pints_ui_data(
+        output_dir,
+        output_file_name,
+        {
+            "total_pint_count": 0.0,
+            "location_info": {
+                k: {"coordinates": v} for k, v in _LOCATION_2_COORDINATES.items()
+            },
+        },
+    )
+
+
+def _read_json(file_path: _pth.Path) -> _t.Any:
+    """
+    Read a JSON file.
+
+    :param file_path: File path.
+    :return: Data.
+    """
+    return _json.loads(file_path.read_text(encoding="utf-8"))
+
+
+_ROW_COUNT = 450
+_CSV_HEADER = "Date,Location,Number,Pint,Cost (per pint),Spend,Company\n"
+_LOCATIONS = ["The Pub", "The Bar", "The Inn", "The Arms", "The Crown"]
+_PINTS = ["Guinness", "Hop", "IPA", "Stout"]
+_FRIEND_NAMES = ["Alice", "Bob", "Roisin", "Stan", "Cy"]
+_LOCATION_2_COORDINATES = {x: [-0.1 + i / 100, 51.5] for i, x in enumerate(_LOCATIONS)}
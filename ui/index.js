@@ -345,25 +345,45 @@ function renderPintsPerDayCalendar(pintsPerDayInfo) {
 }
 
 
-function renderCumulativePintsLineChart(friendsInfo, pintsPerEntryInfo) {
-    var elementId = document.getElementById('cumulativePintsLineChart');
-    if (!elementId) {
-        return
-    }
-
-    var chart = echarts.init(elementId);
-
-    const friends = Object.keys(friendsInfo);
-    const entries = [0].concat(Object.keys(pintsPerEntryInfo).map(x => Number(x) + 1));
+function _getName2CumulativePints(friends, pintsPerEntryInfo) {
     const name2entries = {}
     friends.forEach(friend => {name2entries[friend] = [0]});
 
+    // Schema version 2 only stores each entry's company, as indices into its friends list, so rebuild the cumulative pints with a running sum
+    if (pintsPerEntryInfo.schema_version === 2) {
+        const cumulativePints = pintsPerEntryInfo.friends.map(() => 0)
+        pintsPerEntryInfo.company.forEach((friendIndices, entryIndex) => {
+            friendIndices.forEach(friendIndex => {
+                cumulativePints[friendIndex] += pintsPerEntryInfo.Number[entryIndex]
+            })
+            pintsPerEntryInfo.friends.forEach((friend, friendIndex) => {
+                name2entries[friend].push(cumulativePints[friendIndex])
+            })
+        })
+        return name2entries
+    }
+
     Object.entries(pintsPerEntryInfo).forEach(([k, v]) => {
         company2cumulativePints = v.company_2_cumulative_pints
         Object.entries(company2cumulativePints).forEach(([k, v]) => {
             name2entries[k].push(v)
         })
     })
+    return name2entries
+}
+
+
+function renderCumulativePintsLineChart(friendsInfo, pintsPerEntryInfo) {
+    var elementId = document.getElementById('cumulativePintsLineChart');
+    if (!elementId) {
+        return
+    }
+
+    var chart = echarts.init(elementId);
+
+    const friends = Object.keys(friendsInfo);
+    const name2entries = _getName2CumulativePints(friends, pintsPerEntryInfo)
+    const entries = Array.from({length: (name2entries[friends[0]] || [0]).length}, (_, i) => i);
 
     seriesData = Object.entries(name2entries).map(([k, v]) => ({
         name: k,
@@ -422,31 +442,66 @@ function renderCumulativePintsLineChart(friendsInfo, pintsPerEntryInfo) {
 // ============================================================================
 
 
+async function _fetchManifest() {
+    // The manifest is always revalidated, as it is the only file whose URL does not change with its content
+    const result = await fetch("./data/pints_info.manifest.json", {cache: "no-cache"})
+    return await result.json()
+}
+
+
+async function _fetchSection(manifest, sectionName) {
+    // Sections are fetched by content hash, so a cached section is reused until its content changes
+    const section = manifest.sections[sectionName]
+    const result = await fetch(`./data/${section.path}?v=${section.hash}`)
+    return await result.json()
+}
+
+
+function _whenVisible(elementId, callback) {
+    // Defer work, e.g. fetching a large time series, until its element is scrolled near the viewport
+    const element = document.getElementById(elementId)
+    if (!element || !("IntersectionObserver" in window)) {
+        callback()
+        return
+    }
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            observer.disconnect()
+            callback()
+        }
+    }, {rootMargin: "200px"})
+    observer.observe(element)
+}
+
+
 async function main() {
-    // Load data
-    result = await fetch("./data/pints_info.json")
-    data = await result.json()
-    locationInfo = data.location_info
-    monthInfo = data.date_info.pints_per_month_of_the_year
-    friendsInfo = data.friends_info
-    pintsPerDayInfo = data.date_info.time_series_date_info
-    pintsPerEntry = data.date_info.time_series_entry_info
+    // Load the small sections first, so the leaderboard renders before the large time series are fetched
+    const manifest = await _fetchManifest()
+    const friendsInfoPromise = _fetchSection(manifest, "friends_info")
+    const locationInfoPromise = _fetchSection(manifest, "location_info")
+    const monthInfoPromise = _fetchSection(manifest, "date_info.pints_per_month_of_the_year")
+
+    // Grid
+    const friendsInfo = await friendsInfoPromise
+    renderFriendsLeaderboardGrid(friendsInfo)
+    const locationInfo = await locationInfoPromise
+    renderLocationsGrid(locationInfo)
 
     // Charts
-    renderPintsPerMonthChart(monthInfo)
+    renderPintsPerMonthChart(await monthInfoPromise)
     renderVisitsPerLocationChart(locationInfo)
     renderPintsPerLocationChart(locationInfo)
     renderLocationsNestedPieChart(locationInfo)
 
-    // Grid
-    renderLocationsGrid(locationInfo)
-    renderFriendsLeaderboardGrid(friendsInfo)
-
     // Calendar
-    renderPintsPerDayCalendar(pintsPerDayInfo)
+    _whenVisible("pintsPerDayCalendar", async () => {
+        renderPintsPerDayCalendar(await _fetchSection(manifest, "date_info.time_series_date_info"))
+    })
 
     // Line charts
-    renderCumulativePintsLineChart(friendsInfo, pintsPerEntry)
+    _whenVisible("cumulativePintsLineChart", async () => {
+        renderCumulativePintsLineChart(friendsInfo, await _fetchSection(manifest, "date_info.time_series_entry_info"))
+    })
 }
 
 document.addEventListener('DOMContentLoaded', main)
@@ -8,22 +8,25 @@ L.tileLayer('https://tile.openstreetmap.org/{z}/{x}/{y}.png', {
   attribution: '&copy; <a href="http://www.openstreetmap.org/copyright">OpenStreetMap</a>'
 }).addTo(map);
 
-const geoJsonFiles = [
+const geoJsonNames = [
   "camden", "city-of-london", "city-of-westminster", "greenwich", "hackney",
   "hammersmith-and-fulham", "islington", "kensington-and-chelsea", "lambeth",
   "lewisham", "southwark", "tower-hamlets", "wandsworth"
-].map(name => `../data/geo-jsons/${name}.geo.json`);
-
-const fetchTotalPubCount = async () => {
-  const counts = await Promise.all(
-    geoJsonFiles.map(async file => {
-      const res = await fetch(file);
-      const json = await res.json();
-      return json.properties.pints_info.pub_count;
-    })
-  );
-  return counts.reduce((sum, count) => sum + count, 0);
-};
+];
+
+// Simplified levels of detail written by "backend/scripts/simplify_geo_jsons.py", keyed by the lowest zoom each is fine enough for
+const geoJsonLevels = [[14, "z14"], [12, "z12"], [0, "z10"]];
+
+const getGeoJsonLevel = zoom => geoJsonLevels.find(([minZoom]) => zoom >= minZoom)[1];
+
+const getGeoJsonFiles = level => geoJsonNames.map(name => `../data/geo-jsons-simplified/${level}/${name}.geo.json`);
+
+const fetchGeoJsons = level => Promise.all(
+  getGeoJsonFiles(level).map(async file => {
+    const res = await fetch(file);
+    return res.json();
+  })
+);
 
 const getColor = (count, total) => {
   const percent = count ? (count / total) * 100 : 0;
@@ -46,17 +49,25 @@ const styleFeature = (feature, total) => ({
   fillOpacity: 0.9
 });
 
+let heatMapLevel = null;
+let heatMapLayer = null;
+
 const loadHeatMapLayers = async () => {
-  const total = await fetchTotalPubCount();
-  for (const file of geoJsonFiles) {
-    const res = await fetch(file);
-    const json = await res.json();
-    L.geoJson(json, {
-      style: () => styleFeature(json, total)
-    }).addTo(map);
-  }
+  const level = getGeoJsonLevel(map.getZoom());
+  if (level === heatMapLevel) return;
+  heatMapLevel = level;
+
+  const jsons = await fetchGeoJsons(level);
+  if (level !== heatMapLevel) return;
+  const total = jsons.reduce((sum, json) => sum + json.properties.pints_info.pub_count, 0);
+
+  if (heatMapLayer) heatMapLayer.remove();
+  heatMapLayer = L.layerGroup(
+    jsons.map(json => L.geoJson(json, { style: () => styleFeature(json, total) }))
+  ).addTo(map);
 };
 
+map.on('zoomend', loadHeatMapLayers);
 loadHeatMapLayers();
 
 
@@ -94,15 +105,24 @@ const createLeaderboardItem = ({ icon, name, pint_count, pint_count_rank }) => {
   return div;
 };
 
+// Sections of the pints information written by "backend/scripts/pints_ui_data.py", fetched by content hash as in "ui/index.js"
+const manifestPromise = fetch('../data/pints_info.manifest.json', { cache: 'no-cache' })
+  .then(res => res.json());
+
+const fetchSection = async sectionName => {
+  const section = (await manifestPromise).sections[sectionName];
+  const res = await fetch(`../data/${section.path}?v=${section.hash}`);
+  return res.json();
+};
+
 const loadLeaderboard = async () => {
   try {
-    const res = await fetch('../data/pints_info.json');
-    const data = await res.json();
+    const manifest = await manifestPromise;
 
-    renderLeaderboard(data.friends_info);
+    renderLeaderboard(await fetchSection('friends_info'));
 
     document.getElementById('balance').textContent =
-      data.total_pint_count.toFixed(1);
+      manifest.total_pint_count.toFixed(1);
   } catch (err) {
     console.error('Failed to load leaderboard:', err);
   }
@@ -114,14 +134,16 @@ const loadLeaderboard = async () => {
 
 const loadCharts = async () => {
   try {
-    const res = await fetch('../data/pints_info.json');
-    const data = await res.json();
+    const [locationInfo, pintsPerMonthOfTheYear] = await Promise.all([
+      fetchSection('location_info'),
+      fetchSection('date_info.pints_per_month_of_the_year'),
+    ]);
 
-    const locationsVisited = Object.entries(data.location_info)
+    const locationsVisited = Object.entries(locationInfo)
       .map(([name, info]) => ({ name, ...info }))
       .sort((a, b) => b.number_of_visits - a.number_of_visits);
 
-    const locationsPints = Object.entries(data.location_info)
+    const locationsPints = Object.entries(locationInfo)
       .map(([name, info]) => ({ name, ...info }))
       .sort((a, b) => b.number_of_pints - a.number_of_pints);
 
@@ -134,7 +156,7 @@ const loadCharts = async () => {
     const pints = locationsPints.map(loc => loc.number_of_pints);
 
     // Date info
-    const pintsByMonth = data.date_info.pints_per_month_of_the_year
+    const pintsByMonth = pintsPerMonthOfTheYear
         .slice().sort((a, b) => b.number_of_pints - a.number_of_pints);
 
     const monthLabel = pintsByMonth.map(info => info.month);